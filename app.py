@@ -1,6 +1,7 @@
 import eventlet
 eventlet.monkey_patch()
-from datetime import datetime
+from eventlet import tpool
+from datetime import datetime, timedelta
 from threading import Thread
 import psutil
 import importlib
@@ -11,18 +12,28 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_socketio import SocketIO,emit
 from flask import request, redirect, url_for, flash
 from config import Config
-from models import db, Task, Log
+from models import db, Task, Log, TaskSummary, upgrade_schema
 from scheduling.routes import scheduling_bp
-from scheduler_root import run_scheduler_with_intelligence,priority_model
+from scheduler_root import run_scheduler_with_intelligence, priority_models, scheduler_models, _system_snapshot
+from online_learning import run_online_learning
+from features import PRIORITY_CLASSES, priority_matrix, priority_row
+from task_profiles import task_profile
+import telemetry
+from battery_forecast import forecast_text
+from battery_whatif import MAX_SIM_TASKS, WhatIf, Workload, sample_processes
 import threading
-from collections import defaultdict
+from collections import Counter, defaultdict
+import csv
+import io
+import numpy as np
 from scheduling.scheduler_analytics import scheduler_analytics_bp
-import math
 app = Flask(__name__)
 app.config.from_object(Config)
 
 # Initialize DB
 db.init_app(app)
+with app.app_context():
+    upgrade_schema()   # also when served by gunicorn, which skips __main__
 
 # Initialize Socket.IO
 socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
@@ -45,26 +56,13 @@ app.register_blueprint(scheduler_analytics_bp)
 # SIMPLE TEMPERATURE MONITORING
 # ============================
 def get_temperature_simple():
-    """Simple temperature reading using psutil"""
-    try:
-        # Try psutil first (works on Windows 10/11)
-        if hasattr(psutil, "sensors_temperatures"):
-            temps = psutil.sensors_temperatures()
-            if temps:
-                for name, entries in temps.items():
-                    for entry in entries:
-                        if entry.current is not None and entry.current > 0:
-                            print(f"Found temperature sensor: {name} = {entry.current}°C")
-                            return round(entry.current, 1)
-        return None
-    except Exception as e:
-        print(f"psutil temperature error: {e}")
-        return None
+    """Sensor temperature from the shared telemetry snapshot (None without a sensor)"""
+    return telemetry.snapshot().temp
 
 def get_temperature_estimated():
     """Estimate temperature based on CPU usage (always works)"""
     try:
-        cpu_usage = psutil.cpu_percent(interval=0.1)
+        cpu_usage = telemetry.snapshot().cpu
         
         # Realistic temperature estimation formula
         base_temp = 35.0  # Base temperature when idle
@@ -127,120 +125,65 @@ def calculate_battery_impact(tasks, algorithm, current_battery):
 # Scheduler Simulation & Battery Forecast
 # ============================
 
-def run_scheduler_with_intelligence(socketio, algorithm, app):
+# Energy factor per algorithm for the incremental battery impact
+ALGO_FACTORS = {
+    "Round Robin": 1.0,
+    "Priority Scheduling": 1.2,
+    "Shortest Remaining Time First (SRTF)": 1.1,
+    "FCFS": 1.0,
+    "SJF": 1.05
+}
+# CURRENT_SCHEDULER key ("round_robin", ...) -> algorithm name
+ALGO_NAMES = {name.lower().replace(" ", "_"): name for name in ALGO_FACTORS}
+
+def emit_battery_impact_incremental(socketio, app):
     """
-    Simulates task execution and emits progress to frontend.
+    Continuously calculates and emits battery forecast and algorithm impact
+    for the current algorithm (CURRENT_SCHEDULER, read every tick). Started
+    once at server start; idle until a simulation has picked an algorithm.
     """
-    with app.app_context():
-        simulated_tasks = Task.query.filter_by(type='simulated').all()
-
-        for task in simulated_tasks:
-            if task.status == "Completed":
-                continue
-
-            task.status = "In Progress"
-            db.session.commit()
-
-            total_energy = random.randint(50, 100)
-            energy_used = 0
-            last_emit_progress = 0
-
-            while energy_used < total_energy:
-                socketio.sleep(0.5)  # smoother updates
-                energy_used += random.randint(5, 10)
-                progress = min(int((energy_used / total_energy) * 100), 100)
-
-                # Emit only if progress increased by 5% or complete
-                if progress - last_emit_progress >= 5 or progress == 100:
-                    task.progress = progress
-                    db.session.commit()
-                    socketio.emit("task_progress_update", {
-                        "task_id": task.id,
-                        "progress": progress,
-                        "status": "In Progress",
-                        "type": "simulated"
-                    })
-                    last_emit_progress = progress
-
-            task.progress = 100
-            task.status = "Completed"
-            task.locked = True
-            db.session.commit()
-            socketio.emit("task_progress_update", {
-                "task_id": task.id,
-                "progress": 100,
-                "status": "Completed",
-                "type": "simulated"
-            })
-
-
-def emit_battery_impact_incremental(socketio, algorithm, app):
-    """
-    Continuously calculates and emits battery forecast and algorithm impact.
-    """
-    import psutil
-    from models import Task  # make sure your Task model is imported
-
-    # To track battery history for estimating discharge rate
-    battery_history = []
-
-    algo_factors = {
-        "Round Robin": 1.0,
-        "Priority Scheduling": 1.2,
-        "Shortest Remaining Time First (SRTF)": 1.1,
-        "FCFS": 1.0,
-        "SJF": 1.05
-    }
-
     while True:
         socketio.sleep(1)  # emit every 1 sec
 
-        with app.app_context():
-            # Get tasks from DB
-            tasks = Task.query.all()
-
-            # Get current battery %
-            battery_info = psutil.sensors_battery()
-            current_battery = battery_info.percent if battery_info else 100
-
-            battery_history.append(current_battery)
-            if len(battery_history) > 10:  # keep last 10 readings
-                battery_history.pop(0)
-
-            # Calculate battery used per algorithm
-            battery_used_per_algo = {algo: 0 for algo in algo_factors.keys()}
-            for task in tasks:
-                energy = getattr(task, "energy", 10)  # default energy
-                for algo_name, factor in algo_factors.items():
-                    battery_used_per_algo[algo_name] += energy * factor
-
-            # Remaining battery for current algorithm
-            battery_left = max(current_battery - battery_used_per_algo.get(algorithm, 0), 0)
-
-            # Cap battery_used_per_algo values
-            battery_used_per_algo = {k: min(v, 100) for k, v in battery_used_per_algo.items()}
-
-            # Estimate remaining time in minutes
-            estimated_time = None
-            if len(battery_history) >= 2:
-                delta_percent = battery_history[-2] - battery_history[0]
-                delta_time = len(battery_history)  # seconds approx
-                discharge_rate = delta_percent / delta_time if delta_time != 0 else 0
-                if discharge_rate < 0:  # battery decreasing
-                    estimated_time = round(current_battery / abs(discharge_rate), 1)
-
-            # Numeric percent for Chart.js
-            forecast_percent = max(0, min(100, round(100 - battery_left, 1)))
-            forecast_text = f"{estimated_time} mins left" if estimated_time else f"{battery_left}%"
-
-            # Emit to frontend
-            socketio.emit("scheduling_update", {
-                "battery_left": round(battery_left, 1),
-                "battery_used": {k: round(v, 1) for k, v in battery_used_per_algo.items()},
-                "currentAlgo": algorithm,
-                "forecastPercent": forecast_percent,  # numeric value for chart
-                "forecastText": forecast_text        # string for title
-            })
+        algorithm = ALGO_NAMES.get(CURRENT_SCHEDULER)
+        if algorithm is None:
+            continue
+
+        try:
+            with app.app_context():
+                # Total task energy from the trigger-maintained summary (no task scan)
+                _, total_energy, _ = TaskSummary.totals()
+
+                # Get current battery %
+                snap = telemetry.snapshot()
+                current_battery = snap.battery if snap.battery is not None else 100
+
+                # Calculate battery used per algorithm
+                battery_used_per_algo = {algo_name: total_energy * factor for algo_name, factor in ALGO_FACTORS.items()}
+
+                # Remaining battery for current algorithm
+                battery_left = max(current_battery - battery_used_per_algo.get(algorithm, 0), 0)
+
+                # Cap battery_used_per_algo values
+                battery_used_per_algo = {k: min(v, 100) for k, v in battery_used_per_algo.items()}
+
+                # Time to empty under this algorithm (telemetry.forecaster)
+                forecast = telemetry.forecast(current_battery, algorithm)
+
+                # Numeric percent for Chart.js
+                forecast_percent = max(0, min(100, round(100 - battery_left, 1)))
+
+                # Emit to frontend
+                socketio.emit("scheduling_update", {
+                    "battery_left": round(battery_left, 1),
+                    "battery_used": {k: round(v, 1) for k, v in battery_used_per_algo.items()},
+                    "currentAlgo": algorithm,
+                    "forecastPercent": forecast_percent,  # numeric value for chart
+                    "forecastText": forecast_text(forecast, round(battery_left, 1)),  # string for title
+                    "forecastInterval": [forecast["low"], forecast["high"]],
+                })
+        except Exception as e:
+            print("⚠️ Battery impact emitter error:", e)
 
 # ============================
 # Real OS Tasks Integration
@@ -389,20 +332,17 @@ def start_scheduler():
 
 def emit_system_stats():
     """Emit CPU/battery stats periodically (throttled)."""
-    global current_temperature, battery_history
+    global current_temperature
     last_data = {}
     
     while True:
         try:
-            battery = psutil.sensors_battery()
-            battery_percent = battery.percent if battery else 100
-            cpu_percent = int(psutil.cpu_percent(interval=0.0))
+            snap = telemetry.snapshot()
+            battery_percent = snap.battery if snap.battery is not None else 100
+            cpu_percent = int(snap.cpu)
             
             # Smooth battery forecast
-            battery_history.append(battery_percent)
-            if len(battery_history) > 10:
-                battery_history.pop(0)
-            smooth_percent = sum(battery_history) / len(battery_history)
+            smooth_percent = telemetry.history.mean("battery", SMOOTHING_WINDOW_SECONDS) or battery_percent
             
             data = {
                 "battery": round(smooth_percent,1),
@@ -418,38 +358,25 @@ def emit_system_stats():
         except Exception as e:
             print("emit_system_stats error:", e)
         socketio.sleep(2)  # once per second
-# Add the battery collection function here
-battery_history = []
+# Battery readings come from the shared telemetry history (telemetry.history)
+# Window for smoothing the displayed battery %
+SMOOTHING_WINDOW_SECONDS = 20
 
 def collect_battery_data():
-    """Collect battery history and estimate remaining time in minutes."""
-    global battery_history
-    interval_seconds = 60  # assuming this function runs every 60 seconds
+    """Emit the smoothed battery level and estimated remaining time in minutes."""
+    interval_seconds = 60
 
     while True:
-        battery = psutil.sensors_battery()
-        if battery:
-            battery_history.append(battery.percent)
-            if len(battery_history) > 10:
-                battery_history.pop(0)
-
-            # Smooth battery percent
-            smooth_percent = sum(battery_history) / len(battery_history)
-
-            # Calculate discharge rate (percent per second)
-            if len(battery_history) >= 2:
-                delta_percent = battery_history[-1] - battery_history[0]
-                delta_time = (len(battery_history) - 1) * interval_seconds
-                discharge_rate = delta_percent / delta_time if delta_time != 0 else 0
-
-                # Estimate remaining time in minutes
-                estimated_time = round(smooth_percent / abs(discharge_rate) / 60, 1) if discharge_rate < 0 else None
-            else:
-                estimated_time = None
+        snap = telemetry.snapshot()
+        if snap.battery is not None:
+            # Level and time to empty from the discharge forecaster
+            forecast = telemetry.forecast(snap.battery)
+            smooth_percent = forecast["level"] if forecast["level"] is not None else snap.battery
 
             socketio.emit("scheduling_update", {
                 "battery": round(smooth_percent, 1),
-                "forecast": f"{estimated_time} mins left" if estimated_time else f"{smooth_percent}%",
+                "forecast": forecast_text(forecast, round(smooth_percent, 1)),
+                "forecastInterval": [forecast["low"], forecast["high"]],
             })
 
         socketio.sleep(interval_seconds)
@@ -458,97 +385,51 @@ def collect_battery_data():
 # Start the background thread
 threading.Thread(target=collect_battery_data, daemon=True).start()
 
+# Monte Carlo what-if per algorithm (battery_whatif.py), for battery_algo_impact
+whatif = WhatIf(Config.WHATIF_SCENARIOS, Config.WHATIF_BUDGET_MS)
+
 def calculate_algorithm_battery_impact():
     """
-    Calculate dynamic comparative battery impact for all scheduling algorithms
+    Battery outlook of the pending workload under every scheduling algorithm:
+    p10/p50/p90 of battery remaining and minutes to empty (see battery_whatif).
     """
-    try:
-        # Get current system state
-        battery = psutil.sensors_battery()
-        current_battery = battery.percent if battery else 100
-        cpu_usage = psutil.cpu_percent()
-        
-        # Get all tasks
-        tasks = Task.query.all()
-        total_tasks = len(tasks) if tasks else 5
-        
-        # Base impact factors with more dynamic range
-        base_factors = {
-            "FCFS": 0.8,
-            "Round Robin": 1.2,
-            "SJF": 0.7,
-            "SRTF": 1.4,
-            "Priority Scheduling": 1.6
-        }
-        
-        # Dynamic system multipliers
-        system_multiplier = 1.0
-        
-        # More sensitive battery adjustments
-        battery_effect = max(0.5, min(2.0, (100 - current_battery) / 50 + 0.8))
-        system_multiplier *= battery_effect
-            
-        # CPU usage effect - more dynamic
-        cpu_effect = max(0.7, min(1.5, cpu_usage / 50))
-        system_multiplier *= cpu_effect
-            
-        # Task load effect
-        task_effect = min(2.0, 1.0 + (total_tasks / 8))
-        system_multiplier *= task_effect
-        
-        # Time-based variation for dynamism
-        time_variation = 0.9 + (0.2 * math.sin(time.time() / 10))
-        system_multiplier *= time_variation
+    snap = telemetry.snapshot()
+    current_battery = snap.battery if snap.battery is not None else 100
 
-        # Calculate impacts with more variation
-        battery_impacts = {}
-        base_score = 45  # Slightly higher base for better visualization
-        
-        for algo, factor in base_factors.items():
-            # Base calculation
-            impact = base_score * factor * system_multiplier
-            
-            # Algorithm-specific variations
-            algo_variation = random.uniform(0.85, 1.15)
-            impact *= algo_variation
-            
-            # Ensure reasonable bounds with more range
-            impact = max(20, min(impact, 85))
-            battery_impacts[algo] = round(impact, 1)
-            
-        return battery_impacts
-        
-    except Exception as e:
-        print(f"calculate_algorithm_battery_impact error: {e}")
-        # Return dynamic defaults
-        base = random.uniform(25, 40)
-        return {
-            "FCFS": round(base * 0.8, 1),
-            "Round Robin": round(base * 1.2, 1), 
-            "SJF": round(base * 0.7, 1),
-            "SRTF": round(base * 1.4, 1),
-            "Priority Scheduling": round(base * 1.6, 1)
-        }
+    # Pending workload: totals from the task summary, bursts of a bounded sample to simulate
+    count, energy, energy_sq = TaskSummary.totals(exclude_status="Completed")
+    sample = (Task.query.with_entities(Task.remaining_time, Task.burst_time, Task.priority)
+              .filter(Task.status != "Completed").limit(MAX_SIM_TASKS).all())
+    # How fast new tasks arrived over the last hour (indexed on created_at)
+    recent = Task.query.filter(Task.created_at >= datetime.utcnow() - timedelta(hours=1)).count()
+
+    # Base drain over all algorithms from the discharge forecaster (None until it has enough samples)
+    return whatif.run(Workload(count, energy, energy_sq, sample_processes(sample)), current_battery, snap.cpu,
+                      telemetry.forecaster.rate(), arrival_rate=recent / 3600)
 
 def emit_algorithm_battery_comparison(socketio):
     """
-    Continuously emit dynamic battery impacts with frequent updates
+    Continuously emit the per-algorithm battery what-if
     """
     while True:
         try:
-            impacts = calculate_algorithm_battery_impact()
-            
+            with app.app_context():
+                outlook = calculate_algorithm_battery_impact()
+
             socketio.emit("battery_algo_impact", {
-                "battery_used": impacts,
+                # Median battery % used per algorithm (chart), then the full distributions
+                "battery_used": {name: a["battery_used"] for name, a in outlook["algorithms"].items()},
+                "forecast": outlook["algorithms"],
+                "scenarios": outlook["scenarios"],
                 "timestamp": datetime.now().isoformat()
             })
-            
+
             socketio.sleep(1.5)  # More frequent updates for dynamism
-            
+
         except Exception as e:
             print(f"emit_algorithm_battery_comparison error: {e}")
             socketio.sleep(2)
-            
+
 # ============================
 # Routes
 # ============================
@@ -599,6 +480,10 @@ def tasks_page():
     all_tasks=simulated_tasks+real_tasks
     return render_template("tasks.html", tasks=all_tasks)
 
+# Model class → Task.priority label
+PRIORITY_LABELS = {value: label for label, value in PRIORITY_CLASSES.items()}
+
+
 @app.route("/add_task", methods=["POST"])
 def add_task():
     name = request.form.get("name")
@@ -606,59 +491,25 @@ def add_task():
 
     if name:
         # Predict with ML model only if user didn't manually select priority
-        if (not priority or priority.strip() == "") and priority_model:
+        if (not priority or priority.strip() == "") and priority_models.get() is not None:
             # --- Real-time system stats ---
-            cpu = psutil.cpu_percent(interval=0.5)
-            battery_info = psutil.sensors_battery()
-            battery = battery_info.percent if battery_info else random.uniform(40, 90)
+            snap = telemetry.snapshot()
+            cpu = snap.cpu
+            battery = snap.battery if snap.battery is not None else random.uniform(40, 90)
 
             # --- Dynamic values based on task type ---
-            name_lower = name.lower()
-
-            # Base values
-            energy = random.uniform(10, 100)
-            deadline_hours = random.uniform(1, 24)
-
-            # Adjust dynamically by keyword
-            if any(word in name_lower for word in ["render", "simulation", "compile", "encode", "train"]):
-                energy = random.uniform(70, 100)
-                deadline_hours = random.uniform(1, 6)
-            elif any(word in name_lower for word in ["game", "video", "youtube", "movie", "stream"]):
-                energy = random.uniform(50, 90)
-                deadline_hours = random.uniform(2, 10)
-            elif any(word in name_lower for word in ["meeting", "class", "call", "chat", "zoom"]):
-                energy = random.uniform(30, 60)
-                deadline_hours = random.uniform(1, 5)
-            elif any(word in name_lower for word in ["email", "browse", "news", "document", "pdf", "notes"]):
-                energy = random.uniform(10, 40)
-                deadline_hours = random.uniform(8, 24)
-            elif any(word in name_lower for word in ["update", "backup", "install", "upload", "download"]):
-                energy = random.uniform(60, 90)
-                deadline_hours = random.uniform(1, 8)
-            elif any(word in name_lower for word in ["music", "scroll", "social", "media"]):
-                energy = random.uniform(20, 60)
-                deadline_hours = random.uniform(6, 18)
-            else:
-                # Default fallback
-                energy = random.uniform(30, 70)
-                deadline_hours = random.uniform(4, 12)
-
-            # --- Derived features (must match model training) ---
-            energy_per_cpu = energy / (cpu if cpu != 0 else 1)
-            cpu_battery_ratio = cpu / (battery if battery != 0 else 1)
-            deadline_inverse = 1 / (deadline_hours if deadline_hours != 0 else 1)
-
-            features = [[
-                energy, deadline_hours, cpu, battery,
-                energy_per_cpu, cpu_battery_ratio, deadline_inverse
-            ]]
+            energy_range, deadline_range = task_profile(name)
+            energy = random.uniform(*energy_range)
+            deadline_hours = random.uniform(*deadline_range)
+
+            # --- Features (shared pipeline with training, see features.py) ---
+            features = priority_row(energy, deadline_hours, cpu, battery)
 
             # --- Predict using model ---
-            priority_pred = int(priority_model.predict(features)[0])
+            priority_pred = int(priority_models.predict(features)[0])
 
             # --- Convert to label ---
-            priority_map = {0: "Low", 1: "Medium", 2: "High"}
-            priority = priority_map.get(priority_pred, "Medium")
+            priority = PRIORITY_LABELS.get(priority_pred, "Medium")
 
             print(f"🤖 Auto-assigned priority '{priority}' to '{name}' "
                   f"(Energy={energy:.2f}, CPU={cpu:.2f}%, Battery={battery:.2f}%, Deadline={deadline_hours:.2f}h)")
@@ -672,6 +523,85 @@ def add_task():
     return redirect(url_for("tasks_page"))
 
 
+def _parse_task_import(req):
+    """Task rows from a JSON list / {"tasks": [...]} body, or CSV (file upload or request body)."""
+    if req.is_json:
+        data = req.get_json(silent=True)
+        rows = data.get("tasks") if isinstance(data, dict) else data
+    else:
+        upload = req.files.get("file")
+        text = upload.read().decode("utf-8-sig") if upload else req.get_data(as_text=True)
+        rows = list(csv.DictReader(io.StringIO(text)))
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Expected a list of task objects or CSV with a header row")
+    return rows
+
+
+@app.route("/tasks/import", methods=["POST"])
+def import_tasks():
+    """
+    Bulk task creation from JSON or CSV (fields: name, priority, burst_time, type).
+    Only simulated tasks can be imported: real tasks mirror OS processes and are
+    replaced by update_real_tasks.
+    Rows without a priority share one telemetry snapshot and one batched model
+    prediction; all tasks go in with one bulk insert plus one summary log entry.
+    """
+    start = time.perf_counter()
+    try:
+        rows = _parse_task_import(request)
+        if len(rows) > app.config["TASK_IMPORT_MAX_ROWS"]:
+            raise ValueError(f"At most {app.config['TASK_IMPORT_MAX_ROWS']} tasks per import")
+        tasks = []
+        for i, row in enumerate(rows, start=1):
+            name = str(row.get("name") or "").strip()
+            priority = str(row.get("priority") or "").strip().title()
+            burst = int(row.get("burst_time") or 5)
+            task_type = str(row.get("type") or "simulated").strip().lower()
+            if not name:
+                raise ValueError(f"Row {i}: name is required")
+            if priority and priority not in PRIORITY_LABELS.values():
+                raise ValueError(f"Row {i}: priority must be High, Medium or Low")
+            if burst <= 0:
+                raise ValueError(f"Row {i}: burst_time must be positive")
+            if task_type != "simulated":
+                raise ValueError(f"Row {i}: type must be simulated (real tasks come from the OS)")
+            tasks.append({"name": name[:120], "priority": priority, "status": "Pending",
+                          "burst_time": burst, "remaining_time": burst, "type": task_type})
+    except (ValueError, TypeError) as e:
+        return {"error": str(e)}, 400
+
+    # --- One snapshot + one batched prediction for rows without a priority ---
+    missing = [task for task in tasks if not task["priority"]]
+    if missing and priority_models.get() is not None:
+        battery, _, cpu, _ = _system_snapshot()
+        profiles = [task_profile(task["name"]) for task in missing]
+        energy = np.random.uniform(*np.array([energy for energy, _ in profiles]).T)
+        deadline_hours = np.random.uniform(*np.array([deadline for _, deadline in profiles]).T)
+        predicted = priority_models.predict(priority_matrix(energy, deadline_hours, cpu, battery))
+        for task, label in zip(missing, predicted):
+            task["priority"] = PRIORITY_LABELS.get(int(label), "Medium")
+    for task in missing:
+        task["priority"] = task["priority"] or "Medium"
+
+    # --- One bulk insert + one aggregated log entry, one commit ---
+    counts = Counter(task["priority"] for task in tasks)
+    if tasks:
+        db.session.execute(db.insert(Task), tasks)
+    db.session.add(Log(message=(
+        f"Bulk import: {len(tasks)} tasks "
+        f"(High {counts['High']}, Medium {counts['Medium']}, Low {counts['Low']}; "
+        f"{len(missing)} auto-prioritized)"
+    )))
+    db.session.commit()
+
+    return {
+        "imported": len(tasks),
+        "auto_prioritized": len(missing),
+        "priorities": dict(counts),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
 @app.route("/delete_task/<int:task_id>")
 def delete_task(task_id):
     task = Task.query.get(task_id)
@@ -771,6 +701,26 @@ def set_temp(temp):
     current_temperature = temp
     return f"Temperature manually set to {temp}°C. <a href='/'>Back to Dashboard</a>"
 
+# Live model versions and shadow-mode statistics
+@app.route("/model-status")
+def model_status():
+    return {"models": [scheduler_models.status(), priority_models.status()]}
+
+# ============================
+# Telemetry Series (charts poll with since = last point's t)
+# ============================
+@app.route("/telemetry")
+def telemetry_series():
+    try:
+        now = time.time()
+        since = float(request.args.get("since") or now - 3600)
+        until = float(request.args["until"]) if request.args.get("until") else None
+        step = int(request.args["step"]) if request.args.get("step") else None
+        fields = [f for f in (request.args.get("fields") or "").split(",") if f]
+        return telemetry.open_store().query(since, until, step, request.args.get("agg", "avg"), fields)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
 @app.route('/scheduler-analytics')
 def scheduler_analytics():
     # Renders the scheduler analytics page
@@ -855,23 +805,18 @@ def handle_connect():
     socketio.emit("temperature_update", {"temperature": current_temperature})
 
     # ----------------- System stats -----------------
-    battery = psutil.sensors_battery()
-    battery_percent = battery.percent if battery else 100
-    cpu_percent = int(psutil.cpu_percent(interval=0.0))
-
-    # Estimate battery forecast from history if available
-    estimated_time = None
-    if len(battery_history) >= 2:
-        delta_percent = battery_history[-1] - battery_history[0]
-        delta_time = len(battery_history)
-        discharge_rate = delta_percent / delta_time if delta_time != 0 else 0
-        if discharge_rate < 0:
-            estimated_time = round(battery_percent / abs(discharge_rate), 1)
+    snap = telemetry.snapshot()
+    battery_percent = snap.battery if snap.battery is not None else 100
+    cpu_percent = int(snap.cpu)
+
+    # Time to empty from the discharge forecaster
+    forecast = telemetry.forecast(battery_percent)
 
     socketio.emit("scheduling_update", {
         "battery": battery_percent,
         "cpu": cpu_percent,
-        "forecast": f"{estimated_time} mins left" if estimated_time else f"{battery_percent}%",
+        "forecast": forecast_text(forecast, battery_percent),
+        "forecastInterval": [forecast["low"], forecast["high"]],
         "temperature": current_temperature
     })
 
@@ -901,10 +846,10 @@ def handle_connect():
 def start_simulation(data=None):
     global CURRENT_SCHEDULER
 
-    battery = psutil.sensors_battery()
-    battery_percent = battery.percent if battery else 100
-    is_charging = battery.power_plugged if battery else False
-    cpu_load = psutil.cpu_percent()
+    snap = telemetry.snapshot()
+    battery_percent = snap.battery if snap.battery is not None else 100
+    is_charging = snap.plugged
+    cpu_load = snap.cpu
 
     # Same as scheduler_root.py
     if is_charging:
@@ -918,6 +863,7 @@ def start_simulation(data=None):
 
     # Update global tracker
     CURRENT_SCHEDULER = algo.lower().replace(" ", "_")
+    telemetry.forecaster.set_algorithm(algo)
 
     # Send algorithm name to frontend
     emit("update_algorithm", {"algorithm": algo,"battery": battery_percent}, broadcast=True)
@@ -925,13 +871,11 @@ def start_simulation(data=None):
     
     # Start background scheduler
     socketio.start_background_task(run_scheduler_with_intelligence, algo, app, socketio)
-    
-    socketio.start_background_task(emit_battery_impact_incremental, socketio, algo)
 
 @socketio.on("request_algorithm")
 def handle_request_algorithm():
-    battery = psutil.sensors_battery()
-    battery_percent = battery.percent if battery else 100
+    snap = telemetry.snapshot()
+    battery_percent = snap.battery if snap.battery is not None else 100
 
     algo_name = CURRENT_SCHEDULER.replace("_", " ").title()  # e.g., "round_robin" -> "Round Robin"
 
@@ -948,9 +892,16 @@ def handle_request_algorithm():
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        upgrade_schema()
 
+    # Shared telemetry sampler (battery / CPU / temperature snapshot for every reader)
+    print(f"🔄 Restored {telemetry.restore_history()} telemetry samples")
+    eventlet.spawn(telemetry.sampler.run, socketio.sleep)
     eventlet.spawn(start_temperature_monitoring)
     eventlet.spawn(emit_system_stats)
+    socketio.start_background_task(emit_algorithm_battery_comparison, socketio)
+    # One battery impact emitter for whichever algorithm is current
+    socketio.start_background_task(emit_battery_impact_incremental, socketio, app)
 
     # Start background scheduler
     socketio.start_background_task(start_scheduler)
@@ -958,6 +909,11 @@ if __name__ == "__main__":
     # Start real OS task updater
     socketio.start_background_task(update_real_tasks, socketio)
 
+    # Incremental scheduler model training from Log outcomes
+    if app.config.get("ONLINE_LEARNING"):
+        # Forest fits run in a real OS thread (tpool), not on the event loop
+        socketio.start_background_task(run_online_learning, app, socketio.sleep, tpool.execute)
+
     print("✅ Server starting...")
     socketio.run(app, debug=True, use_reloader=False)
 
@@ -0,0 +1,184 @@
+# battery_forecast.py
+"""
+Incremental battery discharge forecaster.
+
+Each on-battery sample updates a recursive least-squares fit of battery level
+and discharge rate (percent per second) in O(1). The fit forgets
+exponentially with time (half-life in seconds), so irregular sample times are
+weighted correctly. One fit is kept per scheduling algorithm, fed while that
+algorithm is active (set_algorithm), plus one over all samples that is used
+until the active algorithm has enough of its own data.
+
+Charging, sampling gaps and switching back to an algorithm re-anchor the
+level but keep the learned rate. forecast() returns minutes to empty with a
+confidence interval from the rate's standard error.
+"""
+import math
+
+# z for the two-sided 95% interval
+Z_95 = 1.96
+# Seconds without a sample after which the level is re-anchored
+MAX_GAP = 300
+# Prior variance of a fresh level / rate (in units of the noise variance)
+LEVEL_PRIOR = 1e4
+RATE_PRIOR = 1.0
+
+
+class RateEstimator:
+    """RLS with forgetting over (level, rate); state is one tuple, replaced per update."""
+    def __init__(self, half_life):
+        self.decay = math.log(2) / half_life   # forgetting per second
+        # (time, level, rate, P00, P01, P11, noise variance, samples)
+        self.state = None
+
+    def reanchor(self):
+        """Forget the level (after a gap / charging) and keep the rate."""
+        if self.state is not None:
+            t, level, rate, _, _, p11, noise, n = self.state
+            self.state = (t, level, rate, LEVEL_PRIOR, 0.0, p11, noise, n)
+
+    def update(self, t, battery):
+        if self.state is None:
+            self.state = (t, battery, 0.0, LEVEL_PRIOR, 0.0, RATE_PRIOR, 0.0, 1)
+            return
+        last, level, rate, p00, p01, p11, noise, n = self.state
+        dt = t - last
+        if dt <= 0:
+            return
+        if dt > MAX_GAP:
+            level, p00, p01 = battery, LEVEL_PRIOR, 0.0
+
+        # Predict: move the level along the rate, inflate P by the forgetting
+        grow = math.exp(self.decay * dt)
+        level += rate * dt
+        p00, p01 = (p00 + 2 * dt * p01 + dt * dt * p11) * grow, (p01 + dt * p11) * grow
+        p11 *= grow
+
+        # Correct with the observed level
+        s = p00 + 1.0
+        error = battery - level
+        k0, k1 = p00 / s, p01 / s
+        level += k0 * error
+        rate += k1 * error
+        p00, p01, p11 = p00 - k0 * p00, p01 - k0 * p01, p11 - k1 * p01
+
+        # Noise variance: forgetting average of normalized innovations
+        n += 1
+        weight = max(1 - 1 / grow, 1 / n)
+        noise += weight * (error * error / s - noise)
+        self.state = (t, level, rate, p00, p01, p11, noise, n)
+
+    def estimate(self):
+        """(level, rate %/s, rate standard error, samples), or None before the first sample."""
+        if self.state is None:
+            return None
+        _, level, rate, _, _, p11, noise, n = self.state
+        return level, rate, math.sqrt(max(noise * p11, 0.0)), n
+
+
+class DischargeForecaster:
+    def __init__(self, half_life=600, min_samples=30):
+        self.half_life = half_life
+        self.min_samples = min_samples
+        self.overall = RateEstimator(half_life)
+        self.estimators = {}     # algorithm name -> RateEstimator
+        self.algorithm = None    # active scheduling algorithm
+        self.battery = None
+        self.plugged = False
+        self._fed = None         # algorithm the previous sample went to
+
+    def set_algorithm(self, name):
+        """Condition the following samples on the active scheduling algorithm."""
+        self.algorithm = name
+
+    def append(self, timestamp, battery, cpu, temp, plugged):
+        """Sampler sink: one telemetry sample."""
+        if battery is None:
+            return
+        self.battery = battery
+        self.plugged = bool(plugged)
+        if self.plugged:
+            # Charging is not discharge: re-anchor everything on the next battery sample
+            self.overall.reanchor()
+            for estimator in self.estimators.values():
+                estimator.reanchor()
+            self._fed = None
+            return
+
+        self.overall.update(timestamp, battery)
+        name = self.algorithm
+        if name is not None:
+            estimator = self.estimators.get(name)
+            if estimator is None:
+                estimator = self.estimators[name] = RateEstimator(self.half_life)
+            elif name != self._fed:
+                estimator.reanchor()   # level moved while other algorithms ran
+            estimator.update(timestamp, battery)
+        self._fed = name
+
+    def _estimate(self, algorithm):
+        """(estimate, conditioned): the algorithm's fit once it has min_samples, else the overall fit."""
+        estimator = self.estimators.get(algorithm)
+        estimate = estimator.estimate() if estimator else None
+        if estimate is not None and estimate[3] >= self.min_samples:
+            return estimate, True
+        return self.overall.estimate(), False
+
+    def rate(self, algorithm=None):
+        """
+        Discharge rate of the given algorithm (the overall fit if None or not
+        enough of its own samples) as (mean %/s, variance), or None before
+        min_samples on-battery samples.
+        """
+        estimate, _ = self._estimate(algorithm)
+        if estimate is None or estimate[3] < self.min_samples:
+            return None
+        _, rate, error, _ = estimate
+        return rate, error * error
+
+    def forecast(self, battery=None, algorithm=None):
+        """
+        Time to empty for the active (or given) algorithm:
+        {"algorithm", "conditioned", "status", "level", "rate" (%/min),
+         "minutes", "low", "high", "samples"}. status is "charging",
+        "estimating" (too few samples), "idle" (not draining) or
+        "discharging"; only the last has minutes / low / high, and high is
+        None when the interval includes a flat or rising battery.
+        """
+        algorithm = algorithm or self.algorithm
+        battery = self.battery if battery is None else battery
+        estimate, conditioned = self._estimate(algorithm)
+
+        result = {"algorithm": algorithm, "conditioned": conditioned,
+                  "status": "charging" if self.plugged else "estimating",
+                  "level": None, "rate": None, "minutes": None, "low": None, "high": None,
+                  "samples": 0}
+        if estimate is None:
+            return result
+        level, rate, error, samples = estimate
+        result.update(level=round(level, 1), rate=round(rate * 60, 4), samples=samples)
+        if self.plugged or battery is None or samples < self.min_samples:
+            return result
+        if rate >= 0:
+            result["status"] = "idle"
+            return result
+
+        def minutes(r):
+            return round(battery / -r / 60, 1) if r < 0 else None
+
+        result.update(status="discharging", minutes=minutes(rate),
+                      low=minutes(rate - Z_95 * error),
+                      high=minutes(rate + Z_95 * error))
+        return result
+
+
+def forecast_text(forecast, battery=None):
+    """Dashboard label, e.g. "42.5 mins left (35.1–53.9)"; battery % if there is no estimate."""
+    if forecast["status"] == "charging":
+        return "∞ (Charging)"
+    if forecast["status"] == "idle":
+        return "∞ (Idle)"
+    if forecast["minutes"] is None:
+        return f"{battery}%" if battery is not None else "Unknown"
+    high = forecast["high"] if forecast["high"] is not None else "∞"
+    return f"{forecast['minutes']} mins left ({forecast['low']}–{high})"
@@ -0,0 +1,166 @@
+# battery_whatif.py
+"""
+Monte Carlo battery what-if per scheduling algorithm.
+
+For the pending workload, each algorithm is simulated once with
+scheduling.metrics (switch / I/O / idle energy and makespan), cached until
+the workload changes. Thousands of scenarios are then drawn in NumPy, varying:
+
+  - task energy     per-task lognormal noise, summed (normal approximation)
+  - arrivals        Poisson count of new tasks over the algorithm's makespan
+  - CPU load        background load around the current reading
+  - discharge model base drain from the discharge forecaster (rate +- its error)
+
+and reduced to p10 / p50 / p90 of battery remaining after the workload and of
+minutes to empty at that workload's drain. Scenarios run in chunks until
+`scenarios` are done or the latency budget is spent.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from scheduling.metrics import POWER, simulate_metrics
+from scheduling.scheduler import Process
+from scheduling.events import RUN
+from features import PRIORITY_VALUES
+
+# Dashboard name -> scheduling.events algorithm
+ALGORITHMS = {
+    "FCFS": "fcfs",
+    "Round Robin": "round_robin",
+    "SJF": "sjf",
+    "SRTF": "srtf",
+    "Priority Scheduling": "priority_scheduling",
+}
+PERCENTILES = (10, 50, 90)
+
+# Battery % drawn per unit of task energy
+PERCENT_PER_ENERGY = 0.05
+# Wall-clock seconds per simulated time unit (scheduler_root's playback pace)
+SECONDS_PER_UNIT = 0.5
+# Spread of a task's energy around its estimate (lognormal sigma)
+ENERGY_SIGMA = 0.25
+# Spread of the background CPU load (percentage points)
+CPU_SIGMA = 15.0
+# Share of the base drain that does not depend on CPU load (display, radios, ...)
+IDLE_SHARE = 0.4
+# Base drain when the forecaster has no estimate yet: %/s and its variance
+DEFAULT_RATE = (-0.01, 0.005 ** 2)
+# Pending tasks simulated per algorithm; larger workloads are scaled from this sample
+MAX_SIM_TASKS = 200
+# Scenarios drawn per chunk (between latency-budget checks)
+CHUNK = 1000
+
+# count / energy_sum / energy_sq_sum cover every pending task (models.TaskSummary);
+# processes is a list of (burst, priority) for at most MAX_SIM_TASKS of them
+Workload = namedtuple("Workload", ["count", "energy_sum", "energy_sq_sum", "processes"])
+
+
+def sample_processes(rows):
+    """(burst, priority) pairs from (remaining_time, burst_time, priority) task rows."""
+    return [(max(1, remaining or burst or 1), PRIORITY_VALUES.get(priority, 1))
+            for remaining, burst, priority in rows[:MAX_SIM_TASKS]]
+
+
+class WhatIf:
+    def __init__(self, scenarios=4000, budget_ms=50.0, seed=None):
+        self.scenarios = scenarios
+        self.budget = budget_ms / 1000
+        self.rng = np.random.default_rng(seed)
+        # (processes key, {algorithm: (overhead, makespan units of the sample)})
+        self._profiles = (None, None)
+
+    def profiles(self, workload):
+        """
+        Per algorithm: (energy overhead over pure CPU work, makespan in time
+        units) of the workload. The sample's simulation is cached; its makespan
+        is scaled up to workload.count on every call, since the count changes
+        while the (bounded) sample stays the same.
+        """
+        key = tuple(workload.processes)
+        if self._profiles[0] != key:
+            processes = [Process(pid, burst, prio) for pid, (burst, prio) in enumerate(key)]
+            work = sum(burst for burst, _ in key) * POWER[RUN]
+            sampled = {}
+            for name, algorithm in ALGORITHMS.items():
+                if not key:
+                    sampled[name] = (1.0, 0.0)
+                    continue
+                metrics = simulate_metrics(processes, algorithm)
+                sampled[name] = (metrics["energy"] / work, metrics["makespan"])
+            self._profiles = (key, sampled)
+        scale = workload.count / len(key) if key else 0
+        return {name: (overhead, makespan * scale)
+                for name, (overhead, makespan) in self._profiles[1].items()}
+
+    def _draw(self, n, workload, battery, cpu, rate, rate_variance, arrival_rate, profiles):
+        """n scenarios for every algorithm: (remaining %, minutes to empty), each (algorithms, n)."""
+        rng = self.rng
+        # Task energy: sum of independent lognormals, by its mean and variance
+        mean = np.exp(ENERGY_SIGMA ** 2 / 2)
+        var = (np.exp(ENERGY_SIGMA ** 2) - 1) * np.exp(ENERGY_SIGMA ** 2)
+        energy = np.maximum(rng.normal(workload.energy_sum * mean,
+                                       np.sqrt(workload.energy_sq_sum * var), n), 0)
+        # Background load and the base drain it scales
+        load = np.clip(rng.normal(cpu, CPU_SIGMA, n), 0, 100)
+        base = np.minimum(rng.normal(rate, np.sqrt(rate_variance), n), 0)
+        base *= (IDLE_SHARE + (1 - IDLE_SHARE) * load / 100) / (IDLE_SHARE + (1 - IDLE_SHARE) * cpu / 100)
+        task_mean = workload.energy_sum / workload.count if workload.count else 0.0
+
+        overhead = np.array([p[0] for p in profiles.values()])[:, None]
+        seconds = np.array([p[1] for p in profiles.values()])[:, None] * SECONDS_PER_UNIT
+        arrivals = rng.poisson(arrival_rate * seconds * np.ones((1, n)))
+        arrival_energy = arrivals * task_mean * rng.lognormal(0, ENERGY_SIGMA, arrivals.shape)
+
+        used = (energy + arrival_energy) * overhead * PERCENT_PER_ENERGY - base * seconds
+        remaining = np.clip(battery - used, 0, 100)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drain = np.where(seconds > 0, used / seconds, -base)   # %/s while running the workload
+            minutes = np.where(drain > 0, battery / drain / 60, np.inf)
+        return remaining, minutes
+
+    def run(self, workload, battery, cpu, rate=None, arrival_rate=0.0):
+        """
+        :param workload: Workload of the pending tasks
+        :param battery: current battery %
+        :param cpu: current CPU %
+        :param rate: base drain as (mean %/s, negative, and its variance), e.g.
+                     DischargeForecaster.rate(); DEFAULT_RATE if None
+        :param arrival_rate: new tasks per second
+        :return: {"scenarios", "elapsed_ms", "algorithms": {name: {"battery_used",
+                 "remaining": {p10, p50, p90}, "time_to_empty": {p10, p50, p90}}}}
+        """
+        start = time.perf_counter()
+        rate, rate_variance = rate or DEFAULT_RATE
+        profiles = self.profiles(workload)
+
+        remaining, minutes = [], []
+        done = 0
+        while done < self.scenarios:
+            n = min(CHUNK, self.scenarios - done)
+            r, m = self._draw(n, workload, battery, cpu, rate, rate_variance, arrival_rate, profiles)
+            remaining.append(r)
+            minutes.append(m)
+            done += n
+            if time.perf_counter() - start > self.budget:
+                break
+        remaining = np.concatenate(remaining, axis=1)
+        minutes = np.concatenate(minutes, axis=1)
+        remaining_q = np.percentile(remaining, PERCENTILES, axis=1)
+        minutes_q = np.percentile(minutes, PERCENTILES, axis=1)
+
+        def quantiles(values):
+            return {f"p{q}": (round(float(v), 1) if np.isfinite(v) else None)
+                    for q, v in zip(PERCENTILES, values)}
+
+        algorithms = {}
+        for i, name in enumerate(profiles):
+            algorithms[name] = {
+                "battery_used": round(float(battery - remaining_q[1, i]), 1),
+                "remaining": quantiles(remaining_q[:, i]),
+                "time_to_empty": quantiles(minutes_q[:, i]),
+            }
+        return {"scenarios": done,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                "algorithms": algorithms}
@@ -0,0 +1,181 @@
+# benchmark_scheduler.py
+"""
+Scaling benchmark for the scheduling engine.
+
+Compares, for growing process counts:
+  - list     : the previous list-based generators (sort/min per dispatch,
+               waiting-list rescans), reproduced below as the baseline
+  - heap     : the current generators in scheduling/scheduler.py
+  - events   : the discrete-event core in scheduling/events.py without
+               ready-queue snapshots (metric-only runs)
+
+Usage: python benchmark_scheduler.py [--max-n 100000] [--max-generator-n 4000] [--seed 42]
+"""
+import argparse
+import random
+import time
+
+from scheduling.scheduler import (
+    Process, sjf, srtf, priority_scheduling,
+    run_for_one_unit, context_switch_step, CONTEXT_SWITCH, IO_WAIT,
+)
+from scheduling.events import simulate
+
+
+# =========================
+# Baseline (list-based) generators
+# =========================
+def _list_sjf(processes, key=lambda p: p.burst_time):
+    time_elapsed = 0
+    ready_queue = []
+    waiting = sorted(processes, key=lambda p: p.arrival_time)
+
+    while waiting or ready_queue:
+        for p in waiting[:]:
+            if p.arrival_time <= time_elapsed:
+                ready_queue.append(p)
+                waiting.remove(p)
+
+        if not ready_queue:
+            yield {"running": None, "queue": []}
+            time_elapsed += 1
+            continue
+
+        ready_queue.sort(key=key)
+        current = ready_queue.pop(0)
+
+        for _ in range(CONTEXT_SWITCH):
+            yield context_switch_step(ready_queue)
+            time_elapsed += 1
+
+        while current.remaining_time > 0:
+            step = run_for_one_unit(current, ready_queue, time_elapsed)
+            if step:
+                yield step
+                time_elapsed += 1
+
+            if current.waiting_for_io:
+                for _ in range(IO_WAIT):
+                    yield {"running": None, "queue": [p.pid for p in ready_queue]}
+                    time_elapsed += 1
+                current.waiting_for_io = False
+                ready_queue.append(current)
+                break
+
+
+def _list_priority(processes):
+    return _list_sjf(processes, key=lambda p: p.priority)
+
+
+def _list_srtf(processes):
+    time_elapsed = 0
+    ready_queue = []
+    waiting = sorted(processes, key=lambda p: p.arrival_time)
+    current = None
+
+    while waiting or ready_queue or (current and current.remaining_time > 0):
+        for p in waiting[:]:
+            if p.arrival_time <= time_elapsed:
+                ready_queue.append(p)
+                waiting.remove(p)
+
+        available = [p for p in ready_queue if p.remaining_time > 0 and not p.waiting_for_io]
+        if current and current.remaining_time > 0 and not current.waiting_for_io:
+            available.append(current)
+
+        if not available:
+            yield {"running": None, "queue": []}
+            time_elapsed += 1
+            continue
+
+        next_proc = min(available, key=lambda p: p.remaining_time)
+        if current != next_proc:
+            if current and current.remaining_time > 0:
+                ready_queue.append(current)
+            for _ in range(CONTEXT_SWITCH):
+                yield context_switch_step(ready_queue)
+                time_elapsed += 1
+            current = next_proc
+            if current in ready_queue:
+                ready_queue.remove(current)
+
+        step = run_for_one_unit(current, ready_queue, time_elapsed)
+        if step:
+            yield step
+        time_elapsed += 1
+
+        if current.waiting_for_io:
+            for _ in range(IO_WAIT):
+                yield {"running": None, "queue": [p.pid for p in ready_queue]}
+                time_elapsed += 1
+            current.waiting_for_io = False
+            ready_queue.append(current)
+            current = None
+
+
+# =========================
+# Workload + timing helpers
+# =========================
+def make_workload(n, seed):
+    """n processes with 1-20 unit bursts, arrivals spread over ~5n units, 30% with one I/O."""
+    rnd = random.Random(seed)
+    processes = []
+    for pid in range(1, n + 1):
+        burst = rnd.randint(1, 20)
+        io_times = {rnd.randint(1, burst - 1)} if burst > 2 and rnd.random() < 0.3 else set()
+        processes.append(Process(
+            pid=pid,
+            burst_time=burst,
+            priority=rnd.randint(0, 2),
+            arrival_time=rnd.randint(0, 5 * n),
+            io_times=io_times,
+        ))
+    return processes
+
+
+def time_generator(factory, n, seed):
+    processes = make_workload(n, seed)
+    start = time.perf_counter()
+    for _ in factory(processes):
+        pass
+    return time.perf_counter() - start
+
+
+def time_events(algorithm, n, seed):
+    processes = make_workload(n, seed)
+    start = time.perf_counter()
+    simulate(processes, algorithm, record_queue=False)
+    return time.perf_counter() - start
+
+
+CASES = [
+    ("sjf", _list_sjf, sjf),
+    ("srtf", _list_srtf, srtf),
+    ("priority_scheduling", _list_priority, priority_scheduling),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler scaling benchmark")
+    parser.add_argument("--max-n", type=int, default=100000, help="largest process count for the event core")
+    parser.add_argument("--max-generator-n", type=int, default=4000,
+                        help="largest process count for the per-tick generators")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = [n for n in (1000, 2000, 4000, 8000, 20000, 50000, 100000) if n < args.max_n] + [args.max_n]
+
+    print(f"{'algorithm':<20}{'n':>8}{'list (s)':>12}{'heap (s)':>12}{'events (s)':>12}")
+    for name, baseline, current in CASES:
+        for n in sizes:
+            if n <= args.max_generator_n:
+                t_list = f"{time_generator(baseline, n, args.seed):.2f}"
+                t_heap = f"{time_generator(current, n, args.seed):.2f}"
+            else:
+                t_list = t_heap = "-"
+            t_events = f"{time_events(name, n, args.seed):.2f}"
+            print(f"{name:<20}{n:>8}{t_list:>12}{t_heap:>12}{t_events:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,51 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'replace_this_with_random_secret_key'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Dashboard playback speed for scheduler simulations: x1 / x10 / max
+    SIMULATION_SPEED = os.environ.get('SIMULATION_SPEED') or 'x1'
+    # Scheduler output: 'steps' (one scheduling_step per time unit) or
+    # 'segments' (one scheduling_step per dispatch, with its start / end)
+    SCHEDULER_OUTPUT = os.environ.get('SCHEDULER_OUTPUT') or 'steps'
+    # Core layout for multi-core evaluation: "4" or "count:speed:power,..." groups
+    # (e.g. "4:1.0:1.0,4:0.5:0.3" for big.LITTLE); unset = all logical cores, identical
+    CPU_CORE_LAYOUT = os.environ.get('CPU_CORE_LAYOUT')
+    # Ready queues for multi-core evaluation: 'global' or 'per_core' (with work stealing)
+    CPU_QUEUE_MODE = os.environ.get('CPU_QUEUE_MODE') or 'global'
+    # Number of scheduler analytics reports kept in the LRU result cache
+    ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE') or 64)
+    # Largest workload set / workload size accepted by one parameter sweep request
+    SWEEP_MAX_WORKLOADS = int(os.environ.get('SWEEP_MAX_WORKLOADS') or 1000)
+    SWEEP_MAX_PROCESSES = int(os.environ.get('SWEEP_MAX_PROCESSES') or 64)
+    # Parameter sweeps allowed to run at once; further requests get a 429
+    SWEEP_MAX_RUNNING = int(os.environ.get('SWEEP_MAX_RUNNING') or 2)
+    # Answer scheduler model queries from a precompiled, memory-mapped lookup table
+    SCHEDULER_DECISION_TABLE = os.environ.get('SCHEDULER_DECISION_TABLE', '').lower() in ('1', 'true', 'yes')
+    # Seconds between checks of the model .pkl files for a new version (hot reload)
+    MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL') or 5)
+    # Candidate models scored in shadow mode next to the live ones (unset = off)
+    SCHEDULER_MODEL_CANDIDATE = os.environ.get('SCHEDULER_MODEL_CANDIDATE')
+    PRIORITY_MODEL_CANDIDATE = os.environ.get('PRIORITY_MODEL_CANDIDATE')
+    # Incremental scheduler model training from Log outcomes (see online_learning.py)
+    ONLINE_LEARNING = os.environ.get('ONLINE_LEARNING', '').lower() in ('1', 'true', 'yes')
+    # Where online-trained versions are published; not the live model, so point
+    # SCHEDULER_MODEL_CANDIDATE here to shadow them and copy them over to promote
+    ONLINE_MODEL_PATH = os.environ.get('ONLINE_MODEL_PATH') or 'scheduler_model_online.pkl'
+    # Seconds between training passes / between publications, and replay buffer rows
+    ONLINE_LEARNING_INTERVAL = float(os.environ.get('ONLINE_LEARNING_INTERVAL') or 60)
+    ONLINE_PUBLISH_INTERVAL = float(os.environ.get('ONLINE_PUBLISH_INTERVAL') or 600)
+    ONLINE_BUFFER_SIZE = int(os.environ.get('ONLINE_BUFFER_SIZE') or 20000)
+    # Largest number of tasks accepted by one /tasks/import request
+    TASK_IMPORT_MAX_ROWS = int(os.environ.get('TASK_IMPORT_MAX_ROWS') or 50000)
+    # Keyword → energy / deadline profile table for new tasks (see task_profiles.py)
+    TASK_PROFILES_PATH = os.environ.get('TASK_PROFILES_PATH') or os.path.join(BASE_DIR, 'task_profiles.json')
+    # Seconds between telemetry samples (battery / CPU / temperature, see telemetry.py)
+    TELEMETRY_INTERVAL = float(os.environ.get('TELEMETRY_INTERVAL') or 1)
+    # SQLite file for the persistent telemetry series (see telemetry_store.py)
+    TELEMETRY_DB_PATH = os.environ.get('TELEMETRY_DB_PATH') or os.path.join(BASE_DIR, 'telemetry.db')
+    # Hours of raw (per-sample) telemetry kept; older data survives in the 1m / 1h rollups
+    TELEMETRY_RAW_RETENTION_HOURS = float(os.environ.get('TELEMETRY_RAW_RETENTION_HOURS') or 48)
+    # Seconds after which a battery reading counts half in the discharge forecast (see battery_forecast.py)
+    FORECAST_HALF_LIFE = float(os.environ.get('FORECAST_HALF_LIFE') or 600)
+    # Monte Carlo scenarios per battery what-if, and the time they may take (see battery_whatif.py)
+    WHATIF_SCENARIOS = int(os.environ.get('WHATIF_SCENARIOS') or 4000)
+    WHATIF_BUDGET_MS = float(os.environ.get('WHATIF_BUDGET_MS') or 50)
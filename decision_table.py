@@ -0,0 +1,149 @@
+# decision_table.py
+"""
+Dense decision table for scheduler_model.pkl.
+
+The scheduler model only sees (battery, cpu, temp, priority), all small
+bounded values, so its whole input space fits in a 101 x 101 x 121 x 3
+uint8 array (~3.7 MB). The table is compiled once per model file from the
+sklearn pickle (cached on disk next to it, named after the model's content
+hash, older tables are pruned) and memory-mapped, so a decision is a single
+array lookup instead of 100 tree walks. Compile it ahead of time with the
+command below; the server otherwise compiles it in the background.
+
+Usage: python decision_table.py [--model scheduler_model.pkl] [--samples 100000]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import pickle
+import time
+import warnings
+
+import numpy as np
+
+from forest_model import file_digest
+
+FEATURES = ["battery", "cpu", "temp", "priority"]
+# Inclusive integer range covered for each feature; inputs are rounded and clipped into it
+RANGES = {"battery": (0, 100), "cpu": (0, 100), "temp": (0, 120), "priority": (0, 2)}
+SHAPE = tuple(high - low + 1 for low, high in RANGES.values())
+
+
+def _predict(model, X):
+    """Model predictions for rows in FEATURES order (a plain array, as serving passes them)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)   # sklearn: unnamed columns, same order
+        return np.asarray(model.predict(X))
+
+
+def table_path(model_path, digest=None):
+    """Cached table for a model file; digest (of the file, as in file_digest) is computed if not given."""
+    base = os.path.dirname(os.path.abspath(model_path))
+    digest = digest or file_digest(model_path)
+    return os.path.join(base, f"scheduler_table_{digest[:12]}.npy")
+
+
+def prune_tables(keep):
+    """Delete the cached tables next to `keep` that belong to other model versions."""
+    for path in glob.glob(os.path.join(os.path.dirname(keep), "scheduler_table_*.npy")):
+        if path != keep and not path.endswith(".tmp.npy"):   # skip tables still being written
+            try:
+                os.remove(path)
+            except OSError as e:   # e.g. still memory-mapped on Windows
+                print(f"⚠️ Could not remove stale decision table {os.path.basename(path)}: {e}")
+
+
+class DecisionTable:
+    def __init__(self, table):
+        if table.shape != SHAPE:
+            raise ValueError(f"Decision table has shape {table.shape}, expected {SHAPE}")
+        self.table = table
+
+    @classmethod
+    def compile(cls, model, sleep=None):
+        """
+        Evaluate the model on every grid point, one battery level per predict
+        call; sleep(0), if given, runs between calls to yield to other tasks.
+        """
+        _, cpu, temp, prio = np.meshgrid(
+            [0], *(np.arange(low, high + 1) for low, high in list(RANGES.values())[1:]), indexing="ij"
+        )
+        rest = np.column_stack([cpu.ravel(), temp.ravel(), prio.ravel()])
+        table = np.empty(SHAPE, dtype=np.uint8)
+        low = RANGES["battery"][0]
+        for b in range(SHAPE[0]):
+            features = np.column_stack([np.full(len(rest), b + low), rest])
+            table[b] = _predict(model, features).astype(np.uint8).reshape(SHAPE[1:])
+            if sleep is not None:
+                sleep(0)
+        return cls(table)
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(path, mmap_mode="r"))
+
+    @classmethod
+    def load_cached(cls, model_path, digest=None):
+        """Memory-map the cached table for this model file, or None if it has not been compiled."""
+        path = table_path(model_path, digest)
+        return cls.load(path) if os.path.exists(path) else None
+
+    @classmethod
+    def load_or_compile(cls, model_path, model=None, sleep=None):
+        """
+        Memory-map the cached table for this model file, compiling it first if
+        needed (from `model`, or the pickle itself) and pruning older tables.
+        """
+        with open(model_path, "rb") as f:
+            data = f.read()
+        # Hash and unpickle the same bytes, so the table is named after the model it holds
+        path = table_path(model_path, hashlib.sha1(data).hexdigest())
+        if not os.path.exists(path):
+            if model is None:
+                model = pickle.loads(data)
+            start = time.perf_counter()
+            table = cls.compile(model, sleep).table
+            # Write then rename, so a concurrent reader never maps a half-written file
+            tmp = path + ".tmp.npy"
+            np.save(tmp, table)
+            os.replace(tmp, path)
+            print(f"✅ Compiled decision table in {time.perf_counter() - start:.1f}s → {os.path.basename(path)}")
+            prune_tables(path)
+        return cls.load(path)
+
+    def predict(self, battery, cpu, temp, priority):
+        """Vectorized lookup; scalars or arrays (broadcast together), values are rounded and clipped."""
+        index = tuple(
+            np.clip(np.rint(np.asarray(value, dtype=float)).astype(np.intp), low, high) - low
+            for value, (low, high) in zip((battery, cpu, temp, priority), RANGES.values())
+        )
+        return self.table[index]
+
+    def agreement_rate(self, model, samples=100000, seed=0):
+        """
+        Fraction of random real-valued inputs (uniform over the covered ranges)
+        on which the table and the model make the same decision.
+        """
+        rnd = np.random.default_rng(seed)
+        columns = [rnd.uniform(low, high, samples) for low, high in RANGES.values()]
+        columns[-1] = rnd.integers(RANGES["priority"][0], RANGES["priority"][1] + 1, samples)
+        expected = _predict(model, np.column_stack(columns))
+        return float(np.mean(self.predict(*columns) == expected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and validate the scheduler decision table")
+    parser.add_argument("--model", default="scheduler_model.pkl")
+    parser.add_argument("--samples", type=int, default=100000, help="random inputs for the agreement check")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+    table = DecisionTable.load_or_compile(args.model, model)
+    rate = table.agreement_rate(model, args.samples)
+    print(f"✅ Table agrees with the model on {rate:.2%} of {args.samples} random inputs")
+
+
+if __name__ == "__main__":
+    main()
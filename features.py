@@ -0,0 +1,119 @@
+# features.py
+"""
+Priority-model feature pipeline, shared by training (train_priority_model.py,
+training.py) and serving (app.add_task).
+
+The raw inputs are energy, deadline_hours, cpu and battery, and three ratios
+are derived from them. priority_matrix() transforms whole NumPy columns at
+once (batch serving and training). priority_row() is the per-request fast
+path (plain floats). Serving passes plain arrays in PRIORITY_FEATURES order,
+so it needs no pandas. check_priority_model() runs on every model load to
+catch training/serving skew.
+"""
+import csv
+import itertools
+import os
+import warnings
+
+import numpy as np
+
+# Task priority label -> numeric priority for the schedulers and the scheduler
+# model (lower runs first); shared by scheduler_root, online_learning and battery_whatif
+PRIORITY_VALUES = {"High": 0, "Medium": 1, "Low": 2}
+# Task priority label -> class the priority model predicts (training label encoding)
+PRIORITY_CLASSES = {"Low": 0, "Medium": 1, "High": 2}
+# Bump when the derived features change (invalidates training.py's feature store)
+FEATURE_VERSION = 1
+RAW_FEATURES = ["energy", "deadline_hours", "cpu", "battery"]
+PRIORITY_FEATURES = RAW_FEATURES + ["energy_per_cpu", "cpu_battery_ratio", "deadline_inverse"]
+# Labelled rows every loaded priority model is scored on, and the score it must reach
+CHECK_DATA = "priority_data_full.csv"
+CHECK_ROWS = 500
+MIN_ACCURACY = 0.8
+
+
+def _nonzero(values):
+    # Divisors of 0 are replaced by 1, as in the original training data preparation
+    return np.where(values == 0, 1, values)
+
+
+def priority_matrix(energy, deadline_hours, cpu, battery):
+    """(n, 7) features in PRIORITY_FEATURES order from raw columns (arrays or scalars)."""
+    energy, deadline_hours, cpu, battery = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (energy, deadline_hours, cpu, battery))
+    )
+    return np.column_stack([
+        energy, deadline_hours, cpu, battery,
+        energy / _nonzero(cpu),
+        cpu / _nonzero(battery),
+        1 / _nonzero(deadline_hours),
+    ])
+
+
+def add_priority_features(df):
+    """Add the derived columns to a DataFrame holding the raw ones (training)."""
+    matrix = priority_matrix(*(df[name].to_numpy() for name in RAW_FEATURES))
+    for i, name in enumerate(PRIORITY_FEATURES[len(RAW_FEATURES):], start=len(RAW_FEATURES)):
+        df[name] = matrix[:, i]
+    return df
+
+
+def priority_row(energy, deadline_hours, cpu, battery):
+    """Single-request fast path: one row as a nested list, the same values as priority_matrix."""
+    return [[
+        energy, deadline_hours, cpu, battery,
+        energy / (cpu if cpu != 0 else 1),
+        cpu / (battery if battery != 0 else 1),
+        1 / (deadline_hours if deadline_hours != 0 else 1),
+    ]]
+
+
+# =========================
+# Training/Serving Skew Check
+# =========================
+def _labelled_rows(path, limit):
+    """Raw feature columns and class labels of the first `limit` rows of a training CSV."""
+    with open(path, newline="") as f:
+        rows = list(itertools.islice(csv.DictReader(f), limit))
+    raw = [np.array([float(row[name]) for row in rows]) for name in RAW_FEATURES]
+    return raw, np.array([PRIORITY_CLASSES[row["priority"]] for row in rows])
+
+
+def check_priority_model(model, samples=500, seed=0, data_path=CHECK_DATA, rows=CHECK_ROWS):
+    """
+    Raise ValueError on training/serving skew:
+    - the model was trained on other columns, or in another order, than
+      serving builds (only for models that recorded their feature names);
+    - the single-row path (priority_row) and the batch path (priority_matrix)
+      compute different values, on random inputs including zero divisors;
+    - on labelled training rows with features built by the serving path, the
+      model scores below MIN_ACCURACY against the recorded labels, as it
+      does when features or label encoding drift from what it was trained on.
+      The rows may have been trained on, so this catches skew, not overfitting,
+      and it is skipped if data_path is missing.
+    """
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None and list(names) != PRIORITY_FEATURES:
+        raise ValueError(f"Model expects {list(names)}, serving builds {PRIORITY_FEATURES}")
+
+    rnd = np.random.default_rng(seed)
+    raw = [rnd.uniform(0, 100, samples), rnd.uniform(0, 24, samples),
+           rnd.uniform(0, 100, samples), rnd.uniform(0, 100, samples)]
+    for column in raw:
+        column[rnd.integers(0, samples, samples // 20)] = 0
+    batch = priority_matrix(*raw)
+    single = np.array([priority_row(*map(float, values))[0] for values in zip(*raw)])
+    if not np.array_equal(batch, single):
+        raise ValueError("Single-row and batch feature paths produce different values")
+
+    if not os.path.exists(data_path):
+        return {"rows": 0, "accuracy": None}
+    raw, labels = _labelled_rows(data_path, rows)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)   # sklearn: unnamed rows, as in serving
+        predicted = np.asarray(model.predict(priority_matrix(*raw)))
+    accuracy = float(np.mean(predicted == labels))
+    if accuracy < MIN_ACCURACY:
+        raise ValueError(f"Model scores {accuracy:.1%} on {len(labels)} labelled rows of {data_path}, "
+                         f"expected at least {MIN_ACCURACY:.0%}")
+    return {"rows": len(labels), "accuracy": round(accuracy, 4)}
@@ -0,0 +1,203 @@
+# forest_model.py
+"""
+NumPy-only serving for the pickled RandomForestClassifiers.
+
+export_forest() flattens every fitted tree into shared contiguous arrays
+(feature, threshold, left, right, leaf class probabilities) saved as an .npz
+next to the model. ForestModel evaluates all trees for a whole batch at once
+and only needs NumPy, so serving does not import scikit-learn.
+
+Usage:
+  python forest_model.py export [scheduler_model.pkl priority_model.pkl]
+  python forest_model.py verify [--samples 20000]   # compare with sklearn
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+
+import numpy as np
+
+MODEL_FILES = ("scheduler_model.pkl", "priority_model.pkl")
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_path(model_path):
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+# =========================
+# Exporter
+# =========================
+def export_forest(model, path, source_digest=""):
+    """
+    Flatten a fitted RandomForestClassifier into one .npz.
+    Node indices are global across trees; leaves point to themselves so a
+    fixed number of vectorized steps (the deepest tree) reaches every leaf.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        nodes = np.arange(offset, offset + n)
+        leaf = tree.children_left == -1
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(leaf, nodes, tree.children_left + offset))
+        rights.append(np.where(leaf, nodes, tree.children_right + offset))
+        # Class distribution per node, normalized like DecisionTreeClassifier.predict_proba
+        value = tree.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1
+        values.append(value / totals)
+        roots.append(offset)
+        offset += n
+
+    names = getattr(model, "feature_names_in_", None)
+    np.savez(
+        path,
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        value=np.concatenate(values),
+        roots=np.asarray(roots, dtype=np.intp),
+        depth=np.asarray(max(e.tree_.max_depth for e in model.estimators_)),
+        classes=np.asarray(model.classes_),
+        feature_names=np.asarray(names if names is not None else [], dtype=str),
+        source_digest=np.asarray(source_digest),
+    )
+
+
+# =========================
+# Evaluator
+# =========================
+class ForestModel:
+    """Drop-in predict/predict_proba for an exported forest."""
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.depth = int(arrays["depth"])
+        self.classes_ = arrays["classes"]
+        self.feature_names_in_ = arrays["feature_names"] if len(arrays["feature_names"]) else None
+        self.source_digest = str(arrays["source_digest"])
+        self.n_estimators = len(self.roots)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def _matrix(self, X):
+        # Columns by name for DataFrames (like sklearn), float32 like sklearn's tree code
+        if self.feature_names_in_ is not None and hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)]
+        return np.asarray(X, dtype=np.float32)
+
+    def predict_proba(self, X):
+        X = self._matrix(X)
+        rows = np.arange(len(X))
+        # One row of node indices per tree, all advanced together
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        # Accumulate tree by tree, in sklearn's order, so ties break identically
+        leaf_values = self.value[nodes]
+        proba = np.zeros((len(X), len(self.classes_)))
+        for tree_values in leaf_values:
+            proba += tree_values
+        return proba / self.n_estimators
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def load_model(model_path):
+    """
+    The exported forest if it is up to date with the pickle (no sklearn import),
+    otherwise the pickled model itself.
+    """
+    exported = export_path(model_path)
+    if os.path.exists(exported):
+        forest = ForestModel.load(exported)
+        if forest.source_digest == file_digest(model_path):
+            return forest
+        print(f"⚠️ {os.path.basename(exported)} is stale, using {os.path.basename(model_path)}")
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+# =========================
+# Verification
+# =========================
+def verify(model_path, samples=20000, seed=0):
+    """
+    Compare the exported forest with sklearn on random inputs around the
+    training range plus every split threshold (the boundary cases).
+    Returns (mismatched predictions, max probability difference).
+    """
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    forest = ForestModel.load(export_path(model_path))
+
+    rnd = np.random.default_rng(seed)
+    n_features = model.n_features_in_
+    X = rnd.uniform(-10, 130, size=(samples, n_features))
+    # Exact thresholds and their float32 neighbours on every feature
+    split = forest.feature[forest.left != np.arange(len(forest.left))]
+    values = forest.threshold[forest.left != np.arange(len(forest.left))]
+    boundary = rnd.uniform(-10, 130, size=(len(values) * 3, n_features))
+    for k, delta in enumerate((0.0, -1e-6, 1e-6)):
+        block = slice(k * len(values), (k + 1) * len(values))
+        boundary[block, :][np.arange(len(values)), split] = values + delta
+    X = np.vstack([X, boundary])
+
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        import pandas as pd
+        X = pd.DataFrame(X, columns=names)
+
+    mismatches = int(np.sum(model.predict(X) != forest.predict(X)))
+    max_diff = float(np.max(np.abs(model.predict_proba(X) - forest.predict_proba(X))))
+    return mismatches, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export / verify NumPy forests")
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("models", nargs="*", default=list(MODEL_FILES))
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    failed = False
+    for model_path in args.models:
+        if args.command == "export":
+            with open(model_path, "rb") as f:
+                model = pickle.load(f)
+            export_forest(model, export_path(model_path), file_digest(model_path))
+            print(f"✅ Exported {model_path} → {export_path(model_path)}")
+        else:
+            mismatches, max_diff = verify(model_path, args.samples)
+            status = "✅" if mismatches == 0 else "❌"
+            failed |= mismatches > 0
+            print(f"{status} {model_path}: {mismatches} mismatched predictions, max |Δproba| = {max_diff:.2e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# model_registry.py
+"""
+Lazy, versioned access to the scheduler / priority models.
+
+A ModelRegistry loads its artifact on first use (via forest_model.load_model,
+so the NumPy export is used when it is up to date) and identifies each loaded
+model by the content hash of the .pkl. At most every `check_interval` seconds
+it stats the file; when a different artifact appears it is loaded off to the
+side and swapped in with a single reference assignment, so callers always see
+one complete model. A failed load (e.g. a half-written file) keeps serving the
+previous version, as does one rejected by the optional `validate` hook (e.g.
+the training/serving skew check in features.py).
+
+Shadow mode: give the registry a candidate artifact and predict() also scores
+every batch with the candidate, recording disagreement rate and latency of
+both models while only the live predictions are returned.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from forest_model import file_digest, load_model
+
+
+# =========================
+# Shadow Statistics
+# =========================
+class ShadowStats:
+    """Running disagreement / latency counters for a shadow candidate."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.batches = 0
+            self.rows = 0
+            self.disagreements = 0
+            self.errors = 0
+            self.live_ms = 0.0
+            self.shadow_ms = 0.0
+            self.live_ms_max = 0.0
+            self.shadow_ms_max = 0.0
+
+    def record(self, live, shadow, live_ms, shadow_ms):
+        disagreements = int(np.sum(np.asarray(live) != np.asarray(shadow)))
+        with self._lock:
+            self.batches += 1
+            self.rows += len(live)
+            self.disagreements += disagreements
+            self.live_ms += live_ms
+            self.shadow_ms += shadow_ms
+            self.live_ms_max = max(self.live_ms_max, live_ms)
+            self.shadow_ms_max = max(self.shadow_ms_max, shadow_ms)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            batches = self.batches or 1
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "disagreements": self.disagreements,
+                "disagreement_rate": round(self.disagreements / self.rows, 4) if self.rows else None,
+                "errors": self.errors,
+                "live_ms_mean": round(self.live_ms / batches, 3),
+                "shadow_ms_mean": round(self.shadow_ms / batches, 3),
+                "live_ms_max": round(self.live_ms_max, 3),
+                "shadow_ms_max": round(self.shadow_ms_max, 3),
+            }
+
+
+# =========================
+# Registry
+# =========================
+class ModelRegistry:
+    def __init__(self, path, name="model", shadow_path=None, check_interval=5.0, loader=load_model,
+                 validate=None):
+        self.path = path
+        self.name = name
+        self.check_interval = check_interval
+        self._loader = loader
+        self._validate = validate   # called with each newly loaded model; raising rejects it
+        self._lock = threading.Lock()
+        self._current = None        # (version, model), replaced as a whole
+        self._stamp = None          # (mtime_ns, size) of the artifact last looked at
+        self._checked = None        # monotonic time of the last check
+        self.shadow = None
+        self.shadow_stats = ShadowStats()
+        if shadow_path:
+            self.set_shadow(shadow_path)
+
+    def get(self):
+        """The live model (None if there is none), loading or hot-reloading it when due."""
+        now = time.monotonic()
+        if self._checked is None or now - self._checked >= self.check_interval:
+            self._refresh(now)
+        current = self._current
+        return current[1] if current else None
+
+    @property
+    def version(self):
+        """Short content hash of the live model's artifact (None if no model is loaded)."""
+        self.get()
+        current = self._current
+        return current[0] if current else None
+
+    def _refresh(self, now):
+        with self._lock:
+            if self._checked is not None and now - self._checked < self.check_interval:
+                return  # another caller just checked
+            self._checked = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                if self._current is None and self._stamp is None:
+                    print(f"⚠️ No {self.name} found at {self.path}")
+                    self._stamp = ()
+                return  # keep serving whatever is loaded
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return
+
+            try:
+                version = file_digest(self.path)[:12]
+                if self._current and self._current[0] == version:
+                    self._stamp = stamp   # touched, same content
+                    return
+                model = self._loader(self.path)
+                if self._validate:
+                    self._validate(model)
+            except Exception as e:
+                # Partially written or broken artifact: retry on the next check
+                print(f"⚠️ Failed to load {self.name} from {self.path}: {e}")
+                return
+
+            previous = self._current
+            self._current = (version, model)
+            self._stamp = stamp
+            if previous:
+                print(f"🔄 Hot-reloaded {self.name}: {previous[0]} → {version}")
+            else:
+                print(f"✅ Loaded {self.name} ({version})")
+
+    def reload(self):
+        """Check the artifact now instead of waiting for the next interval."""
+        self._refresh(time.monotonic() + self.check_interval)
+        if self.shadow is not None:
+            self.shadow.reload()
+
+    # ---------------------
+    # Shadow mode
+    # ---------------------
+    def set_shadow(self, path):
+        """Score every predict() batch with the candidate at `path` as well (None turns it off)."""
+        self.shadow = ModelRegistry(path, f"{self.name} candidate", check_interval=self.check_interval,
+                                    loader=self._loader, validate=self._validate) if path else None
+        self.shadow_stats.reset()
+
+    def predict(self, X):
+        """Live model predictions; the shadow candidate (if any) scores the same batch."""
+        model = self.get()
+        if model is None:
+            raise RuntimeError(f"No {self.name} loaded")
+        start = time.perf_counter()
+        live = model.predict(X)
+        live_ms = (time.perf_counter() - start) * 1000
+
+        candidate = self.shadow.get() if self.shadow is not None else None
+        if candidate is not None:
+            try:
+                start = time.perf_counter()
+                shadow = candidate.predict(X)
+                self.shadow_stats.record(live, shadow, live_ms, (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                print(f"⚠️ Shadow {self.name} failed: {e}")
+                self.shadow_stats.record_error()
+        return live
+
+    def status(self):
+        info = {"name": self.name, "path": self.path, "version": self.version}
+        if self.shadow is not None:
+            info["shadow"] = {"path": self.shadow.path, "version": self.shadow.version,
+                              **self.shadow_stats.summary()}
+        return info
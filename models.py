@@ -17,7 +17,7 @@ class Task(db.Model):
     progress = db.Column(db.Integer, default=0)       # New field for progress %
     energy = db.Column(db.Integer, default=100)       # New field for energy %
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     type = db.Column(db.String(20), default='simulated')  # distinguish real/simulated 
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     locked = db.Column(db.Boolean, default=False)
@@ -31,7 +31,10 @@ class Log(db.Model):
     decision = db.Column(db.String(20))
     battery = db.Column(db.Float, default=0)
     cpu = db.Column(db.Float, default=0)
+    temp = db.Column(db.Float, nullable=True)                 # °C at decision time (online learning)
     outcome = db.Column(db.String(20))
+    source = db.Column(db.String(10), nullable=True)           # what set the decision: model / rules / deadline
+    deadline_met = db.Column(db.Boolean, nullable=True)       # set when the task completes (None: no deadline)
     
     # Additional fields
     message = db.Column(db.String(255), nullable=True)        # Text of the log
@@ -39,5 +42,90 @@ class Log(db.Model):
 
     def __repr__(self):
         return f"<Log id={self.id} task_id={self.task_id} decision={self.decision}>"
-    
-    
+
+
+class TaskSummary(db.Model):
+    """
+    Task count and energy sums per (type, status), kept current by SQLite
+    triggers on the task table (see TASK_SUMMARY_TRIGGERS), so readers get
+    totals without scanning tasks. Triggers also cover bulk inserts and raw
+    SQL, and roll back with the transaction that fired them.
+    """
+    __tablename__ = "task_summary"
+    type = db.Column(db.String(20), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    energy = db.Column(db.Float, nullable=False, default=0)       # sum of Task.energy
+    energy_sq = db.Column(db.Float, nullable=False, default=0)    # sum of Task.energy ** 2
+
+    @classmethod
+    def totals(cls, type=None, status=None, exclude_status=None):
+        """(count, energy, energy_sq) summed over the matching (type, status) rows."""
+        query = db.session.query(db.func.coalesce(db.func.sum(cls.count), 0),
+                                 db.func.coalesce(db.func.sum(cls.energy), 0.0),
+                                 db.func.coalesce(db.func.sum(cls.energy_sq), 0.0))
+        if type is not None:
+            query = query.filter(cls.type == type)
+        if status is not None:
+            query = query.filter(cls.status == status)
+        if exclude_status is not None:
+            query = query.filter(cls.status != exclude_status)
+        count, energy, energy_sq = query.one()
+        # Rounded: float energies added and removed leave ~1e-13 residue
+        return int(count), round(float(energy), 6), round(float(energy_sq), 6)
+
+
+def _summary_add(row, sign):
+    """Upsert adding (sign=+1) or removing (sign=-1) one task row (NEW / OLD) from task_summary."""
+    energy = f"COALESCE({row}.energy, 0)"
+    return (
+        f"INSERT INTO task_summary (type, status, count, energy, energy_sq) "
+        f"VALUES (COALESCE({row}.type, ''), {row}.status, {sign}, {sign} * {energy}, {sign} * {energy} * {energy}) "
+        f"ON CONFLICT (type, status) DO UPDATE SET count = count + excluded.count, "
+        f"energy = energy + excluded.energy, energy_sq = energy_sq + excluded.energy_sq;"
+    )
+
+
+TASK_SUMMARY_TRIGGERS = {
+    "task_summary_insert": f"AFTER INSERT ON task BEGIN {_summary_add('NEW', 1)} END",
+    "task_summary_delete": f"AFTER DELETE ON task BEGIN {_summary_add('OLD', -1)} END",
+    "task_summary_update": (f"AFTER UPDATE OF type, status, energy ON task BEGIN "
+                            f"{_summary_add('OLD', -1)} {_summary_add('NEW', 1)} END"),
+}
+
+
+def rebuild_task_summary(conn):
+    """Recompute task_summary from the task table (one GROUP BY)."""
+    conn.execute(db.text("DELETE FROM task_summary"))
+    conn.execute(db.text(
+        "INSERT INTO task_summary (type, status, count, energy, energy_sq) "
+        "SELECT COALESCE(type, ''), status, COUNT(*), COALESCE(SUM(energy), 0), "
+        "COALESCE(SUM(energy * energy), 0) FROM task GROUP BY COALESCE(type, ''), status"
+    ))
+
+
+def upgrade_schema():
+    """Add columns introduced after an existing database was created (create_all never alters tables)."""
+    inspector = db.inspect(db.engine)
+    if inspector.has_table("log"):   # otherwise create_all builds it with every column
+        columns = {c["name"] for c in inspector.get_columns("log")}
+        for name, kind in (("temp", "FLOAT"), ("source", "VARCHAR(10)"), ("deadline_met", "BOOLEAN")):
+            if name not in columns:
+                with db.engine.begin() as conn:
+                    conn.execute(db.text(f"ALTER TABLE log ADD COLUMN {name} {kind}"))
+                print(f"✅ Added log.{name} column")
+
+    if inspector.has_table("task"):
+        with db.engine.begin() as conn:
+            conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_task_created_at ON task (created_at)"))
+            TaskSummary.__table__.create(bind=conn, checkfirst=True)
+            existing = {row[0] for row in conn.execute(db.text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'task'"))}
+            missing = [name for name in TASK_SUMMARY_TRIGGERS if name not in existing]
+            if missing:
+                for name in TASK_SUMMARY_TRIGGERS:
+                    conn.execute(db.text(f"DROP TRIGGER IF EXISTS {name}"))
+                    conn.execute(db.text(f"CREATE TRIGGER {name} {TASK_SUMMARY_TRIGGERS[name]}"))
+                # Totals from before the triggers existed
+                rebuild_task_summary(conn)
+                print("✅ Created task_summary triggers")
@@ -0,0 +1,273 @@
+# online_learning.py
+"""
+Incremental training of the scheduler model from Log outcomes.
+
+Every decision cycle writes one Log row per task (battery, cpu, temp, the
+final decision and what set it); when the task has run, its pending rows
+record whether that happened within its deadline. Labels come from that
+outcome, not from the decision: 1 = the task missed its deadline (it needed
+to run), 0 = it was held back and still met it (deferring was safe). Rows a
+deadline outcome says nothing about are skipped: decisions made by the model
+itself (learning from those would only copy the model), tasks without a
+deadline, and tasks that ran and met it.
+
+OnlineLearner streams the rows it has not seen yet in id-ordered chunks
+(keyset pagination, so memory does not grow with the table), stopping at the
+first row whose outcome is still open (deadline not reached, task not run),
+keeps the most recent ones in a fixed-size replay buffer, and warm-starts the
+random forest with a few new trees per chunk trained on that buffer. Past
+max_trees the oldest trees are dropped, so the forest follows recent
+behaviour at a constant size.
+
+publish() writes the model and its NumPy export (write then rename) to
+ONLINE_MODEL_PATH, which is not the live model: publishing never swaps the
+served model or triggers a decision table recompile. Point
+SCHEDULER_MODEL_CANDIDATE at it to score it in shadow mode, and copy it over
+scheduler_model.pkl (with its .npz) to promote it.
+
+Usage: python online_learning.py [--chunk 5000] [--publish]
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+from decision_table import FEATURES
+from features import PRIORITY_VALUES
+from forest_model import export_forest, export_path, file_digest
+from models import db, Log, Task
+
+
+
+# =========================
+# Replay Buffer
+# =========================
+class ReplayBuffer:
+    """Fixed-capacity ring of (features, label) rows; new rows overwrite the oldest."""
+    def __init__(self, capacity, n_features):
+        self.capacity = capacity
+        self.X = np.empty((capacity, n_features))
+        self.y = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+        self._next = 0
+
+    def extend(self, X, y):
+        X, y = X[-self.capacity:], y[-self.capacity:]
+        index = (self._next + np.arange(len(X))) % self.capacity
+        self.X[index] = X
+        self.y[index] = y
+        self._next = (self._next + len(X)) % self.capacity
+        self.size = min(self.capacity, self.size + len(X))
+
+    def arrays(self):
+        return self.X[:self.size], self.y[:self.size]
+
+
+def _label(row, now):
+    """1 = deadline missed, 0 = held back and met, None = no information (or not known yet)."""
+    if row.deadline_met is None:
+        return 1 if row.deadline < now else None
+    if not row.deadline_met:
+        return 1
+    return None if row.decision == "Run" else 0
+
+
+def _rows_to_arrays(rows, now=None):
+    """Log rows → model features (FEATURES order) and outcome labels, for the labelled rows only."""
+    now = now or datetime.now()
+    labelled = [(r, y) for r in rows for y in [_label(r, now)] if y is not None]
+    X = np.array(
+        [(r.battery or 0, r.cpu or 0, r.temp or 0, PRIORITY_VALUES.get(r.priority, 1)) for r, _ in labelled],
+        dtype=float,
+    ).reshape(-1, len(FEATURES))
+    y = np.array([y for _, y in labelled], dtype=np.int64)
+    return X, y
+
+
+# =========================
+# Online Learner
+# =========================
+class OnlineLearner:
+    def __init__(self, model_path="scheduler_model.pkl", output_path=None, chunk_size=5000,
+                 buffer_size=20000, trees_per_chunk=10, max_trees=100, min_rows=200,
+                 replace_model=False, execute=None):
+        """
+        :param model_path: starting model (the offline-trained forest)
+        :param output_path: where versions are published (defaults to
+            Config.ONLINE_MODEL_PATH); a previous publication there is resumed
+            from instead of model_path
+        :param replace_model: allow output_path to be model_path, i.e. publish
+            over the model being served
+        :param execute: runs each forest fit, execute(fn, *args); e.g.
+            eventlet.tpool.execute, so the fit does not block the event loop
+        """
+        self.output_path = output_path or Config.ONLINE_MODEL_PATH
+        if not replace_model and os.path.abspath(self.output_path) == os.path.abspath(model_path):
+            raise ValueError(f"Refusing to publish over the live model {model_path} "
+                             "(pass replace_model=True to do so)")
+        self.execute = execute or (lambda fn, *args: fn(*args))
+        self.state_path = os.path.splitext(self.output_path)[0] + ".online.json"
+        self.chunk_size = chunk_size
+        self.trees_per_chunk = trees_per_chunk
+        self.max_trees = max_trees
+        self.min_rows = min_rows
+        self.buffer = ReplayBuffer(buffer_size, len(FEATURES))
+        self.dirty = False
+
+        state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+        source = self.output_path if state and os.path.exists(self.output_path) else model_path
+        with open(source, "rb") as f:
+            self.model = pickle.load(f)
+        self.cursor = state.get("last_log_id", 0)
+        self.version = state.get("version")
+        self._prime()
+
+    def _query(self):
+        """Rows whose outcome can label them: decided by rules / deadline, for tasks with a deadline."""
+        return (
+            db.session.query(Log.id, Log.battery, Log.cpu, Log.temp, Log.decision, Log.deadline_met,
+                             Task.priority, Task.deadline)
+            .join(Task, Task.id == Log.task_id)
+            .filter(Log.decision.isnot(None), Log.source.in_(("rules", "deadline")),
+                    Task.deadline.isnot(None))
+        )
+
+    def _frontier(self, now):
+        """Id of the first unseen row whose outcome is still open (None if there is none)."""
+        first = (self._query().filter(Log.id > self.cursor, Log.deadline_met.is_(None), Task.deadline >= now)
+                 .order_by(Log.id).first())
+        return first.id if first else None
+
+    def _prime(self):
+        """Refill the replay buffer with the most recent rows already learned from (after a restart)."""
+        if not self.cursor:
+            return
+        rows = (self._query().filter(Log.id <= self.cursor)
+                .order_by(Log.id.desc()).limit(self.buffer.capacity).all())
+        if rows:
+            self.buffer.extend(*_rows_to_arrays(rows[::-1]))
+
+    def update(self, X, y):
+        """Add rows to the replay buffer and grow the forest by trees_per_chunk trees trained on it."""
+        self.buffer.extend(X, y)
+        X_buffer, y_buffer = self.buffer.arrays()
+        # Warm-started trees must see the same classes as the existing ones
+        if len(y_buffer) < self.min_rows or not np.array_equal(np.unique(y_buffer), self.model.classes_):
+            return False
+
+        model = self.model
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + self.trees_per_chunk)
+        import pandas as pd   # training only; named columns keep the model's feature_names_in_
+        self.execute(model.fit, pd.DataFrame(X_buffer, columns=FEATURES), y_buffer)
+        if len(model.estimators_) > self.max_trees:
+            model.estimators_ = model.estimators_[-self.max_trees:]
+            model.set_params(n_estimators=len(model.estimators_))
+        self.dirty = True
+        return True
+
+    def step(self):
+        """Learn from every settled Log row not seen yet, chunk by chunk; returns the row count."""
+        now = datetime.now()
+        frontier = self._frontier(now)
+        total = 0
+        while True:
+            query = self._query().filter(Log.id > self.cursor)
+            if frontier is not None:
+                query = query.filter(Log.id < frontier)
+            rows = query.order_by(Log.id).limit(self.chunk_size).all()
+            if not rows:
+                break
+            X, y = _rows_to_arrays(rows, now)
+            if len(y):
+                self.update(X, y)
+            self.cursor = rows[-1].id
+            total += len(rows)
+            if len(rows) < self.chunk_size:
+                break
+        return total
+
+    def publish(self):
+        """Write the model if it changed; returns the new version (content hash) or None."""
+        if not self.dirty:
+            return None
+        tmp = self.output_path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self.model, f)
+        digest = file_digest(tmp)
+        # NumPy export first, so the registry never pairs the new .pkl with a stale .npz
+        export_tmp = export_path(self.output_path) + ".tmp.npz"
+        export_forest(self.model, export_tmp, digest)
+        os.replace(export_tmp, export_path(self.output_path))
+        os.replace(tmp, self.output_path)
+
+        self.version = digest[:12]
+        # The cursor only advances with a publication, so a restart resumes from published state
+        with open(self.state_path + ".tmp", "w") as f:
+            json.dump({"last_log_id": self.cursor, "version": self.version}, f)
+        os.replace(self.state_path + ".tmp", self.state_path)
+        self.dirty = False
+        print(f"✅ Published online scheduler model {self.version} "
+              f"({len(self.model.estimators_)} trees, through log #{self.cursor})")
+        return self.version
+
+
+def run_online_learning(app, sleep=time.sleep, execute=None):
+    """
+    Background loop: learn every ONLINE_LEARNING_INTERVAL seconds, publish
+    every ONLINE_PUBLISH_INTERVAL. execute runs the forest fits (see OnlineLearner).
+    """
+    learner = None
+    last_publish = time.monotonic()
+    while True:
+        try:
+            with app.app_context():
+                if learner is None:
+                    learner = OnlineLearner(
+                        output_path=app.config["ONLINE_MODEL_PATH"],
+                        buffer_size=app.config["ONLINE_BUFFER_SIZE"],
+                        execute=execute,
+                    )
+                rows = learner.step()
+                if rows:
+                    print(f"🔄 Online learning: {rows} new log rows")
+                if time.monotonic() - last_publish >= app.config["ONLINE_PUBLISH_INTERVAL"]:
+                    learner.publish()
+                    last_publish = time.monotonic()
+        except Exception as e:
+            print(f"⚠️ Online learning failed: {e}")
+        sleep(app.config["ONLINE_LEARNING_INTERVAL"])
+
+
+def main():
+    from flask import Flask
+
+    parser = argparse.ArgumentParser(description="Train the scheduler model on new Log rows")
+    parser.add_argument("--model", default="scheduler_model.pkl")
+    parser.add_argument("--output", default=Config.ONLINE_MODEL_PATH, help="publish path (not the live model by default)")
+    parser.add_argument("--chunk", type=int, default=5000)
+    parser.add_argument("--publish", action="store_true", help="write the updated model")
+    parser.add_argument("--replace-model", action="store_true", help="allow --output to be --model (the live model)")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    with app.app_context():
+        learner = OnlineLearner(args.model, args.output, chunk_size=args.chunk,
+                                buffer_size=Config.ONLINE_BUFFER_SIZE, replace_model=args.replace_model)
+        rows = learner.step()
+        print(f"✅ Learned from {rows} log rows ({len(learner.model.estimators_)} trees)")
+        if args.publish:
+            learner.publish()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,96 @@
 # scheduler_root.py
-import os
 import time
 import random
-import pickle
 import psutil
 from datetime import datetime
-import pandas as pd
+import numpy as np
 from models import Task, db, Log
-
-# Import classical schedulers and Process from scheduling/scheduler.py
+from decision_table import DecisionTable, FEATURES
+from model_registry import ModelRegistry
+from features import PRIORITY_VALUES, check_priority_model
+from config import Config
+import telemetry
+from battery_forecast import forecast_text
+
+# Import classical schedulers from scheduling/scheduler.py
 from scheduling.scheduler import (
     fcfs as fcfs_scheduler,
     sjf as sjf_scheduler,
     srtf as srtf_scheduler,
     priority_scheduling as priority_scheduler,
     round_robin as round_robin_scheduler,
-    Process,
 )
+from scheduling.events import simulate, expand_segments
+from scheduling.multicore import simulate_multicore, homogeneous, parse_core_layout
+from scheduling.playback import playback, playback_segments
+from scheduling.process_table import ProcessTable
+
+SCHEDULERS = {
+    "fcfs": fcfs_scheduler,
+    "sjf": sjf_scheduler,
+    "srtf": srtf_scheduler,
+    "priority_scheduling": priority_scheduler,
+    "round_robin": round_robin_scheduler,
+}
 
 # =========================
-# Optional ML model
+# Optional ML models
 # =========================
+# Loaded on first use and hot-reloaded when the .pkl changes (see model_registry.py)
 MODEL_PATH = "scheduler_model.pkl"
-scheduler_model = None
-if os.path.exists(MODEL_PATH):
-    try:
-        with open(MODEL_PATH, "rb") as f:
-            scheduler_model = pickle.load(f)
-        print("✅ Loaded ML scheduler model")
-    except Exception as e:
-        print(f"⚠️ Failed to load ML model: {e}")
-        scheduler_model = None
-else:
-    print("⚠️ No ML model found, running in rule-only mode")
-
-# ----------------------
-# Load Priority Model
-# ----------------------
-priority_model = None
-if os.path.exists("priority_model.pkl"):
+scheduler_models = ModelRegistry(MODEL_PATH, "ML scheduler model",
+                                 shadow_path=Config.SCHEDULER_MODEL_CANDIDATE,
+                                 check_interval=Config.MODEL_RELOAD_INTERVAL)
+priority_models = ModelRegistry("priority_model.pkl", "priority model",
+                                shadow_path=Config.PRIORITY_MODEL_CANDIDATE,
+                                check_interval=Config.MODEL_RELOAD_INTERVAL,
+                                validate=check_priority_model)
+
+# Dense lookup table compiled from the scheduler model (SCHEDULER_DECISION_TABLE option)
+decision_table = None
+decision_table_version = None
+decision_table_job = None   # model version a background compile was started for
+
+
+def _compile_decision_table(socketio):
+    """Background task: compile (and cache) the table for the current model file."""
     try:
-        with open("priority_model.pkl", "rb") as f:
-            priority_model = pickle.load(f)
-        print("✅ Loaded Priority Assignment Model")
+        DecisionTable.load_or_compile(MODEL_PATH, sleep=socketio.sleep)
     except Exception as e:
-        print(f"⚠️ Failed to load priority model: {e}")
+        print(f"⚠️ Failed to build decision table: {e}")
 
 
+def _decision_table(socketio):
+    """
+    Memory-mapped table for the live model version, or None (decide with the
+    model) while it is being compiled in the background.
+    """
+    global decision_table, decision_table_version, decision_table_job
+    scheduler_models.get()   # picks up hot reloads
+    version = scheduler_models.version
+    if version == decision_table_version:
+        return decision_table
+    table = DecisionTable.load_cached(MODEL_PATH, version)
+    if table is not None:
+        decision_table, decision_table_version = table, version
+        print(f"✅ Decision table loaded for {version}")
+        return table
+    if decision_table_job != version:
+        decision_table_job = version
+        socketio.start_background_task(_compile_decision_table, socketio)
+    return None
+
 def _system_snapshot():
-    """Read battery/cpu/temp with safe fallbacks."""
-    battery = psutil.sensors_battery()
-    battery_level = battery.percent if battery else 50
-    is_charging = battery.power_plugged if battery else False
-    cpu = psutil.cpu_percent(interval=0.1)
-    temp = 0
-    try:
-        temps = psutil.sensors_temperatures()
-        if temps:
-            # pick the first available sensor
-            for _, entries in temps.items():
-                if entries and getattr(entries[0], "current", None) is not None:
-                    temp = entries[0].current
-                    break
-    except Exception:
-        pass
-    return battery_level, is_charging, cpu, temp
+    """Battery/cpu/temp from the shared telemetry sampler, with safe fallbacks."""
+    snap = telemetry.snapshot()
+    battery_level = snap.battery if snap.battery is not None else 50
+    return battery_level, snap.plugged, snap.cpu, snap.temp or 0
 
 
 def _task_priority_value(task):
     """Map textual priority to numeric (lower is higher priority in scheduler)."""
-    # Your generators use lower value = higher priority. Keep consistent:
-    # We'll map High→0, Medium→1, Low→2
-    mapping = {"High": 0, "Medium": 1, "Low": 2}
-    return mapping.get(getattr(task, "priority", "Medium"), 1)
+    # Your generators use lower value = higher priority: High→0, Medium→1, Low→2
+    return PRIORITY_VALUES.get(getattr(task, "priority", "Medium"), 1)
 
 
 def _task_burst_time(task):
@@ -88,18 +106,20 @@ def _task_burst_time(task):
     return 3
 
 
-def _make_processes_from_tasks(tasks):
+def _make_processes_from_tasks(tasks, rnd=random):
     """
-    Convert DB tasks (already classified as runnable) into Process objects
-    with realistic arrival times and optional I/O events.
+    Convert DB tasks (already classified as runnable) into a ProcessTable
+    with realistic arrival times and optional I/O events. The table iterates
+    as Process-like views, so the scheduling generators accept it directly.
+    Pass a seeded random.Random as `rnd` for a reproducible workload.
     """
-    processes = []
+    processes = ProcessTable()
     for t in tasks:
         burst = _task_burst_time(t)
         prio = _task_priority_value(t)
 
         # Arrival times: spread over a small window to show dynamics
-        arrival_time = random.randint(0, min(5, max(0, burst // 2 + 1)))
+        arrival_time = rnd.randint(0, min(5, max(0, burst // 2 + 1)))
 
         # I/O request times: choose a small random subset of execution points
         # Only pick times strictly within (0, burst) so they can trigger while running
@@ -107,24 +127,147 @@ def _make_processes_from_tasks(tasks):
         io_count = 0
         if burst >= 4:
             # 30% chance to have 1 IO, 10% chance to have 2 IOs
-            r = random.random()
+            r = rnd.random()
             if r < 0.30:
                 io_count = 1
             elif r < 0.40:
                 io_count = 2
-        io_times = set(random.sample(possible, k=min(io_count, len(possible)))) if possible else set()
+        io_times = set(rnd.sample(possible, k=min(io_count, len(possible)))) if possible else set()
 
-        p = Process(
+        processes.append(
             pid=t.id,
             burst_time=burst,
             priority=prio,
             arrival_time=arrival_time,
             io_times=io_times,
         )
-        processes.append(p)
     return processes
 
 
+class LiveForecast:
+    """
+    Dashboard forecast label for one scheduling run, recomputed from the
+    current battery level at most once per telemetry sample (steps are
+    emitted faster than the battery moves).
+    """
+    def __init__(self, algorithm, interval=Config.TELEMETRY_INTERVAL):
+        self.algorithm = algorithm
+        self.interval = interval
+        self._text = None
+        self._at = None
+
+    def text(self):
+        now = time.monotonic()
+        if self._at is None or now - self._at >= self.interval:
+            battery = _system_snapshot()[0]
+            self._text = forecast_text(telemetry.forecast(battery, self.algorithm), battery)
+            self._at = now
+        return self._text
+
+
+def choose_algorithm(battery_level, is_charging, cpu):
+    """
+    Battery-aware algorithm selection.
+    Returns (display name, SCHEDULERS key, keyword arguments).
+    """
+    # =====================
+    # Charging Mode: Max Performance Allowed
+    # =====================
+    if is_charging:
+        if cpu < 40:
+            return "Shortest Remaining Time First (SRTF)", "srtf", {}
+        if cpu < 70:
+            return "Round Robin", "round_robin", {"quantum": 2}
+        return "Priority Scheduling", "priority_scheduling", {}
+
+    # =====================
+    # High Battery & Light CPU Load
+    # =====================
+    if battery_level > 50 and cpu < 50:
+        return "Shortest Remaining Time First (SRTF)", "srtf", {}
+
+    # =====================
+    # Medium Battery (20–50%)
+    # =====================
+    if 20 < battery_level <= 50:
+        if cpu > 70:
+            return "Priority Scheduling", "priority_scheduling", {}
+        return "Round Robin", "round_robin", {"quantum": 3}
+
+    # =====================
+    # Low Battery Mode (≤20%)
+    # =====================
+    return "Priority Scheduling", "priority_scheduling", {}
+
+
+# Task status for each decision
+DECISION_STATUS = {
+    "Run": "Ready",
+    "Pause": "Paused",
+    "Batch": "Batched",
+    "Defer": "Deferred",
+    "Throttle": "Throttled",
+}
+
+
+def _deadline_seconds(task):
+    """Task deadline as epoch seconds (NaN if it has none)."""
+    deadline = getattr(task, "deadline", None)
+    if deadline is None:
+        return np.nan
+    if isinstance(deadline, datetime):
+        return deadline.timestamp()
+    return float(deadline)
+
+
+def decide_tasks(tasks, battery_level, is_charging, cpu, temp, now, table=None):
+    """
+    Decide Run/Pause/Batch/Defer/Throttle for every task in one pass:
+    a single batched model call (or a decision table lookup), then the battery,
+    priority and deadline overrides applied as masks. Returns (decisions,
+    sources), arrays in task order; sources says what set each decision:
+    "model", "rules" (battery / priority overrides, or no model) or "deadline".
+    """
+    prio = np.fromiter((_task_priority_value(t) for t in tasks), dtype=np.int64, count=len(tasks))
+    decisions = np.full(len(tasks), "Run", dtype=object)
+    sources = np.full(len(tasks), "rules", dtype=object)
+
+    # 1) ML advisory (if present)
+    if table is not None:
+        pred = table.predict(battery_level, cpu, temp, prio)
+        decisions = np.where(pred == 1, "Run", "Pause").astype(object)
+        sources[:] = "model"
+    elif len(tasks) and scheduler_models.get() is not None:
+        try:
+            # Only the priority differs between rows; a plain array in FEATURES order
+            columns = {"battery": battery_level, "cpu": cpu, "temp": temp, "priority": prio}
+            features = np.column_stack(np.broadcast_arrays(*(columns[name] for name in FEATURES))).astype(float)
+            pred = np.asarray(scheduler_models.predict(features)).astype(int)
+            decisions = np.where(pred == 1, "Run", "Pause").astype(object)
+            sources[:] = "model"
+        except Exception as e:
+            print("⚠️ ML decision failed:", e)
+
+    # 2) Battery-aware overrides (apply when on battery only)
+    #    High (0) / Medium (1) / Low (2) priority
+    if not is_charging:
+        sources[:] = "rules"
+        if battery_level > 50:
+            decisions[:] = "Run"
+        elif 20 <= battery_level <= 50:
+            decisions = np.select([prio == 0, prio == 1], ["Run", "Batch"], "Defer").astype(object)
+        else:  # < 20%
+            decisions = np.select([prio == 0, prio == 1], ["Run", "Throttle"], "Pause").astype(object)
+
+    # 3) Deadline awareness: anything due within 10 seconds runs
+    deadlines = np.fromiter((_deadline_seconds(t) for t in tasks), dtype=float, count=len(tasks))
+    due = deadlines < now + 10
+    decisions[due] = "Run"
+    sources[due] = "deadline"
+
+    return decisions, sources
+
+
 def run_scheduler_with_intelligence(algorithm, app, socketio):
     """
     Hybrid ML + Rule-based + Battery-aware scheduler driver.
@@ -142,77 +285,32 @@ def run_scheduler_with_intelligence(algorithm, app, socketio):
         now = time.time()
 
         # =====================
-        # Per-task decisioning
+        # Decisioning (all tasks at once)
         # =====================
-        for task in tasks:
-            prio_val = _task_priority_value(task)  # 0 (High) / 1 (Medium) / 2 (Low)
-            decision = "Run"  # default
-
-            # 1) ML advisory (if present)
-            if scheduler_model:
-                try:
-                    # NOTE: model feature order must match training; this is illustrative
-                    features = pd.DataFrame(
-                        [[battery_level, cpu, temp, prio_val]],
-                        columns=["battery", "cpu", "temp", "priority"]
-                    )
-                    pred = scheduler_model.predict(features)[0]
-                    decision = "Run" if int(pred) == 1 else "Pause"
-                except Exception as e:
-                    print("⚠️ ML decision failed:", e)
-
-            # 2) Battery-aware overrides (apply when on battery only)
-            if not is_charging:
-                if battery_level > 50:
-                    decision = "Run"
-                elif 20 <= battery_level <= 50:
-                    if prio_val == 0:       # High
-                        decision = "Run"
-                    elif prio_val == 1:     # Medium
-                        decision = "Batch"
-                    else:                   # Low
-                        decision = "Defer"
-                else:  # < 20%
-                    if prio_val == 0:       # High
-                        decision = "Run"
-                    elif prio_val == 1:     # Medium
-                        decision = "Throttle"
-                    else:                   # Low
-                        decision = "Pause"
-
-            # 3) Deadline awareness (if your Task has 'deadline' as epoch seconds)
-            if getattr(task, "deadline", None) and task.deadline < now + 10:
-                decision = "Run"
-
-            # 4) Assign state
-            if decision == "Run":
-                task.status = "Ready"
-                runnable.append(task)
-            elif decision == "Pause":
-                task.status = "Paused"
-                paused.append(task)
-            elif decision == "Batch":
-                task.status = "Batched"
-                batched.append(task)
-            elif decision == "Defer":
-                task.status = "Deferred"
-                deferred.append(task)
-            elif decision == "Throttle":
-                task.status = "Throttled"
-                throttled.append(task)
+        table = _decision_table(socketio) if app.config.get("SCHEDULER_DECISION_TABLE") else None
+        decisions, sources = decide_tasks(tasks, battery_level, is_charging, cpu, temp, now, table)
+
+        buckets = {"Run": runnable, "Pause": paused, "Batch": batched, "Defer": deferred, "Throttle": throttled}
+        logged_at = datetime.now()
+        logs = []
+        for task, decision, source in zip(tasks, decisions, sources):
+            task.status = DECISION_STATUS[decision]
+            buckets[decision].append(task)
 
             # Feedback/logging
-            db.session.add(
+            logs.append(
                 Log(
                     task_id=task.id,
                     decision=decision,
+                    source=source,
                     battery=battery_level,
                     cpu=cpu,
-                    timestamp=datetime.now(),
+                    temp=temp,
+                    timestamp=logged_at,
                     outcome="pending",
                 )
             )
-
+        db.session.add_all(logs)
         db.session.commit()
 
         # =====================
@@ -238,90 +336,113 @@ def run_scheduler_with_intelligence(algorithm, app, socketio):
                     "throttled": [t.name for t in throttled],
                     "cpu": cpu,
                     "battery": battery_level,
-                    "forecast": f"{battery_level}%",
+                    "forecast": forecast_text(telemetry.forecast(battery_level), battery_level),
                 },
                 namespace="/",
             )
             return
 
-            # =====================
-        # Charging Mode: Max Performance Allowed
-        # =====================
-        if is_charging:
-            if cpu < 40:
-                algo_name = "Shortest Remaining Time First (SRTF)"
-                scheduler = srtf_scheduler(processes)
-            elif 40 <= cpu < 70:
-                algo_name = "Round Robin"
-                scheduler = round_robin_scheduler(processes, quantum=2)
-            else:
-                algo_name = "Priority Scheduling"
-                scheduler = priority_scheduler(processes)
-            return algo_name, scheduler
+        algo_name, algo_key, algo_kwargs = choose_algorithm(battery_level, is_charging, cpu)
+        telemetry.forecaster.set_algorithm(algo_name)
 
-        # =====================
-        # High Battery & Light CPU Load
-        # =====================
-        elif battery_level > 50 and cpu < 50:
-            algo_name = "Shortest Remaining Time First (SRTF)"
-            scheduler = srtf_scheduler(processes)
-            return algo_name, scheduler
+        # Let the frontend show the active algorithm
+        socketio.emit("update_algorithm", {"algorithm": algo_name}, namespace="/")
 
         # =====================
-        # Medium Battery (20–50%)
+        # Multi-core evaluation of the chosen algorithm
         # =====================
-        elif 20 < battery_level <= 50:
-            if cpu > 70:
-                algo_name = "Priority Scheduling"
-                scheduler = priority_scheduler(processes)
-            else:
-                algo_name = "Round Robin"
-                scheduler = round_robin_scheduler(processes, quantum=3)
-            return algo_name, scheduler
+        # Same workload on the device's core layout, so the battery-aware
+        # choice can be judged by per-core utilization and energy
+        layout = app.config.get("CPU_CORE_LAYOUT")
+        cores = parse_core_layout(layout) if layout else homogeneous(psutil.cpu_count() or 1)
+        evaluation = simulate_multicore(
+            processes, algo_key, cores,
+            queue_mode=app.config.get("CPU_QUEUE_MODE", "global"),
+            record_trace=False,
+            **algo_kwargs,
+        )
+        socketio.emit(
+            "multicore_evaluation",
+            {
+                "algorithm": algo_name,
+                "queue_mode": evaluation["queue_mode"],
+                "makespan": round(evaluation["makespan"], 2),
+                "energy": round(evaluation["energy"], 2),
+                "cores": [
+                    {
+                        "core": c["core"],
+                        "speed": c["speed"],
+                        "utilization": round(c["utilization"] * 100, 1),
+                        "energy": round(c["energy"], 2),
+                    }
+                    for c in evaluation["cores"]
+                ],
+            },
+            namespace="/",
+        )
 
         # =====================
-        # Low Battery Mode (≤20%)
+        # Execute runnable tasks
         # =====================
+        speed = app.config.get("SIMULATION_SPEED", "x1")
+        # Throttle effect: simulate slower progress when app decided to throttle medium-priority work
+        unit_seconds = 1.5 if throttled else 0.5
+        # Unchanged for the whole run, so build once instead of per step;
+        # the forecast follows the battery and is refreshed as steps go out
+        context = {
+            "paused": [t.name for t in paused],
+            "batched": [t.name for t in batched],
+            "deferred": [t.name for t in deferred],
+            "throttled": [t.name for t in throttled],
+            "cpu": cpu,
+            "battery": battery_level,
+        }
+        forecast = LiveForecast(algo_name)
+
+        if app.config.get("SCHEDULER_OUTPUT", "steps") == "segments":
+            # One scheduling_step per dispatch instead of per tick: the trace keeps
+            # ready-queue deltas, rebuilt into the full queue the clients expect
+            trace = simulate(processes, algo_key, record_queue="delta", **algo_kwargs)
+            paced = playback_segments(trace, speed=speed, sleep=socketio.sleep, unit_seconds=unit_seconds)
+            for seg, running, queue in expand_segments(paced):
+                socketio.emit(
+                    "scheduling_step",
+                    {
+                        "running": running,
+                        "queue": list(queue),
+                        "start": seg.start,
+                        "end": seg.end,
+                        **context,
+                        "forecast": forecast.text(),
+                    },
+                    namespace="/",
+                )
         else:
-            algo_name = "Priority Scheduling"
-            scheduler = priority_scheduler(processes)
-            return algo_name, scheduler
-
-        # Let the frontend show the active algorithm
-        socketio.emit("update_algorithm", {"algorithm": algo_name}, namespace="/")
-
-        # =====================
-        # Execute runnable tasks (step-by-step from generator)
-        # =====================
-        for step in scheduler:
-            socketio.emit(
-                "scheduling_step",
-                {
-                    "running": step.get("running"),
-                    "queue": step.get("queue"),
-                    "paused": [t.name for t in paused],
-                    "batched": [t.name for t in batched],
-                    "deferred": [t.name for t in deferred],
-                    "throttled": [t.name for t in throttled],
-                    "cpu": cpu,
-                    "battery": battery_level,
-                    "forecast": f"{battery_level}%",
-                },
-                namespace="/",
-            )
-
-            # Throttle effect: simulate slower progress when app decided to throttle medium-priority work
-            time.sleep(1.5 if throttled else 0.5)
+            # Step-by-step from generator
+            scheduler = SCHEDULERS[algo_key](processes, **algo_kwargs)
+            paced = playback(scheduler, speed=speed, sleep=socketio.sleep, unit_seconds=unit_seconds)
+            for step in paced:
+                socketio.emit(
+                    "scheduling_step",
+                    {
+                        "running": step.get("running"),
+                        "queue": step.get("queue"),
+                        **context,
+                        "forecast": forecast.text(),
+                    },
+                    namespace="/",
+                )
 
         # =====================
         # Mark completed in logs
         # =====================
+        # Every still-pending decision about a task that has now run gets its
+        # outcome: completed, and whether that was within the task's deadline
+        finished = time.time()
         for task in runnable:
-            log = (
-                Log.query.filter_by(task_id=task.id)
-                .order_by(Log.id.desc())
-                .first()
-            )
-            if log:
-                log.outcome = "completed"
+            deadline = _deadline_seconds(task)
+            (Log.query.filter(Log.task_id == task.id, Log.outcome == "pending")
+             .update({"outcome": "completed",
+                      "deadline_met": None if np.isnan(deadline) else bool(finished <= deadline)},
+                     synchronize_session=False))
         db.session.commit()
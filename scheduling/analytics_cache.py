@@ -0,0 +1,64 @@
+# scheduling/analytics_cache.py
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# =========================
+# LRU Result Cache
+# =========================
+class LRUCache:
+    """Size-bounded mapping that evicts the least recently used entry."""
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+# =========================
+# Workload Fingerprint
+# =========================
+def fingerprint(processes, **params):
+    """
+    Stable hash of everything a simulation result depends on: the workload's
+    scheduling fields (in input order, which breaks arrival ties) plus the run parameters.
+    """
+    rows = [
+        (p.pid, p.burst_time, p.remaining_time, p.priority, p.arrival_time, p.cpu_executed, sorted(p.io_times))
+        for p in processes
+    ]
+    return params_fingerprint(rows=rows, **params)
+
+
+def params_fingerprint(**params):
+    """Stable hash of JSON-serializable parameters (e.g. a workload fingerprint plus run options)."""
+    blob = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
@@ -0,0 +1,170 @@
+# scheduling/batch.py
+"""
+Batch runner: many workloads x an algorithm/parameter grid, fanned out over
+a process pool, aggregated into metric distributions per configuration.
+
+Usage: python -m scheduling.batch [--workloads 1000] [--processes 8] [--workers N] [--seed 0]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from scheduling.events import ALGORITHMS
+from scheduling.metrics import simulate_metrics, summarize
+from scheduling.scheduler import Process
+
+# Per-process metrics pooled over all workloads, and per-run metrics
+PROCESS_METRICS = ("wait", "turnaround", "response")
+RUN_METRICS = ("context_switches", "energy", "makespan")
+
+
+# =========================
+# Grid + Workloads
+# =========================
+def expand_grid(algorithms=ALGORITHMS, quantum=(2,), context_switch=(None,), io_wait=(None,)):
+    """
+    Cartesian product of algorithms and parameters as a list of config dicts
+    (keyword arguments for scheduling.events.simulate). The quantum only
+    varies for round_robin. None means the scheduler default.
+    """
+    configs = []
+    for algorithm in algorithms:
+        quanta = quantum if algorithm == "round_robin" else (None,)
+        for q, cs, io in itertools.product(quanta, context_switch, io_wait):
+            config = {"algorithm": algorithm, "context_switch": cs, "io_wait": io}
+            if q is not None:
+                config["quantum"] = q
+            configs.append(config)
+    return configs
+
+
+def random_workload(n, rnd):
+    """n processes shaped like create_test_processes: 2-12 unit bursts, half with one I/O."""
+    processes = []
+    for pid in range(1, n + 1):
+        burst = rnd.randint(2, 12)
+        io_times = {rnd.randint(1, burst - 1)} if burst > 2 and rnd.random() < 0.5 else set()
+        processes.append(Process(
+            pid=pid,
+            burst_time=burst,
+            priority=rnd.randint(0, 2),
+            arrival_time=rnd.randint(0, n),
+            io_times=io_times,
+        ))
+    return processes
+
+
+def workload_rng(seed, index):
+    """RNG for workload `index`; independent of chunking and worker count."""
+    return random.Random(f"{seed}-{index}")
+
+
+# =========================
+# Worker
+# =========================
+def _run_chunk(job):
+    """Simulate a chunk of workloads under every config; returns raw samples per config."""
+    start, workloads, count, n_processes, seed, grid = job
+    # Only local random.Random instances: chunks may run in the app's process,
+    # whose global random state must not be touched
+    if workloads is None:
+        workloads = [random_workload(n_processes, workload_rng(seed, start + k)) for k in range(count)]
+
+    samples = [{name: [] for name in PROCESS_METRICS + RUN_METRICS} for _ in grid]
+    for processes in workloads:
+        for config, bucket in zip(grid, samples):
+            kwargs = {k: v for k, v in config.items() if k != "algorithm"}
+            result = simulate_metrics(processes, config["algorithm"], **kwargs)
+            for m in result["processes"].values():
+                for name in PROCESS_METRICS:
+                    bucket[name].append(m[name])
+            for name in RUN_METRICS:
+                bucket[name].append(result[name])
+    return samples
+
+
+# =========================
+# Batch Runner
+# =========================
+def run_batch(workloads=None, grid=None, n_workloads=1000, n_processes=8, seed=0,
+              max_workers=None, chunksize=None):
+    """
+    Run every workload under every configuration and aggregate the results.
+
+    :param workloads: list of process lists; None generates n_workloads random
+        workloads of n_processes inside the workers, seeded from `seed`
+    :param grid: list of config dicts (see expand_grid); defaults to all algorithms
+    :param max_workers: pool size (defaults to os.cpu_count()); 1 runs in-process
+    :param chunksize: workloads per pool task (defaults to ~4 tasks per worker)
+    :return: one dict per config: the config plus mean/p50/p95 of wait,
+        turnaround and response (pooled over all processes) and of context
+        switches, energy and makespan (per workload)
+    """
+    grid = grid or expand_grid()
+    total = len(workloads) if workloads is not None else n_workloads
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, math.ceil(total / (max_workers * 4)))
+
+    jobs = []
+    for start in range(0, total, chunksize):
+        count = min(chunksize, total - start)
+        chunk = list(workloads[start:start + count]) if workloads is not None else None
+        jobs.append((start, chunk, count, n_processes, seed, grid))
+
+    if max_workers == 1:
+        chunks = map(_run_chunk, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # map() keeps chunk order, so results do not depend on scheduling of the pool
+            chunks = list(pool.map(_run_chunk, jobs))
+
+    merged = [{name: [] for name in PROCESS_METRICS + RUN_METRICS} for _ in grid]
+    for samples in chunks:
+        for bucket, part in zip(merged, samples):
+            for name, values in part.items():
+                bucket[name].extend(values)
+
+    return [summarize_samples(config, bucket, total) for config, bucket in zip(grid, merged)]
+
+
+def summarize_samples(config, samples, workloads):
+    """One result row: the config plus mean/p50/p95 of every sampled metric."""
+    row = dict(config)
+    row["workloads"] = workloads
+    for name, values in samples.items():
+        row[name] = summarize(values)
+    return row
+
+
+def evaluate_config(config, workloads=None, n_workloads=200, n_processes=8, seed=0):
+    """Run one configuration over a workload set in this process (see run_batch for the arguments)."""
+    total = len(workloads) if workloads is not None else n_workloads
+    samples = _run_chunk((0, workloads, total, n_processes, seed, [config]))[0]
+    return summarize_samples(config, samples, total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch scheduler comparison")
+    parser.add_argument("--workloads", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=8, help="processes per workload")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_batch(n_workloads=args.workloads, n_processes=args.processes,
+                        seed=args.seed, max_workers=args.workers)
+
+    print(f"{'config':<28}{'wait p50/p95':>16}{'turnaround p50/p95':>22}{'switches':>10}{'energy':>10}")
+    for row in results:
+        name = row["algorithm"] + (f" q={row['quantum']}" if "quantum" in row else "")
+        wait = f"{row['wait']['p50']:.1f}/{row['wait']['p95']:.1f}"
+        turnaround = f"{row['turnaround']['p50']:.1f}/{row['turnaround']['p95']:.1f}"
+        print(f"{name:<28}{wait:>16}{turnaround:>22}"
+              f"{row['context_switches']['mean']:>10.1f}{row['energy']['mean']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
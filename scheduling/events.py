@@ -0,0 +1,294 @@
+# scheduling/events.py
+import heapq
+import math
+from bisect import bisect_left, insort
+from collections import deque, namedtuple
+
+from scheduling import scheduler
+
+# =========================
+# Trace Format
+# =========================
+# A trace is a list of Segments. Each segment covers [start, end) on the
+# simulated clock and stands for (end - start) identical per-unit steps.
+#   kind  : "idle" | "switch" | "run" | "io"
+#   pid   : process running ("run"), being switched in ("switch") or blocked ("io")
+#   queue : ready-queue pids as the generators would list them (empty if not recorded),
+#           or a QueueDelta against the previous segment in delta mode
+Segment = namedtuple("Segment", ["start", "end", "kind", "pid", "queue"])
+
+# Ready-queue changes since the previous segment. Entries are (rank, pid) pairs;
+# ranks are unique and sorting by rank gives the generators' listing order.
+# Apply `removed` before `added` to rebuild the queue.
+QueueDelta = namedtuple("QueueDelta", ["added", "removed"])
+
+IDLE = "idle"
+SWITCH = "switch"
+RUN = "run"
+IO = "io"
+
+# Event kinds. When several events share a timestamp they are handled in this order,
+# so arrivals are always visible to the dispatch that follows a CPU event.
+ARRIVAL = 0
+IO_COMPLETE = 1
+QUANTUM_EXPIRY = 2
+COMPLETION = 3
+RESCHEDULE = 4   # CPU free again (after idling) or SRTF preemption check
+
+ALGORITHMS = ("fcfs", "sjf", "srtf", "priority_scheduling", "round_robin")
+
+
+# =========================
+# Discrete-Event Core
+# =========================
+def simulate(processes, algorithm="fcfs", quantum=2, context_switch=None, io_wait=None,
+             record_queue=True):
+    """
+    Run a workload through an event-driven version of the generators in
+    scheduling/scheduler.py and return its trace as a list of Segments.
+
+    The clock jumps from event to event (arrivals, I/O completions, quantum
+    expiry, completions) instead of ticking once per unit, so long bursts,
+    I/O waits and sparse arrivals cost nothing extra. expand_steps() turns the
+    trace back into the exact step stream the generators would have yielded.
+
+    :param processes: Process objects; they are read, not modified
+    :param algorithm: one of ALGORITHMS
+    :param quantum: Round Robin time slice
+    :param context_switch: switch overhead (defaults to scheduler.CONTEXT_SWITCH)
+    :param io_wait: I/O blocking duration (defaults to scheduler.IO_WAIT)
+    :param record_queue: True to snapshot the ready queue per segment (O(n) each),
+        "delta" to store only what joined/left it since the previous segment,
+        False to skip it. Delta and no-queue runs stay O(events log events).
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {ALGORITHMS}")
+    if algorithm == "round_robin" and quantum < 1:
+        raise ValueError("Round Robin quantum must be at least 1")
+
+    snapshots = record_queue is True
+    deltas = record_queue == "delta"
+
+    switch_cost = scheduler.CONTEXT_SWITCH if context_switch is None else context_switch
+    io_cost = scheduler.IO_WAIT if io_wait is None else io_wait
+
+    # Per-process state, indexed by position in arrival order (stable, like the generators)
+    procs = sorted(processes, key=lambda p: p.arrival_time)
+    pids = [p.pid for p in procs]
+    remaining = [p.remaining_time for p in procs]
+    executed = [p.cpu_executed for p in procs]
+    io_points = [
+        deque(sorted(t for t in p.io_times if p.cpu_executed <= t < p.cpu_executed + p.remaining_time))
+        for p in procs
+    ]
+    if algorithm == "sjf":
+        listing_key = [p.burst_time for p in procs]
+    elif algorithm == "priority_scheduling":
+        listing_key = [p.priority for p in procs]
+    else:
+        listing_key = None   # listed in the order processes were queued
+
+    if listing_key is not None:
+        ready = scheduler.HeapReadyQueue(key=lambda j: listing_key[j])
+    elif algorithm == "srtf":
+        ready = scheduler.HeapReadyQueue(key=lambda j: remaining[j])
+    else:
+        ready = deque()
+
+    events = []
+    seq = 0
+    for i, p in enumerate(procs):
+        events.append((p.arrival_time, ARRIVAL, seq, i))
+        seq += 1
+    heapq.heapify(events)
+
+    def push(time_at, kind, index):
+        nonlocal seq
+        heapq.heappush(events, (time_at, kind, seq, index))
+        seq += 1
+
+    trace = []
+
+    # Delta mode bookkeeping: rank of every queued process plus changes not yet recorded
+    ranks = {}
+    added, removed = {}, []
+    rank_seq = 0
+
+    def enqueue(j):
+        nonlocal rank_seq
+        ready.append(j)
+        if deltas:
+            rank = (listing_key[j], rank_seq) if listing_key is not None else (rank_seq,)
+            rank_seq += 1
+            ranks[j] = rank
+            added[j] = (rank, pids[j])
+
+    def dequeue(j=None):
+        if j is None:
+            j = ready.popleft() if isinstance(ready, deque) else ready.pop()
+        else:
+            ready.remove(j)
+        if deltas:
+            rank = ranks.pop(j)
+            # Joined and left within the same segment: nothing to report
+            if added.pop(j, None) is None:
+                removed.append((rank, pids[j]))
+        return j
+
+    def record(start, end, kind, pid, queue):
+        if end <= start:
+            return
+        if deltas:
+            queue = QueueDelta(tuple(added.values()), tuple(removed))
+            added.clear()
+            removed.clear()
+        else:
+            queue = tuple(queue) if snapshots else ()
+        last = trace[-1] if trace else None
+        if last and last.end == start and last.kind == kind and last.pid == pid and last.queue == queue:
+            trace[-1] = last._replace(end=end)
+        else:
+            trace.append(Segment(start, end, kind, pid, queue))
+
+    def listed(queue):
+        # Ready queue in the order the generators list it
+        if listing_key is not None:
+            return queue.ordered()
+        return queue
+
+    def runnable_pids(queue):
+        if not snapshots:
+            return ()
+        return [pids[j] for j in listed(queue) if remaining[j] > 0]
+
+    def all_pids(queue):
+        if not snapshots:
+            return ()
+        return [pids[j] for j in listed(queue)]
+
+    def io_distance(i):
+        return io_points[i][0] - executed[i] if io_points[i] else math.inf
+
+    def run(i, start, units):
+        record(start, start + units, RUN, pids[i], runnable_pids(ready))
+        remaining[i] -= units
+        executed[i] += units
+        return start + units
+
+    def block_on_io(i, start):
+        io_points[i].popleft()
+        record(start, start + io_cost, IO, pids[i], all_pids(ready))
+        push(start + io_cost, IO_COMPLETE, i)
+
+    pending = []     # arrived, admitted at the next dispatch point
+    current = None   # SRTF only: process holding the CPU between decisions
+
+    push(0, RESCHEDULE, None)
+
+    while events:
+        now, kind, _, i = heapq.heappop(events)
+
+        if kind == ARRIVAL:
+            pending.append(i)
+            continue
+        if kind in (IO_COMPLETE, QUANTUM_EXPIRY):
+            enqueue(i)
+
+        # ---------- Dispatch point ----------
+        for j in pending:
+            enqueue(j)
+        pending.clear()
+
+        if algorithm == "srtf":
+            # Shortest remaining time; a queued process wins a tie against the current one
+            nxt = ready.peek()
+            if current is not None and remaining[current] > 0:
+                if nxt is None or remaining[current] < remaining[nxt]:
+                    nxt = current
+        else:
+            nxt = dequeue() if ready else None
+
+        if nxt is None:
+            if events:
+                # Jump straight to the unit boundary at which the next arrival is admitted
+                wake = now + max(1, math.ceil(events[0][0] - now))
+                record(now, wake, IDLE, None, ())
+                push(wake, RESCHEDULE, None)
+            continue
+
+        if algorithm == "srtf":
+            if nxt != current:
+                if current is not None and remaining[current] > 0:
+                    enqueue(current)
+                record(now, now + switch_cost, SWITCH, pids[nxt], runnable_pids(ready))
+                now += switch_cost
+                current = nxt
+                dequeue(nxt)
+
+            dist = io_distance(current)
+            if dist == 0:
+                # The I/O request itself burns one unit without a step
+                block_on_io(current, now + 1)
+                current = None
+                continue
+
+            # Run until completion, the next I/O point or the next admitted arrival
+            # (only arrivals are queued while the CPU is between decisions)
+            units = min(remaining[current], dist)
+            if events:
+                units = min(units, max(1, math.ceil(events[0][0] - now)))
+            now = run(current, now, units)
+            push(now, COMPLETION if remaining[current] == 0 else RESCHEDULE, current)
+            continue
+
+        # Non-preemptive algorithms and Round Robin
+        i = nxt
+        record(now, now + switch_cost, SWITCH, pids[i], runnable_pids(ready))
+        now += switch_cost
+
+        dist = io_distance(i)
+        units = min(remaining[i], dist)
+        if algorithm == "round_robin":
+            units = min(units, quantum)
+        now = run(i, now, units)
+
+        if remaining[i] == 0:
+            push(now, COMPLETION, i)
+        elif units == dist and (algorithm != "round_robin" or units < quantum):
+            block_on_io(i, now)
+        else:
+            push(now, QUANTUM_EXPIRY, i)
+
+    return trace
+
+
+# =========================
+# Step Expansion
+# =========================
+def expand_segments(trace):
+    """
+    Yield (segment, running pid or None, full ready queue) for a Segment trace
+    (snapshot or delta mode), rebuilding the queue from the deltas.
+    """
+    queued = []   # (rank, pid), kept sorted, for delta traces
+    for seg in trace:
+        running = seg.pid if seg.kind == RUN else None
+        if isinstance(seg.queue, QueueDelta):
+            for entry in seg.queue.removed:
+                del queued[bisect_left(queued, entry)]
+            for entry in seg.queue.added:
+                insort(queued, entry)
+            queue = [pid for _, pid in queued] if seg.kind != IDLE else []
+        else:
+            queue = seg.queue
+        yield seg, running, queue
+
+
+def expand_steps(trace):
+    """
+    Expand a Segment trace (snapshot or delta mode) into per-unit step dicts,
+    matching what the generators yield to scheduling_step consumers.
+    """
+    for seg, running, queue in expand_segments(trace):
+        for _ in range(seg.end - seg.start):
+            yield {"running": running, "queue": list(queue)}
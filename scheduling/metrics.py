@@ -0,0 +1,103 @@
+# scheduling/metrics.py
+import math
+
+from scheduling.events import IDLE, IO, RUN, SWITCH, simulate
+
+# =========================
+# Energy Model
+# =========================
+# Modeled energy per time unit spent in each kind of trace segment
+POWER = {RUN: 1.0, SWITCH: 0.6, IO: 0.3, IDLE: 0.1}
+
+
+# =========================
+# Trace Metrics
+# =========================
+def trace_metrics(processes, trace, power=None):
+    """
+    Scheduling metrics of one run, derived from its Segment trace.
+
+    Per process: response (first run - arrival), completion (end of last run),
+    turnaround (completion - arrival) and wait (turnaround minus CPU and I/O time).
+    Context switches count switch segments, so they are 0 when the switch cost is 0.
+
+    :param processes: the workload the trace was simulated from (not modified)
+    :param trace: list of Segments from scheduling.events.simulate
+    :param power: energy per time unit by segment kind (defaults to POWER)
+    """
+    power = power or POWER
+    first_run, completion, io_time = {}, {}, {}
+    busy = switches = 0
+    energy = 0.0
+
+    for seg in trace:
+        units = seg.end - seg.start
+        energy += units * power.get(seg.kind, 0.0)
+        if seg.kind == RUN:
+            busy += units
+            first_run.setdefault(seg.pid, seg.start)
+            completion[seg.pid] = seg.end
+        elif seg.kind == SWITCH:
+            switches += 1
+        elif seg.kind == IO:
+            io_time[seg.pid] = io_time.get(seg.pid, 0) + units
+
+    per_process = {}
+    for p in processes:
+        if p.pid not in completion:
+            continue   # nothing left to run
+        turnaround = completion[p.pid] - p.arrival_time
+        per_process[p.pid] = {
+            "arrival": p.arrival_time,
+            "response": first_run[p.pid] - p.arrival_time,
+            "completion": completion[p.pid],
+            "turnaround": turnaround,
+            "wait": turnaround - p.remaining_time - io_time.get(p.pid, 0),
+        }
+
+    makespan = trace[-1].end if trace else 0
+    count = len(per_process)
+
+    def average(field):
+        return sum(m[field] for m in per_process.values()) / count if count else 0.0
+
+    return {
+        "processes": per_process,
+        "makespan": makespan,
+        "throughput": count / makespan if makespan else 0.0,
+        "cpu_utilization": busy / makespan * 100 if makespan else 0.0,
+        "context_switches": switches,
+        "energy": energy,
+        "avg_response": average("response"),
+        "avg_wait": average("wait"),
+        "avg_turnaround": average("turnaround"),
+    }
+
+
+def simulate_metrics(processes, algorithm="fcfs", power=None, **kwargs):
+    """Simulate a workload (no ready-queue recording) and return its trace_metrics()."""
+    trace = simulate(processes, algorithm, record_queue=False, **kwargs)
+    return trace_metrics(processes, trace, power)
+
+
+# =========================
+# Aggregation
+# =========================
+def percentile(sorted_values, q):
+    """q-th percentile (0-100) of an already sorted list, linearly interpolated."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    low = math.floor(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+def summarize(values):
+    """mean / p50 / p95 of a list of numbers."""
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+    }
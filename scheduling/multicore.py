@@ -0,0 +1,314 @@
+# scheduling/multicore.py
+import heapq
+from collections import deque, namedtuple
+
+from scheduling import scheduler
+
+# =========================
+# Core Layouts
+# =========================
+# speed      : work units completed per time unit (1.0 = reference core)
+# power      : energy per time unit while busy (switching or running)
+# idle_power : energy per time unit while idle
+Core = namedtuple("Core", ["speed", "power", "idle_power"], defaults=(1.0, 1.0, 0.1))
+
+
+def homogeneous(count, speed=1.0, power=1.0, idle_power=0.1):
+    """`count` identical cores."""
+    return [Core(speed, power, idle_power) for _ in range(count)]
+
+
+def big_little(big, little, little_speed=0.5, little_power=0.3):
+    """Heterogeneous layout: `big` reference cores plus `little` slower, cheaper cores."""
+    return homogeneous(big) + homogeneous(little, little_speed, little_power, 0.1 * little_power)
+
+
+def parse_core_layout(spec):
+    """
+    Parse a layout string such as "4" (4 reference cores) or
+    "4:1.0:1.0,4:0.5:0.3" (count:speed:power groups, e.g. big.LITTLE).
+    """
+    cores = []
+    for group in str(spec).split(","):
+        parts = group.strip().split(":")
+        count = int(parts[0])
+        speed = float(parts[1]) if len(parts) > 1 else 1.0
+        power = float(parts[2]) if len(parts) > 2 else 1.0
+        cores.extend(homogeneous(count, speed, power, 0.1 * power))
+    if not cores:
+        raise ValueError(f"Empty core layout '{spec}'")
+    return cores
+
+
+# =========================
+# Multi-Core Simulation
+# =========================
+# Per-core trace record; idle time is the gap between a core's segments
+CoreSegment = namedtuple("CoreSegment", ["core", "start", "end", "kind", "pid"])
+
+QUEUE_MODES = ("global", "per_core")
+
+EPS = 1e-9
+
+# Event kinds, handled in this order when they share a timestamp
+CORE_DONE = 0
+IO_COMPLETE = 1
+ARRIVAL = 2
+
+
+def simulate_multicore(processes, algorithm="fcfs", cores=None, queue_mode="global", steal=True,
+                       quantum=2, context_switch=None, io_wait=None, core_preference="fast",
+                       record_trace=True):
+    """
+    Event-driven simulation of a workload on several (possibly heterogeneous) cores.
+
+    Differences from the single-CPU engine: I/O blocks only the requesting
+    process (its core picks up other work), and run times scale with core
+    speed, so the clock is fractional. Preemption follows the textbook rules
+    rather than the generators': a Round Robin process whose quantum expires
+    queues behind processes that arrived meanwhile, and SRTF preempts only for
+    strictly less remaining work. Without I/O, one reference core reproduces
+    the event core's schedule for FCFS, SJF and priority scheduling.
+
+    :param processes: Process objects or a ProcessTable; they are read, not modified
+    :param algorithm: one of scheduling.events.ALGORITHMS
+    :param cores: list of Core (defaults to a single reference core)
+    :param queue_mode: "global" (one shared ready queue) or "per_core" (one queue per core,
+        processes keep their core across I/O and quantum expiry)
+    :param steal: in per_core mode, let an idle core take work from the longest other queue
+    :param quantum: Round Robin time slice, in time units
+    :param context_switch: switch overhead (defaults to scheduler.CONTEXT_SWITCH)
+    :param io_wait: I/O blocking duration (defaults to scheduler.IO_WAIT)
+    :param core_preference: "fast" hands work to the fastest idle core first,
+        "efficient" to the one with the lowest energy per unit of work
+    :return: dict with makespan, total energy, per-core and per-process results
+        and (if record_trace) a list of CoreSegments
+    """
+    from scheduling.events import ALGORITHMS
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {ALGORITHMS}")
+    if queue_mode not in QUEUE_MODES:
+        raise ValueError(f"Unknown queue mode '{queue_mode}', expected one of {QUEUE_MODES}")
+    if algorithm == "round_robin" and quantum <= 0:
+        raise ValueError("Round Robin quantum must be positive")
+
+    cores = list(cores) if cores else [Core()]
+    switch_cost = scheduler.CONTEXT_SWITCH if context_switch is None else context_switch
+    io_cost = scheduler.IO_WAIT if io_wait is None else io_wait
+
+    if core_preference == "fast":
+        preferred = sorted(range(len(cores)), key=lambda c: -cores[c].speed)
+    elif core_preference == "efficient":
+        preferred = sorted(range(len(cores)), key=lambda c: cores[c].power / cores[c].speed)
+    else:
+        raise ValueError("core_preference must be 'fast' or 'efficient'")
+
+    # ---------- Per-process state (arrival order) ----------
+    procs = sorted(processes, key=lambda p: p.arrival_time)
+    n = len(procs)
+    pids = [p.pid for p in procs]
+    arrival = [p.arrival_time for p in procs]
+    remaining = [float(p.remaining_time) for p in procs]
+    executed = [float(p.cpu_executed) for p in procs]
+    io_points = [
+        deque(sorted(t for t in p.io_times if p.cpu_executed <= t < p.cpu_executed + p.remaining_time))
+        for p in procs
+    ]
+    burst = [p.burst_time for p in procs]
+    priority = [p.priority for p in procs]
+    enqueued_at = [0.0] * n
+    wait = [0.0] * n
+    first_run = [None] * n
+    completion = [None] * n
+    home = [None] * n   # per_core mode: queue the process belongs to
+
+    def new_queue():
+        if algorithm == "sjf":
+            return scheduler.HeapReadyQueue(key=lambda j: burst[j])
+        if algorithm == "priority_scheduling":
+            return scheduler.HeapReadyQueue(key=lambda j: priority[j])
+        if algorithm == "srtf":
+            return scheduler.HeapReadyQueue(key=lambda j: remaining[j])
+        return deque()
+
+    def take(queue, from_tail=False):
+        if isinstance(queue, deque):
+            return queue.pop() if from_tail else queue.popleft()
+        return queue.pop()
+
+    queues = [new_queue()] if queue_mode == "global" else [new_queue() for _ in cores]
+
+    # ---------- Per-core state ----------
+    running = [None] * len(cores)       # process index on the core
+    dispatched_at = [0.0] * len(cores)  # start of the current switch
+    run_start = [0.0] * len(cores)      # start of actual execution
+    planned = [0.0] * len(cores)        # work units planned for this dispatch
+    token = [0] * len(cores)            # invalidates CORE_DONE events after preemption
+    busy = [0.0] * len(cores)
+    dispatches = [0] * len(cores)
+    steals = [0] * len(cores)
+    trace = []
+
+    events = []
+    seq = 0
+
+    def push(time_at, kind, payload):
+        nonlocal seq
+        heapq.heappush(events, (time_at, kind, seq, payload))
+        seq += 1
+
+    for i in range(n):
+        push(arrival[i], ARRIVAL, i)
+
+    def queue_of_core(c):
+        return queues[0] if queue_mode == "global" else queues[c]
+
+    def cores_of_queue(q):
+        return range(len(cores)) if queue_mode == "global" else (q,)
+
+    def enqueue(i, now):
+        if queue_mode == "global":
+            q = 0
+        else:
+            if home[i] is None:
+                # Least loaded queue relative to core speed; ties go to the preferred core
+                home[i] = min(preferred, key=lambda c: (len(queues[c]) + (running[c] is not None)) / cores[c].speed)
+            q = home[i]
+        enqueued_at[i] = now
+        queues[q].append(i)
+        if algorithm == "srtf":
+            maybe_preempt(q, i, now)
+
+    def maybe_preempt(q, i, now):
+        candidates = [c for c in cores_of_queue(q)]
+        if any(running[c] is None for c in candidates):
+            return   # an idle core will pick it up
+        victim, victim_left = None, remaining[i]
+        for c in candidates:
+            if now < run_start[c]:
+                continue   # still switching
+            left = remaining[running[c]] - (now - run_start[c]) * cores[c].speed
+            if left > victim_left + EPS:
+                victim, victim_left = c, left
+        if victim is not None:
+            j = stop(victim, now)
+            enqueued_at[j] = now
+            queues[q].append(j)
+
+    def stop(c, now):
+        """Take the running process off core c at `now`, crediting the work done."""
+        i = running[c]
+        if now > run_start[c]:
+            work = min(planned[c], (now - run_start[c]) * cores[c].speed)
+            remaining[i] -= work
+            executed[i] += work
+            if record_trace:
+                trace.append(CoreSegment(c, run_start[c], now, "run", pids[i]))
+        busy[c] += now - dispatched_at[c]
+        running[c] = None
+        token[c] += 1
+        return i
+
+    def dispatch(c, now):
+        queue = queue_of_core(c)
+        if not queue and queue_mode == "per_core" and steal:
+            victim = max(range(len(cores)), key=lambda v: len(queues[v]))
+            if queues[victim]:
+                i = take(queues[victim], from_tail=True)
+                home[i] = c
+                steals[c] += 1
+            else:
+                return
+        elif queue:
+            i = take(queue)
+        else:
+            return
+
+        wait[i] += now - enqueued_at[i]
+        running[c] = i
+        dispatched_at[c] = now
+        run_start[c] = now + switch_cost
+        dispatches[c] += 1
+        if record_trace and switch_cost:
+            trace.append(CoreSegment(c, now, run_start[c], "switch", pids[i]))
+        if first_run[i] is None:
+            first_run[i] = run_start[c]
+
+        work = remaining[i]
+        if io_points[i]:
+            work = min(work, io_points[i][0] - executed[i])
+        if algorithm == "round_robin":
+            work = min(work, quantum * cores[c].speed)
+        planned[c] = work
+        push(run_start[c] + work / cores[c].speed, CORE_DONE, (c, token[c]))
+
+    def finish(c, now):
+        i = running[c]
+        stop(c, now)
+        if remaining[i] <= EPS:
+            remaining[i] = 0.0
+            completion[i] = now
+        elif io_points[i] and io_points[i][0] - executed[i] <= EPS:
+            io_points[i].popleft()
+            push(now + io_cost, IO_COMPLETE, i)
+        else:
+            enqueue(i, now)   # quantum expired
+
+    # ---------- Event loop ----------
+    now = 0.0
+    while events:
+        now = events[0][0]
+        # Handle everything that happens at this instant, then fill idle cores
+        while events and events[0][0] <= now + EPS:
+            _, kind, _, payload = heapq.heappop(events)
+            if kind == CORE_DONE:
+                c, tok = payload
+                if tok == token[c]:
+                    finish(c, now)
+            else:
+                enqueue(payload, now)
+        for c in preferred:
+            if running[c] is None:
+                dispatch(c, now)
+
+    makespan = max([t for t in completion if t is not None], default=0.0)
+
+    core_results = []
+    for c, core in enumerate(cores):
+        idle = max(0.0, makespan - busy[c])
+        core_results.append({
+            "core": c,
+            "speed": core.speed,
+            "power": core.power,
+            "busy": busy[c],
+            "utilization": busy[c] / makespan if makespan else 0.0,
+            "energy": busy[c] * core.power + idle * core.idle_power,
+            "dispatches": dispatches[c],
+            "steals": steals[c],
+        })
+
+    process_results = [
+        {
+            "pid": pids[i],
+            "arrival": arrival[i],
+            "first_run": first_run[i],
+            "completion": completion[i],
+            "turnaround": completion[i] - arrival[i],
+            "wait": wait[i],
+            "response": first_run[i] - arrival[i],
+            "core": home[i],
+        }
+        for i in range(n)
+    ]
+
+    return {
+        "algorithm": algorithm,
+        "queue_mode": queue_mode,
+        "steal": steal if queue_mode == "per_core" else None,
+        "makespan": makespan,
+        "energy": sum(r["energy"] for r in core_results),
+        "cores": core_results,
+        "processes": process_results,
+        "segments": sorted(trace, key=lambda s: (s.start, s.core)) if record_trace else [],
+    }
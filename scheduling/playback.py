@@ -0,0 +1,54 @@
+# scheduling/playback.py
+import time
+
+# =========================
+# Playback Pacing
+# =========================
+# The generators in scheduling/scheduler.py run on a virtual clock and return
+# steps as fast as the CPU allows. Anything that shows the simulation live
+# (Socket.IO dashboard) wraps them with playback() to pace the step stream.
+
+TIME_UNIT = 0.5  # wall-clock seconds per simulated time unit at x1
+
+PLAYBACK_SPEEDS = {
+    "x1": 1,
+    "x10": 10,
+    "max": None,  # no pacing at all
+}
+
+
+def playback(steps, speed="x1", sleep=time.sleep, unit_seconds=TIME_UNIT):
+    """
+    Re-emit a step stream paced in wall-clock time.
+
+    :param steps: iterable of scheduler steps (one per simulated time unit)
+    :param speed: one of PLAYBACK_SPEEDS ("x1", "x10", "max")
+    :param sleep: sleep function, e.g. socketio.sleep inside eventlet workers
+    :param unit_seconds: wall-clock duration of one time unit at x1
+    """
+    delay = _unit_delay(speed, unit_seconds)
+
+    for step in steps:
+        yield step
+        if delay:
+            sleep(delay)
+
+
+def playback_segments(segments, speed="x1", sleep=time.sleep, unit_seconds=TIME_UNIT):
+    """
+    Pace a Segment trace from scheduling/events.py: each segment is held for
+    its simulated duration, so one record per dispatch replaces one per tick.
+    """
+    delay = _unit_delay(speed, unit_seconds)
+
+    for seg in segments:
+        yield seg
+        if delay:
+            sleep(delay * (seg.end - seg.start))
+
+
+def _unit_delay(speed, unit_seconds):
+    if speed not in PLAYBACK_SPEEDS:
+        raise ValueError(f"Unknown playback speed '{speed}', expected one of {list(PLAYBACK_SPEEDS)}")
+    factor = PLAYBACK_SPEEDS[speed]
+    return unit_seconds / factor if factor else 0
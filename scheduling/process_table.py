@@ -0,0 +1,149 @@
+# scheduling/process_table.py
+from array import array
+
+# =========================
+# Columnar Process Table
+# =========================
+# A Process object costs a __dict__ plus its own io_times set, which adds up
+# to ~400 bytes per process. ProcessTable stores the same fields in typed
+# array.array columns (~65 bytes per process) and hands out ProcessView
+# objects that look like scheduling.scheduler.Process to the generators,
+# the event core and scheduler_root.
+#
+# I/O request points are kept in CSR form: the points of row i are
+# io_values[io_offsets[i]:io_offsets[i + 1]], sorted. A served point is
+# overwritten with SERVED instead of being removed.
+
+SERVED = -1
+
+
+class ProcessTable:
+    def __init__(self):
+        self.pid = array("q")
+        self.burst_time = array("q")
+        self.remaining_time = array("q")
+        self.priority = array("q")
+        self.arrival_time = array("q")
+        self.cpu_executed = array("q")
+        self.waiting_for_io = bytearray()
+        self.io_offsets = array("q", [0])
+        self.io_values = array("q")
+
+    @classmethod
+    def from_processes(cls, processes):
+        """Build a table from Process-like objects (their current state is copied)."""
+        table = cls()
+        for p in processes:
+            row = table.append(p.pid, p.burst_time, p.priority, p.arrival_time, p.io_times)
+            table.remaining_time[row._row] = p.remaining_time
+            table.cpu_executed[row._row] = p.cpu_executed
+        return table
+
+    def append(self, pid, burst_time, priority=1, arrival_time=0, io_times=None):
+        """Add a process (same arguments as Process) and return its view."""
+        self.pid.append(pid)
+        self.burst_time.append(burst_time)
+        self.remaining_time.append(burst_time)
+        self.priority.append(priority)
+        self.arrival_time.append(arrival_time)
+        self.cpu_executed.append(0)
+        self.waiting_for_io.append(0)
+        # Negative points can never trigger (cpu_executed starts at 0)
+        self.io_values.extend(sorted(t for t in set(io_times or ()) if t >= 0))
+        self.io_offsets.append(len(self.io_values))
+        return ProcessView(self, len(self.pid) - 1)
+
+    def nbytes(self):
+        """Memory held by the columns."""
+        columns = (self.pid, self.burst_time, self.remaining_time, self.priority,
+                   self.arrival_time, self.cpu_executed, self.io_offsets, self.io_values)
+        return sum(c.itemsize * len(c) for c in columns) + len(self.waiting_for_io)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError("process table index out of range")
+        return ProcessView(self, row % len(self))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield ProcessView(self, row)
+
+
+def _column(name, convert=None):
+    def fget(self):
+        value = getattr(self._table, name)[self._row]
+        return convert(value) if convert else value
+
+    def fset(self, value):
+        getattr(self._table, name)[self._row] = value
+
+    return property(fget, fset)
+
+
+class ProcessView:
+    """
+    Lightweight handle on one ProcessTable row with the Process interface.
+    Two views of the same row compare and hash equal, so views can be
+    recreated freely and still work as ready-queue entries.
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    pid = _column("pid")
+    burst_time = _column("burst_time")
+    remaining_time = _column("remaining_time")
+    priority = _column("priority")
+    arrival_time = _column("arrival_time")
+    cpu_executed = _column("cpu_executed")
+    waiting_for_io = _column("waiting_for_io", bool)
+
+    @property
+    def io_times(self):
+        return IoTimesView(self._table, self._row)
+
+    def __eq__(self, other):
+        return (isinstance(other, ProcessView)
+                and self._table is other._table and self._row == other._row)
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __repr__(self):
+        return (f"<ProcessView pid={self.pid} burst={self.burst_time} "
+                f"remaining={self.remaining_time} priority={self.priority}>")
+
+
+class IoTimesView:
+    """Set-like view of a row's pending I/O request points."""
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def _span(self):
+        offsets = self._table.io_offsets
+        return range(offsets[self._row], offsets[self._row + 1])
+
+    def __iter__(self):
+        values = self._table.io_values
+        return (values[i] for i in self._span() if values[i] != SERVED)
+
+    def __contains__(self, point):
+        values = self._table.io_values
+        return point != SERVED and any(values[i] == point for i in self._span())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def discard(self, point):
+        values = self._table.io_values
+        for i in self._span():
+            if values[i] == point:
+                values[i] = SERVED
@@ -1,9 +1,10 @@
 from flask import Blueprint
 from threading import Thread
-import psutil
 import random
 import time
 from models import Task, db
+import telemetry
+import battery_forecast
 
 scheduling_bp = Blueprint("scheduling_bp", __name__)
 
@@ -43,29 +44,24 @@ def register_socketio(state):
 
                 while not all_done():
                     # Read system stats
-                    battery = psutil.sensors_battery()
-                    battery_level = battery.percent if battery else random.randint(40, 100)
-                    plugged_in = battery.power_plugged if battery else False
+                    snap = telemetry.snapshot()
+                    has_battery = snap.battery is not None
+                    battery_level = snap.battery if has_battery else random.randint(40, 100)
+                    plugged_in = snap.plugged
                     on_battery = not plugged_in
-                    cpu_usage = int(psutil.cpu_percent())
+                    cpu_usage = int(snap.cpu)
 
-                    # -------- Battery Forecast Calculation --------
-                    if battery:
-                        if battery.power_plugged:
-                            forecast_text = "∞ (Charging)"
+                    # -------- Battery Forecast (telemetry.forecaster) --------
+                    if has_battery:
+                        forecast = telemetry.forecast(snap.battery)
+                        forecast_text = battery_forecast.forecast_text(forecast)
+                        if forecast["status"] in ("charging", "idle"):
                             forecast_percent = 100
+                        elif forecast["minutes"] is None:
+                            forecast_percent = 0
                         else:
-                            if battery.secsleft == psutil.POWER_TIME_UNLIMITED:
-                                forecast_text = "∞ (Idle)"
-                                forecast_percent = 100
-                            elif battery.secsleft == psutil.POWER_TIME_UNKNOWN:
-                                forecast_text = "Unknown"
-                                forecast_percent = 0
-                            else:
-                                est_minutes = battery.secsleft // 60
-                                forecast_text = f"{est_minutes} min"
-                                # map 0–120 minutes into 0–100% ring
-                                forecast_percent = min(100, int((est_minutes / 120) * 100))
+                            # map 0–120 minutes into 0–100% ring
+                            forecast_percent = min(100, int((forecast["minutes"] / 120) * 100))
                     else:
                         forecast_text = "N/A"
                         forecast_percent = 0
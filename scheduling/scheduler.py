@@ -1,5 +1,5 @@
 # scheduling/scheduler.py
-import time
+import heapq
 from collections import deque
 
 # =========================
@@ -24,16 +24,122 @@ class Process:
         self.waiting_for_io = False
 
 
+# =========================
+# Virtual Clock
+# =========================
+class VirtualClock:
+    """
+    Logical simulation clock. The generators advance it instead of sleeping,
+    so a workload runs at full CPU speed. Wall-clock pacing for the live
+    dashboard lives in scheduling/playback.py.
+    """
+    def __init__(self, now=0):
+        self.now = now
+
+    def tick(self, units=1):
+        self.now += units
+        return self.now
+
+
+# =========================
+# Ready Queues
+# =========================
+class HeapReadyQueue:
+    """
+    Ready queue ordered by key(process). Ties go to the process queued first,
+    which is the order list.sort() and min() used to give, so dispatch order
+    is unchanged. pop/append are O(log n); remove() is lazy (the heap entry is
+    tombstoned and skipped when it reaches the top).
+    Iterating yields processes in the order they were queued.
+    """
+    def __init__(self, key):
+        self._key = key
+        self._heap = []
+        self._entries = {}   # process -> [key, seq, process], in queue order
+        self._seq = 0
+
+    def append(self, p):
+        entry = [self._key(p), self._seq, p]
+        self._seq += 1
+        self._entries[p] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, p):
+        entry = self._entries.pop(p)
+        entry[2] = None
+
+    def peek(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self):
+        p = self.peek()
+        if p is None:
+            raise IndexError("pop from empty ready queue")
+        heapq.heappop(self._heap)
+        del self._entries[p]
+        return p
+
+    def ordered(self):
+        """Processes in dispatch order (what a sorted list would show)."""
+        return [entry[2] for entry in sorted(self._entries.values())]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __contains__(self, p):
+        return p in self._entries
+
+
+class ArrivalCursor:
+    """
+    Pointer over the arrival-sorted process list. Admitting arrivals costs
+    O(admitted) instead of rescanning every waiting process each time unit.
+    """
+    def __init__(self, processes):
+        self._waiting = sorted(processes, key=lambda p: p.arrival_time)
+        self._next = 0
+
+    def admit(self, now):
+        """Return processes with arrival_time <= now that were not admitted yet."""
+        start = self._next
+        while self._next < len(self._waiting) and self._waiting[self._next].arrival_time <= now:
+            self._next += 1
+        return self._waiting[start:self._next]
+
+    def next_arrival(self):
+        return self._waiting[self._next].arrival_time if self else None
+
+    def __bool__(self):
+        return self._next < len(self._waiting)
+
+
 # =========================
 # Simulation Helpers
 # =========================
 CONTEXT_SWITCH = 1   # overhead in time units
 IO_WAIT = 2          # I/O blocking duration
 
-def run_for_one_unit(current, ready_queue, time_elapsed):
-    """Run a process for 1 unit, considering I/O blocking"""
+def runnable_pids(ready_queue):
+    """PIDs of queued processes that can take the CPU"""
+    return [p.pid for p in ready_queue if p.remaining_time > 0 and not p.waiting_for_io]
+
+
+def run_for_one_unit(current, ready_queue, time_elapsed, queue=None):
+    """
+    Run a process for 1 unit, considering I/O blocking.
+    `queue` is an optional precomputed runnable_pids(ready_queue), for callers
+    whose ready queue cannot change during the dispatch.
+    """
     # If process requests I/O
     if current.cpu_executed in current.io_times:
+        # Each I/O request is served once, otherwise the process would block
+        # again on the same execution point every time it is dispatched
+        current.io_times.discard(current.cpu_executed)
         current.waiting_for_io = True
         return None
 
@@ -42,60 +148,53 @@ def run_for_one_unit(current, ready_queue, time_elapsed):
 
     return {
         "running": current.pid,
-        "queue": [p.pid for p in ready_queue if p.remaining_time > 0 and not p.waiting_for_io]
+        "queue": list(queue) if queue is not None else runnable_pids(ready_queue)
     }
 
 
-def context_switch_step(ready_queue):
+def context_switch_step(ready_queue, queue=None):
     """Simulate context switching overhead"""
     return {
         "running": None,
-        "queue": [p.pid for p in ready_queue if p.remaining_time > 0 and not p.waiting_for_io]
+        "queue": list(queue) if queue is not None else runnable_pids(ready_queue)
     }
 
 
 # =========================
 # First Come First Serve
 # =========================
-def fcfs(processes):
-    time_elapsed = 0
-    ready_queue = []
-    waiting = sorted(processes, key=lambda p: p.arrival_time)
+def fcfs(processes, clock=None):
+    clock = clock if clock is not None else VirtualClock()
+    ready_queue = deque()
+    waiting = ArrivalCursor(processes)
 
     while waiting or ready_queue:
         # Admit new arrivals
-        for p in waiting[:]:
-            if p.arrival_time <= time_elapsed:
-                ready_queue.append(p)
-                waiting.remove(p)
+        ready_queue.extend(waiting.admit(clock.now))
 
         if not ready_queue:  # idle CPU
             yield {"running": None, "queue": []}
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
             continue
 
-        current = ready_queue.pop(0)
+        current = ready_queue.popleft()
 
         # Context switch
         for _ in range(CONTEXT_SWITCH):
             yield context_switch_step(ready_queue)
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
 
         while current.remaining_time > 0:
-            step = run_for_one_unit(current, ready_queue, time_elapsed)
+            step = run_for_one_unit(current, ready_queue, clock.now)
             if step:
                 yield step
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
 
             if current.waiting_for_io:
                 # simulate I/O wait
                 for _ in range(IO_WAIT):
                     yield {"running": None, "queue": [p.pid for p in ready_queue]}
-                    time.sleep(0.5)
-                    time_elapsed += 1
+                    clock.tick()
                 current.waiting_for_io = False
                 ready_queue.append(current)
                 break
@@ -104,46 +203,44 @@ def fcfs(processes):
 # =========================
 # Shortest Job First (Non-preemptive)
 # =========================
-def sjf(processes):
-    time_elapsed = 0
-    ready_queue = []
-    waiting = sorted(processes, key=lambda p: p.arrival_time)
+def sjf(processes, clock=None):
+    clock = clock if clock is not None else VirtualClock()
+    ready_queue = HeapReadyQueue(key=lambda p: p.burst_time)
+    waiting = ArrivalCursor(processes)
 
     while waiting or ready_queue:
         # Admit arrivals
-        for p in waiting[:]:
-            if p.arrival_time <= time_elapsed:
-                ready_queue.append(p)
-                waiting.remove(p)
+        for p in waiting.admit(clock.now):
+            ready_queue.append(p)
 
         if not ready_queue:
             yield {"running": None, "queue": []}
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
             continue
 
         # Pick shortest job
-        ready_queue.sort(key=lambda p: p.burst_time)
-        current = ready_queue.pop(0)
+        current = ready_queue.pop()
+
+        # Nothing else is queued until the next dispatch, so list the queue once
+        queued = ready_queue.ordered()
+        runnable = runnable_pids(queued)
 
         # Context switch
         for _ in range(CONTEXT_SWITCH):
-            yield context_switch_step(ready_queue)
-            time.sleep(0.5)
-            time_elapsed += 1
+            yield context_switch_step(queued, runnable)
+            clock.tick()
 
         while current.remaining_time > 0:
-            step = run_for_one_unit(current, ready_queue, time_elapsed)
+            step = run_for_one_unit(current, queued, clock.now, runnable)
             if step:
                 yield step
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
 
             if current.waiting_for_io:
+                queued_pids = [p.pid for p in queued]
                 for _ in range(IO_WAIT):
-                    yield {"running": None, "queue": [p.pid for p in ready_queue]}
-                    time.sleep(0.5)
-                    time_elapsed += 1
+                    yield {"running": None, "queue": list(queued_pids)}
+                    clock.tick()
                 current.waiting_for_io = False
                 ready_queue.append(current)
                 break
@@ -152,54 +249,52 @@ def sjf(processes):
 # =========================
 # Shortest Remaining Time First (Preemptive SJF)
 # =========================
-def srtf(processes):
-    time_elapsed = 0
-    ready_queue = []
-    waiting = sorted(processes, key=lambda p: p.arrival_time)
+def srtf(processes, clock=None):
+    clock = clock if clock is not None else VirtualClock()
+    # Keyed on remaining time, which only changes while a process is off the queue
+    ready_queue = HeapReadyQueue(key=lambda p: p.remaining_time)
+    waiting = ArrivalCursor(processes)
 
     current = None
 
     while waiting or ready_queue or (current and current.remaining_time > 0):
         # Admit arrivals
-        for p in waiting[:]:
-            if p.arrival_time <= time_elapsed:
-                ready_queue.append(p)
-                waiting.remove(p)
+        for p in waiting.admit(clock.now):
+            ready_queue.append(p)
 
-        available = [p for p in ready_queue if p.remaining_time > 0 and not p.waiting_for_io]
+        # Pick process with shortest remaining time (queued process wins a tie)
+        next_proc = ready_queue.peek()
         if current and current.remaining_time > 0 and not current.waiting_for_io:
-            available.append(current)
+            if next_proc is None or current.remaining_time < next_proc.remaining_time:
+                next_proc = current
 
-        if not available:
+        if next_proc is None:
             yield {"running": None, "queue": []}
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
             continue
 
-        # Pick process with shortest remaining time
-        next_proc = min(available, key=lambda p: p.remaining_time)
-
         if current != next_proc:
+            # Preempted process goes back to the ready queue instead of being dropped
+            if current and current.remaining_time > 0:
+                ready_queue.append(current)
+
             # context switch if CPU changes process
             for _ in range(CONTEXT_SWITCH):
                 yield context_switch_step(ready_queue)
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
             current = next_proc
             if current in ready_queue:
                 ready_queue.remove(current)
 
-        step = run_for_one_unit(current, ready_queue, time_elapsed)
+        step = run_for_one_unit(current, ready_queue, clock.now)
         if step:
             yield step
-        time.sleep(0.5)
-        time_elapsed += 1
+        clock.tick()
 
         if current.waiting_for_io:
             for _ in range(IO_WAIT):
                 yield {"running": None, "queue": [p.pid for p in ready_queue]}
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
             current.waiting_for_io = False
             ready_queue.append(current)
             current = None
@@ -208,46 +303,44 @@ def srtf(processes):
 # =========================
 # Priority Scheduling (Non-preemptive)
 # =========================
-def priority_scheduling(processes):
-    time_elapsed = 0
-    ready_queue = []
-    waiting = sorted(processes, key=lambda p: p.arrival_time)
+def priority_scheduling(processes, clock=None):
+    clock = clock if clock is not None else VirtualClock()
+    ready_queue = HeapReadyQueue(key=lambda p: p.priority)
+    waiting = ArrivalCursor(processes)
 
     while waiting or ready_queue:
         # Admit arrivals
-        for p in waiting[:]:
-            if p.arrival_time <= time_elapsed:
-                ready_queue.append(p)
-                waiting.remove(p)
+        for p in waiting.admit(clock.now):
+            ready_queue.append(p)
 
         if not ready_queue:
             yield {"running": None, "queue": []}
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
             continue
 
         # Pick highest priority (lower value = higher priority)
-        ready_queue.sort(key=lambda p: p.priority)
-        current = ready_queue.pop(0)
+        current = ready_queue.pop()
+
+        # Nothing else is queued until the next dispatch, so list the queue once
+        queued = ready_queue.ordered()
+        runnable = runnable_pids(queued)
 
         # Context switch
         for _ in range(CONTEXT_SWITCH):
-            yield context_switch_step(ready_queue)
-            time.sleep(0.5)
-            time_elapsed += 1
+            yield context_switch_step(queued, runnable)
+            clock.tick()
 
         while current.remaining_time > 0:
-            step = run_for_one_unit(current, ready_queue, time_elapsed)
+            step = run_for_one_unit(current, queued, clock.now, runnable)
             if step:
                 yield step
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
 
             if current.waiting_for_io:
+                queued_pids = [p.pid for p in queued]
                 for _ in range(IO_WAIT):
-                    yield {"running": None, "queue": [p.pid for p in ready_queue]}
-                    time.sleep(0.5)
-                    time_elapsed += 1
+                    yield {"running": None, "queue": list(queued_pids)}
+                    clock.tick()
                 current.waiting_for_io = False
                 ready_queue.append(current)
                 break
@@ -256,22 +349,18 @@ def priority_scheduling(processes):
 # =========================
 # Round Robin
 # =========================
-def round_robin(processes, quantum=2):
-    time_elapsed = 0
+def round_robin(processes, quantum=2, clock=None):
+    clock = clock if clock is not None else VirtualClock()
     ready_queue = deque()
-    waiting = sorted(processes, key=lambda p: p.arrival_time)
+    waiting = ArrivalCursor(processes)
 
     while waiting or ready_queue:
         # Admit arrivals
-        for p in waiting[:]:
-            if p.arrival_time <= time_elapsed:
-                ready_queue.append(p)
-                waiting.remove(p)
+        ready_queue.extend(waiting.admit(clock.now))
 
         if not ready_queue:
             yield {"running": None, "queue": []}
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
             continue
 
         current = ready_queue.popleft()
@@ -279,26 +368,23 @@ def round_robin(processes, quantum=2):
         # Context switch
         for _ in range(CONTEXT_SWITCH):
             yield context_switch_step(ready_queue)
-            time.sleep(0.5)
-            time_elapsed += 1
+            clock.tick()
 
         executed = 0
         while executed < quantum and current.remaining_time > 0:
-            step = run_for_one_unit(current, ready_queue, time_elapsed)
+            step = run_for_one_unit(current, ready_queue, clock.now)
             if step:
                 yield step
-                time.sleep(0.5)
-                time_elapsed += 1
+                clock.tick()
                 executed += 1
 
             if current.waiting_for_io:
                 for _ in range(IO_WAIT):
                     yield {"running": None, "queue": [p.pid for p in ready_queue]}
-                    time.sleep(0.5)
-                    time_elapsed += 1
+                    clock.tick()
                 current.waiting_for_io = False
-                ready_queue.append(current)
                 break
 
+        # Requeue after quantum expiry or I/O (exactly once)
         if current.remaining_time > 0 and not current.waiting_for_io:
             ready_queue.append(current)
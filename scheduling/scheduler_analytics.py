@@ -1,14 +1,85 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, make_response, request
 import random
+import uuid
 from datetime import datetime, timedelta
-import time
-from scheduling.scheduler import (
-    Process, fcfs, sjf, srtf, priority_scheduling, round_robin
-)
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from config import Config
+from models import Task
+from scheduling.analytics_cache import LRUCache, fingerprint, params_fingerprint
+from scheduling.scheduler import Process
+from scheduling.events import RUN
+from scheduling.metrics import POWER, simulate_metrics
+from scheduling.playback import TIME_UNIT
+from scheduling.sweep import MAX_POINTS, run_sweep, sweep_grid
+from scheduler_root import _make_processes_from_tasks, _system_snapshot, choose_algorithm
 
 scheduler_analytics_bp = Blueprint('scheduler_analytics', __name__)
 
-def create_test_processes():
+# Default workloads are built with a fixed seed so identical rows give identical results
+WORKLOAD_SEED = 42
+
+# Finished reports keyed by workload fingerprint + parameters (also used as the ETag)
+analytics_cache = LRUCache(maxsize=Config.ANALYTICS_CACHE_SIZE)
+
+# Default workload and its fingerprint, rebuilt only after simulated tasks change,
+# so a cache hit needs no Task query and no workload hashing
+default_workload_cache = None   # (processes, fingerprint)
+
+def invalidate_analytics():
+    global default_workload_cache
+    default_workload_cache = None
+    analytics_cache.clear()
+
+# Task columns the default workload is built from (see _make_processes_from_tasks);
+# progress only counts while it is what the burst time comes from (no energy)
+WORKLOAD_FIELDS = ("type", "priority", "energy")
+
+def _workload_changed(target):
+    """Whether a flushed UPDATE of a simulated (or formerly simulated) task changed its process."""
+    attrs = inspect(target).attrs
+    if target.type != 'simulated' and not attrs.type.history.has_changes():
+        return False
+    if any(attrs[name].history.has_changes() for name in WORKLOAD_FIELDS):
+        return True
+    return attrs.progress.history.has_changes() and not (target.energy or 0) > 0
+
+def _invalidate_on_flush(mapper, connection, target):
+    if target.type == 'simulated':
+        invalidate_analytics()
+
+def _invalidate_on_update(mapper, connection, target):
+    # Status / remaining-time updates from the driver leave the workload as it is
+    if _workload_changed(target):
+        invalidate_analytics()
+
+def _invalidate_on_bulk(orm_execute_state):
+    # ORM bulk statements (e.g. the /tasks/import insert) skip the mapper events
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Task:
+        return
+    if orm_execute_state.is_insert or orm_execute_state.is_delete:
+        invalidate_analytics()
+    elif orm_execute_state.is_update:
+        # Bound parameter names of the statement, plus those of a bulk UPDATE by primary key
+        params = orm_execute_state.parameters
+        names = set(orm_execute_state.statement.compile().params)
+        names.update(params[0] if isinstance(params, list) and params else params or {})
+        if names & {*WORKLOAD_FIELDS, "progress"}:
+            invalidate_analytics()
+
+event.listen(Task, "after_insert", _invalidate_on_flush)
+event.listen(Task, "after_update", _invalidate_on_update)
+event.listen(Task, "after_delete", _invalidate_on_flush)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk)
+
+# Parameter sweeps by id: status, progress and the response surface so far.
+# Running sweeps stay in running_sweeps until they finish, then move to the
+# sweep_results LRU, so eviction never drops a sweep that is still writing.
+running_sweeps = {}
+sweep_results = LRUCache(maxsize=16)
+
+def create_test_processes(rnd=random):
     """Create realistic test processes for comparison"""
     processes = []
     
@@ -26,7 +97,7 @@ def create_test_processes():
     ]
     
     for i, (burst, priority, arrival, has_io) in enumerate(process_configs):
-        io_times = {random.randint(1, burst-1)} if has_io and burst > 2 else set()
+        io_times = {rnd.randint(1, burst-1)} if has_io and burst > 2 else set()
         processes.append(Process(
             pid=i+1,
             burst_time=burst,
@@ -37,366 +108,394 @@ def create_test_processes():
     
     return processes
 
-def calculate_algorithm_metrics(algorithm_name, processes):
-    """Calculate realistic metrics for each algorithm type with consistent performance profiles"""
-    num_processes = len(processes)
-    
-    # Realistic performance profiles based on algorithm characteristics
-    base_profiles = {
-        "FCFS": {
-            "throughput": (7.2, 7.8),      # Lower throughput due to convoy effect
-            "response_time": (115, 125),   # Higher response time
-            "wait_time": (55, 65),         # Higher wait time
-            "turnaround": (170, 190),      # Higher turnaround
-            "cpu_utilization": (82, 88),   # Higher CPU due to inefficiency
-            "energy_used": (8.2, 8.8),     # Higher energy
-            "context_switches": (850, 950) # Moderate context switches
-        },
-        "SJF": {
-            "throughput": (8.5, 9.1),      # Good throughput
-            "response_time": (90, 100),    # Better response time
-            "wait_time": (38, 46),         # Lower wait time
-            "turnaround": (130, 144),      # Better turnaround
-            "cpu_utilization": (80, 86),   # Better CPU utilization
-            "energy_used": (7.0, 7.6),     # Better energy
-            "context_switches": (900, 1000) # Moderate context switches
-        },
-        "SRTF": {
-            "throughput": (8.8, 9.4),      # Very good throughput
-            "response_time": (80, 90),     # Excellent response time
-            "wait_time": (30, 40),         # Low wait time
-            "turnaround": (115, 125),      # Excellent turnaround
-            "cpu_utilization": (78, 84),   # Good CPU utilization
-            "energy_used": (6.5, 7.1),     # Good energy efficiency
-            "context_switches": (1100, 1200) # High context switches
-        },
-        "Priority": {
-            "throughput": (7.8, 8.4),      # Moderate throughput
-            "response_time": (95, 105),    # Good for high-priority tasks
-            "wait_time": (44, 52),         # Moderate wait time
-            "turnaround": (140, 155),      # Moderate turnaround
-            "cpu_utilization": (79, 85),   # Moderate CPU
-            "energy_used": (7.5, 8.1),     # Moderate energy
-            "context_switches": (880, 980) # Moderate context switches
-        },
-        "Round Robin": {
-            "throughput": (8.2, 8.8),      # Good throughput
-            "response_time": (85, 95),     # Good response time
-            "wait_time": (48, 56),         # Higher wait time due to quantum
-            "turnaround": (135, 148),      # Good turnaround
-            "cpu_utilization": (76, 82),   # Lower CPU but more overhead
-            "energy_used": (6.2, 6.8),     # Good energy efficiency
-            "context_switches": (1250, 1350) # Very high context switches
-        }
-    }
-    
-    profile = base_profiles.get(algorithm_name, base_profiles["FCFS"])
-    
-    # Generate realistic values within expected ranges
+# Display name -> engine key for the algorithms on the analytics page
+ALGORITHM_KEYS = {
+    "FCFS": "fcfs",
+    "SJF": "sjf",
+    "SRTF": "srtf",
+    "Priority": "priority_scheduling",
+    "Round Robin": "round_robin",
+}
+ENGINE_NAMES = {key: name for name, key in ALGORITHM_KEYS.items()}
+
+# One simulated time unit in milliseconds (x1 dashboard playback)
+UNIT_MS = TIME_UNIT * 1000
+
+def processes_from_payload(items):
+    """Build a caller-supplied workload from a list of JSON process dicts."""
+    processes = []
+    for i, item in enumerate(items):
+        burst = int(item["burst_time"])
+        if burst < 1:
+            raise ValueError(f"Process {i}: burst_time must be at least 1")
+        processes.append(Process(
+            pid=item.get("pid", i + 1),
+            burst_time=burst,
+            priority=int(item.get("priority", 1)),
+            arrival_time=int(item.get("arrival_time", 0)),
+            io_times={int(t) for t in item.get("io_times", ())},
+        ))
+    return processes
+
+def calculate_algorithm_metrics(algorithm_name, processes, **params):
+    """
+    Run the workload through the scheduling engine on the virtual clock and
+    report metrics derived from the resulting trace.
+    """
+    result = simulate_metrics(processes, ALGORITHM_KEYS[algorithm_name], **params)
     return {
-        "throughput": round(random.uniform(*profile["throughput"]), 2),
-        "responseTime": round(random.uniform(*profile["response_time"]), 2),
-        "waitTime": round(random.uniform(*profile["wait_time"]), 2),
-        "turnaroundTime": round(random.uniform(*profile["turnaround"]), 2),
-        "cpuUtilization": round(random.uniform(*profile["cpu_utilization"]), 2),
-        "energyUsed": round(random.uniform(*profile["energy_used"]), 2),
-        "contextSwitches": random.randint(*profile["context_switches"]),
-        "tasksCompleted": num_processes,
-        "algorithmUsed": algorithm_name
+        "throughput": round(result["throughput"] * 1000 / UNIT_MS, 3),     # tasks/sec
+        "responseTime": round(result["avg_response"] * UNIT_MS, 2),
+        "waitTime": round(result["avg_wait"] * UNIT_MS, 2),
+        "turnaroundTime": round(result["avg_turnaround"] * UNIT_MS, 2),
+        "cpuUtilization": round(result["cpu_utilization"], 2),
+        "energyUsed": round(result["energy"], 2),
+        "contextSwitches": result["context_switches"],
+        "tasksCompleted": len(result["processes"]),
+        "algorithmUsed": algorithm_name,
+        "makespan": result["makespan"],
+        "processes": result["processes"],
     }
 
-def calculate_hybrid_metrics(processes):
-    """Calculate realistic metrics for intelligent hybrid scheduler - BETTER in all metrics"""
-    num_processes = len(processes)
-    
-    # Simulate realistic system conditions
-    battery_level = random.randint(25, 95)
-    is_charging = random.choice([True, False])
-    cpu_load = random.randint(45, 85)
-    system_load = random.choice(["low", "medium", "high"])
-    
-    # Hybrid scheduler adapts based on real conditions
-    if is_charging or battery_level > 70:
-        # When power is abundant, use more aggressive scheduling
-        if system_load == "low":
-            algo_used = "SRTF"
-            performance_profile = "high_performance"
-        else:
-            algo_used = "Round Robin"
-            performance_profile = "balanced"
-    elif battery_level < 30:
-        # Battery saving mode
-        algo_used = "Priority"
-        performance_profile = "power_saving"
-    else:
-        # Balanced mode
-        if cpu_load < 60:
-            algo_used = "SJF"
-            performance_profile = "efficient"
-        else:
-            algo_used = "Round Robin"
-            performance_profile = "stable"
-    
-    # REALISTIC hybrid performance - BETTER in ALL metrics including CPU and context switches
-    performance_ranges = {
-        "high_performance": {
-            "throughput": (8.9, 9.5),      # Good throughput improvement
-            "response_time": (75, 85),     # Better response time
-            "wait_time": (28, 36),         # Better wait time
-            "turnaround": (105, 115),      # Better turnaround
-            "cpu_utilization": (75, 81),   # LOWER CPU utilization
-            "energy_used": (6.0, 6.6),     # Better energy
-            "context_switches": (800, 900) # LOWER context switches
-        },
-        "balanced": {
-            "throughput": (8.7, 9.3),      # Good throughput
-            "response_time": (78, 88),     # Better response time
-            "wait_time": (30, 38),         # Better wait time
-            "turnaround": (108, 118),      # Better turnaround
-            "cpu_utilization": (74, 80),   # LOWER CPU utilization
-            "energy_used": (5.8, 6.4),     # Better energy
-            "context_switches": (780, 880) # LOWER context switches
-        },
-        "power_saving": {
-            "throughput": (8.4, 9.0),      # Good throughput
-            "response_time": (82, 92),     # Better response time
-            "wait_time": (32, 40),         # Better wait time
-            "turnaround": (112, 122),      # Better turnaround
-            "cpu_utilization": (72, 78),   # LOWER CPU utilization
-            "energy_used": (5.5, 6.1),     # Best energy efficiency
-            "context_switches": (750, 850) # LOWER context switches
-        },
-        "efficient": {
-            "throughput": (8.8, 9.4),      # Good throughput
-            "response_time": (76, 86),     # Better response time
-            "wait_time": (29, 37),         # Better wait time
-            "turnaround": (106, 116),      # Better turnaround
-            "cpu_utilization": (73, 79),   # LOWER CPU utilization
-            "energy_used": (5.7, 6.3),     # Good energy
-            "context_switches": (770, 870) # LOWER context switches
-        },
-        "stable": {
-            "throughput": (8.6, 9.2),      # Good throughput
-            "response_time": (80, 90),     # Better response time
-            "wait_time": (31, 39),         # Better wait time
-            "turnaround": (110, 120),      # Better turnaround
-            "cpu_utilization": (75, 81),   # LOWER CPU utilization
-            "energy_used": (5.6, 6.2),     # Good energy
-            "context_switches": (790, 890) # LOWER context switches
-        }
-    }
-    
-    profile = performance_ranges.get(performance_profile, performance_ranges["balanced"])
-    
-    return {
-        "throughput": round(random.uniform(*profile["throughput"]), 2),
-        "responseTime": round(random.uniform(*profile["response_time"]), 2),
-        "waitTime": round(random.uniform(*profile["wait_time"]), 2),
-        "turnaroundTime": round(random.uniform(*profile["turnaround"]), 2),
-        "cpuUtilization": round(random.uniform(*profile["cpu_utilization"]), 2),
-        "energyUsed": round(random.uniform(*profile["energy_used"]), 2),
-        "contextSwitches": random.randint(*profile["context_switches"]),
-        "tasksCompleted": num_processes,
-        "algorithmUsed": f"Hybrid ({algo_used})",
+def system_load(cpu_load):
+    return "low" if cpu_load < 40 else "medium" if cpu_load < 70 else "high"
+
+def performance_profile(battery_level, is_charging):
+    if is_charging:
+        return "charging"
+    if battery_level > 50:
+        return "high_battery"
+    if battery_level > 20:
+        return "medium_battery"
+    return "power_saving"
+
+def calculate_hybrid_metrics(processes, snapshot=None):
+    """
+    Metrics for the intelligent hybrid scheduler: the algorithm the live
+    driver would pick for the current battery/CPU state, run on the same workload.
+    """
+    battery_level, is_charging, cpu_load, _ = snapshot or _system_snapshot()
+    _, algo_key, algo_kwargs = choose_algorithm(battery_level, is_charging, cpu_load)
+
+    metrics = calculate_algorithm_metrics(ENGINE_NAMES[algo_key], processes, **algo_kwargs)
+    metrics.update({
+        "algorithmUsed": f"Hybrid ({ENGINE_NAMES[algo_key]})",
         "batteryAware": True,
-        "mlEnhanced": True,
+        "mlEnhanced": False,
         "batteryLevel": battery_level,
         "cpuLoad": cpu_load,
-        "systemLoad": system_load,
-        "performanceProfile": performance_profile
-    }
+        "systemLoad": system_load(cpu_load),
+        "performanceProfile": performance_profile(battery_level, is_charging),
+    })
+    return metrics
 
-@scheduler_analytics_bp.route('/scheduler-analytics-data')
-def scheduler_analytics_data():
-    try:
-        print("🔄 Generating REALISTIC scheduler analytics data...")
-        
-        # Create test processes
-        test_processes = create_test_processes()
-        
-        # Calculate baseline metrics (using FCFS as reference)
-        baseline_metrics = calculate_algorithm_metrics("FCFS", test_processes)
-        
-        # Calculate optimized metrics (your hybrid scheduler)
-        optimized_metrics = calculate_hybrid_metrics(test_processes)
-        
-        # Compute improvement percentages with proper logic
-        def calc_improvement(baseline, optimized, higher_is_better=True):
-            if baseline == 0:
-                return 0
-            if higher_is_better:
-                improvement = ((optimized - baseline) / baseline) * 100
-            else:
-                improvement = ((baseline - optimized) / baseline) * 100
-            return round(improvement, 1)
-        
-        # Calculate realistic improvements - ALL should be positive now
-        throughput_improvement = calc_improvement(baseline_metrics["throughput"], optimized_metrics["throughput"], higher_is_better=True)
-        response_improvement = calc_improvement(baseline_metrics["responseTime"], optimized_metrics["responseTime"], higher_is_better=False)
-        wait_improvement = calc_improvement(baseline_metrics["waitTime"], optimized_metrics["waitTime"], higher_is_better=False)
-        turnaround_improvement = calc_improvement(baseline_metrics["turnaroundTime"], optimized_metrics["turnaroundTime"], higher_is_better=False)
-        cpu_improvement = calc_improvement(baseline_metrics["cpuUtilization"], optimized_metrics["cpuUtilization"], higher_is_better=False)  # LOWER is better
-        context_improvement = calc_improvement(baseline_metrics["contextSwitches"], optimized_metrics["contextSwitches"], higher_is_better=False)  # LOWER is better
-        energy_improvement = calc_improvement(baseline_metrics["energyUsed"], optimized_metrics["energyUsed"], higher_is_better=False)
-        
-        # Overall improvement - realistic 10-15% range
-        # Equal weighting for all metrics since ALL are improved
-        overall_improvement = round((
-            throughput_improvement + 
-            response_improvement + 
-            wait_improvement +
-            turnaround_improvement +
-            cpu_improvement +
-            context_improvement +
-            energy_improvement
-        ) / 7, 1)
-        
-        # Ensure overall improvement is in realistic 10-15% range
-        overall_improvement = max(10, min(15, overall_improvement))
-        
-        # Generate realistic task execution data
-        def generate_task_data(metrics, prefix, is_optimized=False):
-            tasks = []
-            base_response = metrics["responseTime"] / 1000  # Convert to seconds
-            
-            for i in range(8):
-                # Realistic task execution patterns
-                if is_optimized:
-                    # Optimized scheduler has more consistent performance
-                    exec_variation = random.uniform(0.85, 1.10)
-                    wait_variation = random.uniform(0.80, 1.05)
-                    status_options = ["completed", "completed", "completed", "optimized", "efficient"]
-                else:
-                    # Baseline has more variability
-                    exec_variation = random.uniform(0.70, 1.25)
-                    wait_variation = random.uniform(0.75, 1.30)
-                    status_options = ["completed", "completed", "delayed", "waiting"]
-                
-                tasks.append({
-                    "id": i + 1,
-                    "name": f"{prefix} Task {i + 1}",
-                    "execution_time": round(base_response * exec_variation, 3),
-                    "wait_time": round(metrics["waitTime"] * wait_variation, 2),
-                    "turnaround_time": round(metrics["turnaroundTime"] * random.uniform(0.9, 1.15), 2),
-                    "energy_used": round(metrics["energyUsed"] / 8 * random.uniform(0.8, 1.2), 3),
-                    "completion_time": (datetime.now() - timedelta(minutes=random.randint(2, 45))).strftime("%H:%M:%S"),
-                    "status": random.choice(status_options)
-                })
-            return tasks
-        
-        ordinary_tasks = generate_task_data(baseline_metrics, "FCFS", is_optimized=False)
-        optimized_tasks = generate_task_data(optimized_metrics, "Hybrid", is_optimized=True)
-        
-        # Detailed metrics for table - ALL should show "Improved" now
-        detailed_metrics = [
-            {
-                "metric": "Throughput (tasks/sec)",
-                "baseline": baseline_metrics["throughput"],
-                "optimized": optimized_metrics["throughput"],
-                "improvement": throughput_improvement,
-                "status": "Improved",
-                "icon": "📈"
-            },
-            {
-                "metric": "Response Time (ms)",
-                "baseline": baseline_metrics["responseTime"],
-                "optimized": optimized_metrics["responseTime"],
-                "improvement": response_improvement,
-                "status": "Improved", 
-                "icon": "⚡"
-            },
-            {
-                "metric": "Wait Time (ms)",
-                "baseline": baseline_metrics["waitTime"],
-                "optimized": optimized_metrics["waitTime"],
-                "improvement": wait_improvement,
-                "status": "Improved",
-                "icon": "⏱️"
-            },
-            {
-                "metric": "CPU Utilization (%)",
-                "baseline": baseline_metrics["cpuUtilization"],
-                "optimized": optimized_metrics["cpuUtilization"],
-                "improvement": cpu_improvement,
-                "status": "Improved",  # Now shows improved since CPU is lower
-                "icon": "🔧"
-            },
-            {
-                "metric": "Context Switches",
-                "baseline": baseline_metrics["contextSwitches"],
-                "optimized": optimized_metrics["contextSwitches"],
-                "improvement": context_improvement,
-                "status": "Improved",  # Now shows improved since context switches are lower
-                "icon": "🔄"
-            },
-            {
-                "metric": "Turnaround Time (ms)",
-                "baseline": baseline_metrics["turnaroundTime"],
-                "optimized": optimized_metrics["turnaroundTime"],
-                "improvement": turnaround_improvement,
-                "status": "Improved",
-                "icon": "🎯"
+def calc_improvement(baseline, optimized, higher_is_better=True):
+    if baseline == 0:
+        return 0
+    if higher_is_better:
+        improvement = ((optimized - baseline) / baseline) * 100
+    else:
+        improvement = ((baseline - optimized) / baseline) * 100
+    return round(improvement, 1)
+
+def improvement_status(improvement):
+    return "Improved" if improvement > 0 else "Worsened" if improvement < 0 else "No Change"
+
+def generate_task_data(metrics, processes, prefix):
+    """Per-task rows from the simulated run (times in ms, completion on the wall clock)."""
+    started = datetime.now() - timedelta(milliseconds=metrics["makespan"] * UNIT_MS)
+    tasks = []
+    for p in processes:
+        m = metrics["processes"].get(p.pid)
+        if m is None:
+            continue
+        tasks.append({
+            "id": p.pid,
+            "name": f"{prefix} Task {p.pid}",
+            "execution_time": round(p.burst_time * UNIT_MS, 3),
+            "wait_time": round(m["wait"] * UNIT_MS, 2),
+            "turnaround_time": round(m["turnaround"] * UNIT_MS, 2),
+            "energy_used": round(p.burst_time * POWER[RUN], 3),
+            "completion_time": (started + timedelta(milliseconds=m["completion"] * UNIT_MS)).strftime("%H:%M:%S"),
+            "status": "completed"
+        })
+    return tasks
+
+def public_metrics(metrics):
+    """Metrics without the per-process breakdown (that goes in the task lists)."""
+    return {k: v for k, v in metrics.items() if k != "processes"}
+
+def default_workload():
+    """Simulated Task rows if there are any, else the built-in test mix (both reproducible)."""
+    rnd = random.Random(WORKLOAD_SEED)
+    tasks = Task.query.filter_by(type='simulated').order_by(Task.id).all()
+    if tasks:
+        return _make_processes_from_tasks(tasks, rnd)
+    return create_test_processes(rnd)
+
+def cached_default_workload():
+    """(processes, fingerprint) of default_workload(), memoized until simulated tasks change."""
+    global default_workload_cache
+    cached = default_workload_cache
+    if cached is None:
+        processes = default_workload()
+        cached = default_workload_cache = (processes, fingerprint(processes))
+    return cached
+
+def with_live_telemetry(report, snapshot):
+    """
+    Copy of a cached report carrying the current battery / CPU readings
+    instead of those it was built with (they are not part of the ETag).
+    """
+    battery_level, _, cpu_load, _ = snapshot
+    live = {"batteryLevel": battery_level, "cpuLoad": cpu_load, "systemLoad": system_load(cpu_load)}
+    summary = dict(report["summary"])
+    summary["optimized"] = {**summary["optimized"], **live}
+    summary["systemInfo"] = {**summary["systemInfo"], **live}
+    return {**report, "summary": summary}
+
+def build_analytics_report(test_processes, snapshot):
+    """Baseline (FCFS) vs hybrid comparison plus the per-algorithm table."""
+    # Calculate baseline metrics (using FCFS as reference)
+    baseline_metrics = calculate_algorithm_metrics("FCFS", test_processes)
+
+    # Calculate optimized metrics (your hybrid scheduler)
+    optimized_metrics = calculate_hybrid_metrics(test_processes, snapshot)
+
+    # (label, key, higher_is_better, icon)
+    compared = [
+        ("Throughput (tasks/sec)", "throughput", True, "📈"),
+        ("Response Time (ms)", "responseTime", False, "⚡"),
+        ("Wait Time (ms)", "waitTime", False, "⏱️"),
+        ("CPU Utilization (%)", "cpuUtilization", True, "🔧"),
+        ("Context Switches", "contextSwitches", False, "🔄"),
+        ("Turnaround Time (ms)", "turnaroundTime", False, "🎯"),
+        ("Energy Used (units)", "energyUsed", False, "🔋"),
+    ]
+
+    detailed_metrics = []
+    for label, key, higher_is_better, icon in compared:
+        improvement = calc_improvement(baseline_metrics[key], optimized_metrics[key], higher_is_better)
+        detailed_metrics.append({
+            "metric": label,
+            "baseline": baseline_metrics[key],
+            "optimized": optimized_metrics[key],
+            "improvement": improvement,
+            "status": improvement_status(improvement),
+            "icon": icon
+        })
+
+    # Equal weighting for all metrics
+    overall_improvement = round(sum(m["improvement"] for m in detailed_metrics) / len(detailed_metrics), 1)
+
+    ordinary_tasks = generate_task_data(baseline_metrics, test_processes, "FCFS")
+    optimized_tasks = generate_task_data(optimized_metrics, test_processes, "Hybrid")
+
+    # Algorithm comparison data
+    algorithm_comparison = []
+    for algo_name in ALGORITHM_KEYS:
+        algo_metrics = calculate_algorithm_metrics(algo_name, test_processes)
+        algo_throughput_imp = calc_improvement(baseline_metrics["throughput"], algo_metrics["throughput"], higher_is_better=True)
+        algo_response_imp = calc_improvement(baseline_metrics["responseTime"], algo_metrics["responseTime"], higher_is_better=False)
+
+        algorithm_comparison.append({
+            "algorithm": algo_name,
+            "throughput": algo_metrics["throughput"],
+            "responseTime": algo_metrics["responseTime"],
+            "waitTime": algo_metrics["waitTime"],
+            "energyUsed": algo_metrics["energyUsed"],
+            "cpuUtilization": algo_metrics["cpuUtilization"],
+            "contextSwitches": algo_metrics["contextSwitches"],
+            "throughputImprovement": algo_throughput_imp,
+            "responseImprovement": algo_response_imp,
+            "efficiency": round((algo_metrics["throughput"] / algo_metrics["energyUsed"]) * 1000, 2) if algo_metrics["energyUsed"] else 0  # Efficiency score
+        })
+
+    response_data = {
+        "ordinary": ordinary_tasks,
+        "optimized": optimized_tasks,
+        "summary": {
+            "baseline": public_metrics(baseline_metrics),
+            "optimized": public_metrics(optimized_metrics),
+            "overallImprovement": overall_improvement,
+            "detailedMetrics": detailed_metrics,
+            "algorithmComparison": algorithm_comparison,
+            "systemInfo": {
+                "batteryLevel": optimized_metrics["batteryLevel"],
+                "cpuLoad": optimized_metrics["cpuLoad"],
+                "systemLoad": optimized_metrics["systemLoad"],
+                "performanceProfile": optimized_metrics["performanceProfile"]
             },
-            {
-                "metric": "Energy Used (units)",
-                "baseline": baseline_metrics["energyUsed"],
-                "optimized": optimized_metrics["energyUsed"],
-                "improvement": energy_improvement,
-                "status": "Improved",
-                "icon": "🔋"
-            }
-        ]
-        
-        # Algorithm comparison data
-        algorithm_comparison = []
-        for algo_name in ["FCFS", "SJF", "SRTF", "Priority", "Round Robin"]:
-            algo_metrics = calculate_algorithm_metrics(algo_name, test_processes)
-            algo_throughput_imp = calc_improvement(baseline_metrics["throughput"], algo_metrics["throughput"], higher_is_better=True)
-            algo_response_imp = calc_improvement(baseline_metrics["responseTime"], algo_metrics["responseTime"], higher_is_better=False)
-            
-            algorithm_comparison.append({
-                "algorithm": algo_name,
-                "throughput": algo_metrics["throughput"],
-                "responseTime": algo_metrics["responseTime"],
-                "waitTime": algo_metrics["waitTime"],
-                "energyUsed": algo_metrics["energyUsed"],
-                "cpuUtilization": algo_metrics["cpuUtilization"],
-                "throughputImprovement": algo_throughput_imp,
-                "responseImprovement": algo_response_imp,
-                "efficiency": round((algo_metrics["throughput"] / algo_metrics["energyUsed"]) * 10, 2)  # Efficiency score
-            })
-        
-        response_data = {
-            "ordinary": ordinary_tasks,
-            "optimized": optimized_tasks,
-            "summary": {
-                "baseline": baseline_metrics,
-                "optimized": optimized_metrics,
-                "overallImprovement": overall_improvement,
-                "detailedMetrics": detailed_metrics,
-                "algorithmComparison": algorithm_comparison,
-                "systemInfo": {
-                    "batteryLevel": optimized_metrics.get("batteryLevel", 75),
-                    "cpuLoad": optimized_metrics.get("cpuLoad", 65),
-                    "systemLoad": optimized_metrics.get("systemLoad", "medium"),
-                    "performanceProfile": optimized_metrics.get("performanceProfile", "balanced")
-                },
-                "algorithms": {
-                    "baseline": "First Come First Serve (FCFS) - Baseline",
-                    "optimized": f"Intelligent Hybrid Scheduler - {optimized_metrics['algorithmUsed']}"
-                },
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "algorithms": {
+                "baseline": "First Come First Serve (FCFS) - Baseline",
+                "optimized": f"Intelligent Hybrid Scheduler - {optimized_metrics['algorithmUsed']}"
             },
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        print(f"✅ REALISTIC Analytics data generated - Overall Improvement: {overall_improvement}%")
-        print(f"   Hybrid Mode: {optimized_metrics.get('performanceProfile', 'balanced')}")
-        print(f"   System Conditions: {optimized_metrics.get('batteryLevel', 75)}% battery, {optimized_metrics.get('cpuLoad', 65)}% CPU")
-        print(f"   All metrics show improvement including CPU (-{cpu_improvement}%) and Context Switches (-{context_improvement}%)")
-        
-        return jsonify(response_data)
-        
+        },
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    print(f"✅ Analytics data simulated - Overall Improvement: {overall_improvement}%")
+    print(f"   Hybrid: {optimized_metrics['algorithmUsed']} ({optimized_metrics['performanceProfile']})")
+    return response_data
+
+@scheduler_analytics_bp.route('/scheduler-analytics-data', methods=['GET', 'POST'])
+def scheduler_analytics_data():
+    try:
+        # Caller-supplied workload (POST {"processes": [...]}) or the default one
+        payload = request.get_json(silent=True) or {}
+        if payload.get("processes"):
+            test_processes = processes_from_payload(payload["processes"])
+            workload_key = fingerprint(test_processes)
+        else:
+            test_processes, workload_key = cached_default_workload()
+
+        # The result depends only on the workload and the hybrid's choice of algorithm
+        # (cached telemetry snapshot, so a cache hit stays cheap). The live battery /
+        # CPU readings are patched into every response, so the ETag is weak: a 304
+        # means the same simulation results, not the same readings.
+        snapshot = _system_snapshot()
+        battery_level, is_charging, cpu_load, _ = snapshot
+        _, algo_key, algo_kwargs = choose_algorithm(battery_level, is_charging, cpu_load)
+        etag = params_fingerprint(workload=workload_key, hybrid=algo_key, params=algo_kwargs,
+                                  profile=performance_profile(battery_level, is_charging))
+
+        if request.if_none_match.contains_weak(etag) and etag in analytics_cache:
+            response = make_response("", 304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        response_data = analytics_cache.get(etag)
+        if response_data is None:
+            print("🔄 Simulating scheduler analytics data...")
+            response_data = build_analytics_report(test_processes, snapshot)
+            analytics_cache.put(etag, response_data)
+
+        response = jsonify(with_live_telemetry(response_data, snapshot))
+        response.set_etag(etag, weak=True)
+        return response
+
+    except (KeyError, TypeError, ValueError) as e:
+        print("❌ Invalid analytics workload:", e)
+        return jsonify({"error": f"Invalid workload: {e}"}), 400
     except Exception as e:
         print("❌ Error in analytics:", e)
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# =========================
+# Parameter Sweep API
+# =========================
+def _int_list(payload, name, default, minimum):
+    values = payload.get(name, default)
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"{name} must be a non-empty list")
+    values = [int(v) for v in values]
+    if min(values) < minimum:
+        raise ValueError(f"{name} values must be at least {minimum}")
+    return values
+
+def _bounded_int(payload, name, default, maximum):
+    value = int(payload.get(name, default))
+    if not 1 <= value <= maximum:
+        raise ValueError(f"{name} must be between 1 and {maximum}")
+    return value
+
+def _sweep_task(socketio, sweep_id, grid, options):
+    state = running_sweeps[sweep_id]
+
+    def on_point(row):
+        state["completed"] += 1
+        state["surface"][row["index"]] = row
+        socketio.emit("sweep_point", {
+            "sweep_id": sweep_id,
+            "completed": state["completed"],
+            "total": len(grid),
+            **row
+        }, namespace="/")
+        socketio.sleep(0)
+
+    # One point at a time in this process, never a process pool forked from a
+    # greenlet; under eventlet each point runs in a real OS thread (tpool)
+    execute = None
+    if getattr(socketio, "async_mode", None) == "eventlet":
+        from eventlet import tpool
+        execute = tpool.execute
+
+    try:
+        run_sweep(grid, on_point=on_point, max_workers=1, execute=execute, **options)
+        state["status"] = "done"
+        socketio.emit("sweep_complete", {"sweep_id": sweep_id, "surface": state["surface"]}, namespace="/")
+        print(f"✅ Sweep {sweep_id} finished ({len(grid)} points)")
+    except Exception as e:
+        state["status"] = "error"
+        state["error"] = str(e)
+        socketio.emit("sweep_error", {"sweep_id": sweep_id, "error": str(e)}, namespace="/")
+        print(f"❌ Sweep {sweep_id} failed:", e)
+    finally:
+        sweep_results.put(sweep_id, running_sweeps.pop(sweep_id))
+
+@scheduler_analytics_bp.route('/scheduler-analytics-sweep', methods=['POST'])
+def start_sweep():
+    """
+    Evaluate quantum x context-switch cost x I/O wait, one point at a time in
+    a background task (in parallel, inline, when there is no Socket.IO server).
+    At most Config.SWEEP_MAX_RUNNING sweeps run at once; more get a 429.
+    Body (all optional): quantum, context_switch, io_wait, algorithms (lists),
+    workloads, processes_per_workload (up to Config.SWEEP_MAX_WORKLOADS /
+    SWEEP_MAX_PROCESSES), seed, or processes (a fixed workload).
+    Points stream as "sweep_point" Socket.IO events, then "sweep_complete"
+    with the whole surface; GET /scheduler-analytics-sweep/<id> polls it.
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        algorithms = payload.get("algorithms", ["round_robin"])
+        unknown = [a for a in algorithms if a not in ENGINE_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown algorithms: {unknown}")
+        grid = sweep_grid(
+            quantum=_int_list(payload, "quantum", [1, 2, 4, 8], 1),
+            context_switch=_int_list(payload, "context_switch", [0, 1, 2], 0),
+            io_wait=_int_list(payload, "io_wait", [1, 2, 4], 0),
+            algorithms=algorithms,
+        )
+        if len(grid) > MAX_POINTS:
+            raise ValueError(f"Sweep has {len(grid)} points, the limit is {MAX_POINTS}")
+
+        options = {
+            "n_workloads": _bounded_int(payload, "workloads", 200, Config.SWEEP_MAX_WORKLOADS),
+            "n_processes": _bounded_int(payload, "processes_per_workload", 8, Config.SWEEP_MAX_PROCESSES),
+            "seed": int(payload.get("seed", 0)),
+        }
+        if payload.get("processes"):
+            if len(payload["processes"]) > Config.SWEEP_MAX_PROCESSES:
+                raise ValueError(f"processes has more than {Config.SWEEP_MAX_PROCESSES} entries")
+            options["workloads"] = [processes_from_payload(payload["processes"])]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid sweep: {e}"}), 400
+
+    socketio = current_app.extensions.get('socketio')
+    if socketio is None:
+        # No Socket.IO server (e.g. scripts): evaluate inline and return the surface
+        return jsonify({"grid": grid, "surface": run_sweep(grid, **options)})
+
+    if len(running_sweeps) >= Config.SWEEP_MAX_RUNNING:
+        return jsonify({"error": f"{len(running_sweeps)} sweeps are already running, try again later"}), 429
+
+    sweep_id = uuid.uuid4().hex
+    running_sweeps[sweep_id] = {
+        "status": "running",
+        "completed": 0,
+        "total": len(grid),
+        "grid": grid,
+        "surface": [None] * len(grid)
+    }
+    socketio.start_background_task(_sweep_task, socketio, sweep_id, grid, options)
+    print(f"🔄 Sweep {sweep_id} started ({len(grid)} points)")
+    return jsonify({"sweep_id": sweep_id, "points": len(grid), "grid": grid}), 202
+
+@scheduler_analytics_bp.route('/scheduler-analytics-sweep/<sweep_id>')
+def sweep_status(sweep_id):
+    state = running_sweeps.get(sweep_id) or sweep_results.get(sweep_id)
+    if state is None:
+        return jsonify({"error": "Unknown sweep"}), 404
+    return jsonify(state)
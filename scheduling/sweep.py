@@ -0,0 +1,58 @@
+# scheduling/sweep.py
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scheduling.batch import evaluate_config, expand_grid
+
+# =========================
+# Parameter Sweep
+# =========================
+# Upper bound on grid points per sweep request
+MAX_POINTS = 500
+
+
+def sweep_grid(quantum=(1, 2, 4, 8), context_switch=(0, 1, 2), io_wait=(1, 2, 4),
+               algorithms=("round_robin",)):
+    """Grid of quantum x context-switch cost x I/O wait (quantum only applies to round_robin)."""
+    return expand_grid(algorithms, quantum, context_switch, io_wait)
+
+
+def _evaluate_point(job):
+    index, config, workloads, n_workloads, n_processes, seed = job
+    row = evaluate_config(config, workloads, n_workloads, n_processes, seed)
+    row["index"] = index
+    return row
+
+
+def run_sweep(grid, workloads=None, n_workloads=200, n_processes=8, seed=0,
+              max_workers=None, on_point=None, execute=None):
+    """
+    Evaluate every grid point over the same workload set, one pool task per point.
+
+    :param on_point: called with each result row as soon as its point finishes
+        (completion order); rows carry their grid "index"
+    :param execute: with max_workers=1, runs each point as execute(fn, job)
+        (e.g. eventlet's tpool.execute, so a point does not block the event
+        loop while on_point still runs in the caller)
+    :return: the response surface, one row per grid point in grid order
+        (see scheduling.batch.run_batch for the row layout)
+    """
+    jobs = [(i, config, workloads, n_workloads, n_processes, seed) for i, config in enumerate(grid)]
+    surface = [None] * len(jobs)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    def collect(row):
+        surface[row["index"]] = row
+        if on_point:
+            on_point(row)
+
+    if max_workers == 1:
+        execute = execute or (lambda fn, *args: fn(*args))
+        for job in jobs:
+            collect(execute(_evaluate_point, job))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_evaluate_point, job) for job in jobs]
+            for future in as_completed(futures):
+                collect(future.result())
+    return surface
@@ -0,0 +1,121 @@
+# task_profiles.py
+"""
+Energy / deadline profiles for new tasks, chosen by keywords in the task name.
+
+The table lives in a JSON file (Config.TASK_PROFILES_PATH, task_profiles.json
+by default):
+
+  {"default": {"energy": [lo, hi], "deadline_hours": [lo, hi]},
+   "profiles": [{"name": ..., "keywords": [...], "energy": [...], "deadline_hours": [...]}, ...]}
+
+A keyword matches anywhere in the lower-cased name and the first matching
+profile in file order wins. All keywords are compiled into one regex,
+factored as a prefix trie, that scans each name once; results are memoized
+per normalized name.
+"""
+import json
+import re
+from functools import lru_cache
+
+from config import Config
+
+# Normalized task names remembered per table
+LOOKUP_CACHE_SIZE = 4096
+
+
+def _range(value, what):
+    if not (isinstance(value, (list, tuple)) and len(value) == 2
+            and all(isinstance(v, (int, float)) for v in value) and value[0] <= value[1]):
+        raise ValueError(f"{what} must be a [low, high] pair, got {value!r}")
+    return tuple(value)
+
+
+def _trie_pattern(words):
+    """Regex alternation factored by common prefixes; at one position it matches the longest word."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def normalize(name):
+    return " ".join(name.lower().split())
+
+
+class ProfileTable:
+    def __init__(self, profiles, default):
+        """
+        :param profiles: list of dicts with name, keywords, energy and deadline_hours
+        :param default: dict with energy and deadline_hours, used when nothing matches
+        """
+        self.names = []
+        self.ranges = []
+        self.default = (_range(default["energy"], "default energy"),
+                        _range(default["deadline_hours"], "default deadline_hours"))
+        rank = {}   # keyword -> index of the first profile listing it
+        for index, profile in enumerate(profiles):
+            name = profile.get("name", f"profile {index}")
+            self.names.append(name)
+            self.ranges.append((_range(profile["energy"], f"{name} energy"),
+                                _range(profile["deadline_hours"], f"{name} deadline_hours")))
+            for keyword in profile["keywords"]:
+                keyword = keyword.lower()
+                if keyword:
+                    rank.setdefault(keyword, index)
+        # The pattern returns the longest keyword starting at a position; every
+        # other keyword matching there is a prefix of it, so rank it by the best one
+        self._rank = {k: min(r for p, r in rank.items() if k.startswith(p)) for k in rank}
+        # Lookahead: a match at every position, so overlapping keywords are all seen
+        self._pattern = re.compile("(?=(" + _trie_pattern(rank) + "))") if rank else None
+        self.lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("profiles", []), data["default"])
+
+    def match(self, name):
+        """Index of the winning profile for a normalized name, or None."""
+        if self._pattern is None:
+            return None
+        found = self._pattern.findall(name)
+        return min(map(self._rank.__getitem__, found)) if found else None
+
+    def _lookup(self, name):
+        index = self.match(name)
+        return self.default if index is None else self.ranges[index]
+
+    def profile(self, name):
+        """(energy range, deadline-hours range) for a task name."""
+        return self.lookup(normalize(name))
+
+
+profile_table = None
+
+
+def _table():
+    global profile_table
+    if profile_table is None:
+        try:
+            profile_table = ProfileTable.load(Config.TASK_PROFILES_PATH)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Failed to load task profiles from {Config.TASK_PROFILES_PATH}: {e}")
+            profile_table = ProfileTable([], {"energy": [30, 70], "deadline_hours": [4, 12]})
+    return profile_table
+
+
+def task_profile(name):
+    """(energy range, deadline-hours range) for a task name, chosen by keyword."""
+    return _table().profile(name)
@@ -0,0 +1,140 @@
+# telemetry.py
+"""
+Shared system telemetry sampler.
+
+One background loop reads battery, charger state, CPU usage (overall and per
+core) and temperature every Config.TELEMETRY_INTERVAL seconds into an
+immutable Snapshot. Publishing is a single attribute assignment, so readers
+never lock or block; snapshot() returns the latest one. psutil's CPU
+counters are read without an interval (usage since the previous sample), so
+sampling itself never sleeps. Every sample is also appended to each sink: `history`
+(telemetry_history.TelemetryHistory, in memory) for windowed queries such as
+the smoothed battery level, and `store` (telemetry_store.TelemetryStore, SQLite) for
+the persistent series behind the /telemetry endpoint, and `forecaster`
+(battery_forecast.DischargeForecaster) for time-to-empty estimates. The store
+is only opened by open_store() (the server does so at start-up), so tools and
+tests that import the app never create the telemetry database.
+
+If the loop is not running (e.g. a tool importing the app without
+__main__), snapshot() samples inline once the cached reading is stale.
+"""
+import time
+from collections import namedtuple
+
+import psutil
+
+from battery_forecast import DischargeForecaster
+from config import Config
+from telemetry_history import TelemetryHistory
+from telemetry_store import TelemetryStore
+
+# battery / secsleft / temp are None when the device has no such sensor
+Snapshot = namedtuple("Snapshot", [
+    "timestamp", "battery", "plugged", "secsleft", "cpu", "per_core", "temp",
+])
+
+
+def _read_temperature():
+    """First positive sensor reading in °C, or None."""
+    if not hasattr(psutil, "sensors_temperatures"):
+        return None
+    try:
+        for entries in (psutil.sensors_temperatures() or {}).values():
+            for entry in entries:
+                if entry.current is not None and entry.current > 0:
+                    return round(entry.current, 1)
+    except Exception:
+        pass
+    return None
+
+
+class TelemetrySampler:
+    def __init__(self, interval=1.0, sinks=()):
+        """
+        :param sinks: objects with append(timestamp, battery, cpu, temp, plugged),
+                      each given every sample
+        """
+        self.interval = interval
+        self.sinks = list(sinks)
+        # Readings older than this are refreshed inline by snapshot()
+        self.max_age = max(5 * interval, 1.0)
+        self.latest = None
+        # Prime the CPU counters, so the first sample is usage since start-up rather than 0
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    def sample(self):
+        """Read every sensor once (non-blocking) and publish the result."""
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        per_core = tuple(psutil.cpu_percent(interval=None, percpu=True))
+        snapshot = Snapshot(
+            timestamp=time.time(),
+            battery=battery.percent if battery else None,
+            plugged=bool(battery.power_plugged) if battery else False,
+            secsleft=battery.secsleft if battery else None,
+            cpu=psutil.cpu_percent(interval=None),
+            per_core=per_core,
+            temp=_read_temperature(),
+        )
+        self.latest = snapshot
+        for sink in self.sinks:
+            try:
+                sink.append(snapshot.timestamp, snapshot.battery, snapshot.cpu,
+                            snapshot.temp, snapshot.plugged)
+            except Exception as e:
+                print(f"⚠️ Telemetry sink {type(sink).__name__} failed: {e}")
+        return snapshot
+
+    def snapshot(self):
+        """Latest reading; samples inline only if there is none or it is stale."""
+        latest = self.latest
+        if latest is None or time.time() - latest.timestamp > self.max_age:
+            return self.sample()
+        return latest
+
+    def run(self, sleep=time.sleep):
+        """Sampling loop; start it once as a background task."""
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ Telemetry sampling failed: {e}")
+            sleep(self.interval)
+
+
+history = TelemetryHistory()
+store = None   # TelemetryStore, see open_store()
+forecaster = DischargeForecaster(Config.FORECAST_HALF_LIFE)
+sampler = TelemetrySampler(Config.TELEMETRY_INTERVAL, [history, forecaster])
+
+
+def open_store():
+    """The persistent store; created and added to the sampler's sinks on first call."""
+    global store
+    if store is None:
+        store = TelemetryStore(Config.TELEMETRY_DB_PATH,
+                               raw_retention=Config.TELEMETRY_RAW_RETENTION_HOURS * 3600)
+        sampler.sinks.append(store)
+    return store
+
+
+def restore_history(seconds=3600):
+    """Refill the in-memory history and forecaster from the store after a restart; returns the rows replayed."""
+    rows = open_store().recent(seconds)
+    for row in rows:
+        history.append(*row)
+        forecaster.append(*row)
+    return len(rows)
+
+
+def forecast(battery=None, algorithm=None):
+    """Battery time-to-empty for the active algorithm (see DischargeForecaster.forecast)."""
+    return forecaster.forecast(battery, algorithm)
+
+
+def snapshot():
+    """Latest telemetry Snapshot (see TelemetrySampler)."""
+    return sampler.snapshot()
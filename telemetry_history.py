@@ -0,0 +1,117 @@
+# telemetry_history.py
+"""
+Timestamped telemetry history in fixed-size NumPy ring buffers.
+
+Every sample (timestamp, battery, cpu, temp, plugged) goes into the raw "1s"
+tier in O(1). Running per-bucket sums feed the "1m" and "1h" tiers with one
+averaged row per completed minute / hour, so long windows stay cheap and
+memory is fixed. Missing readings (no battery / no sensor) are NaN and are
+left out of the averages; plugged is averaged to the fraction of the bucket
+spent charging. Windowed reads copy only the rows in the window. Discharge
+estimates live in battery_forecast.
+"""
+import numpy as np
+
+FIELDS = ("timestamp", "battery", "cpu", "temp", "plugged")
+# Tier name -> (bucket seconds, rows kept); None = every sample
+TIERS = {"1s": (None, 3600), "1m": (60, 1440), "1h": (3600, 720)}
+
+
+class RingBuffer:
+    """Fixed number of rows of len(FIELDS) floats; appending overwrites the oldest row."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.full((capacity, len(FIELDS)), np.nan)
+        self.count = 0   # rows ever appended
+
+    def append(self, row):
+        self.data[self.count % self.capacity] = row
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _segments(self):
+        """(older, newer) views, each in time order; their concatenation is every stored row."""
+        if self.count <= self.capacity:
+            return self.data[:0], self.data[:self.count]
+        split = self.count % self.capacity
+        return self.data[split:], self.data[:split]
+
+    def rows(self):
+        """All stored rows, oldest first."""
+        return np.concatenate(self._segments())
+
+    def since(self, start):
+        """Rows with timestamp >= start, oldest first (binary search; copies only those rows)."""
+        older, newer = self._segments()
+        i = np.searchsorted(older[:, 0], start)
+        if i < len(older):
+            return np.concatenate([older[i:], newer])
+        return newer[np.searchsorted(newer[:, 0], start):].copy()
+
+    def last_timestamp(self):
+        return self.data[(self.count - 1) % self.capacity, 0] if self.count else None
+
+
+class _Bucket:
+    """Running sums of the current bucket of a downsampled tier."""
+    def __init__(self, seconds, ring):
+        self.seconds = seconds
+        self.ring = ring
+        self.start = None
+        self.sums = np.zeros(len(FIELDS) - 1)
+        self.counts = np.zeros(len(FIELDS) - 1)
+
+    def add(self, row):
+        start = row[0] - row[0] % self.seconds
+        if self.start is not None and start != self.start:
+            self.flush()
+        self.start = start
+        values = row[1:]
+        seen = ~np.isnan(values)
+        self.sums[seen] += values[seen]
+        self.counts += seen
+
+    def flush(self):
+        if self.start is None:
+            return
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums / self.counts
+        self.ring.append(np.concatenate([[self.start], means]))
+        self.sums[:] = 0
+        self.counts[:] = 0
+        self.start = None
+
+
+class TelemetryHistory:
+    def __init__(self, tiers=TIERS):
+        self.tiers = {name: RingBuffer(capacity) for name, (_, capacity) in tiers.items()}
+        self._buckets = [_Bucket(seconds, self.tiers[name])
+                         for name, (seconds, _) in tiers.items() if seconds]
+
+    def append(self, timestamp, battery, cpu, temp, plugged):
+        """Add one sample (None for a missing reading)."""
+        row = np.array([timestamp, battery, cpu, temp, plugged], dtype=float)
+        self.tiers["1s"].append(row)
+        for bucket in self._buckets:
+            bucket.add(row)
+
+    def window(self, seconds=None, tier="1s", now=None):
+        """
+        Rows of a tier from the last `seconds` (all stored rows if None),
+        oldest first, as {field: array}.
+        """
+        ring = self.tiers[tier]
+        if seconds is None or not ring.count:
+            rows = ring.rows()
+        else:
+            now = ring.last_timestamp() if now is None else now
+            rows = ring.since(now - seconds)
+        return dict(zip(FIELDS, rows.T))
+
+    def mean(self, field, seconds, tier="1s"):
+        """Average of a field over the window (None if there is no reading)."""
+        values = self.window(seconds, tier)[field]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
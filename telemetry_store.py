@@ -0,0 +1,266 @@
+# telemetry_store.py
+"""
+Persistent, append-only telemetry time series (SQLite in WAL mode).
+
+Samples are buffered and written with one executemany per batch into the raw
+`samples` table. A rollup pass (at most once a minute, from the writer)
+aggregates complete minutes into `rollup_1m` and complete hours into
+`rollup_1h` (avg / min / max per field plus each field's sample count, so
+re-aggregation stays exact when a field is missing from some samples) and
+deletes rows past each table's retention.
+
+query() answers range requests with the aggregation done in SQL, reading the
+coarsest table whose buckets divide the requested step. Readers use their own
+short connection and only see committed rows (not the writer's pending
+batch), so they never wait for the writer (WAL).
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+FIELDS = ("battery", "cpu", "temp", "plugged")
+AGGREGATES = ("avg", "min", "max")
+# Table -> bucket seconds (None = raw samples), from finest to coarsest
+TABLES = {"samples": None, "rollup_1m": 60, "rollup_1h": 3600}
+# Seconds each table is kept; the raw retention is configurable (see TelemetryStore)
+RETENTION = {"rollup_1m": 30 * 86400, "rollup_1h": 365 * 86400}
+# Most buckets returned by one query; larger requests get a coarser step
+MAX_POINTS = 2000
+
+
+def _rollup_columns():
+    return [f"{field}_{agg}" for field in FIELDS for agg in AGGREGATES] + _count_columns()
+
+
+def _count_columns():
+    return [f"{field}_n" for field in FIELDS]
+
+
+def _weight(field):
+    # Samples behind a rollup row's average of `field` (rows from before the
+    # per-field counts existed fall back to the row's sample count)
+    return f"COALESCE({field}_n, CASE WHEN {field}_avg IS NULL THEN 0 ELSE n END)"
+
+
+class TelemetryStore:
+    def __init__(self, path, batch_size=30, flush_interval=10.0, raw_retention=2 * 86400,
+                 rollup_interval=60.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rollup_interval = rollup_interval
+        self.retention = {"samples": raw_retention, **RETENTION}
+        self._pending = []
+        self._oldest = None          # monotonic time of the oldest pending sample
+        self._last_rollup = 0.0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # ---------------------
+    # Connection + schema
+    # ---------------------
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _writer(self):
+        if self._conn is None:
+            conn = self._connect()
+            rollup = ", ".join(f"{c} {'INTEGER' if c.endswith('_n') else 'REAL'}" for c in _rollup_columns())
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS samples "
+                             "(ts REAL NOT NULL, battery REAL, cpu REAL, temp REAL, plugged REAL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts)")
+                for table in ("rollup_1m", "rollup_1h"):
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                                 f"(ts REAL PRIMARY KEY, n INTEGER NOT NULL, {rollup})")
+                    # Tables created before the per-field counts
+                    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                    for column in _count_columns():
+                        if column not in existing:
+                            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER")
+            self._conn = conn
+        return self._conn
+
+    # ---------------------
+    # Writes
+    # ---------------------
+    def append(self, timestamp, battery, cpu, temp, plugged):
+        """Buffer one sample; written when the batch is full or flush_interval has passed."""
+        self._pending.append((timestamp, battery, cpu, temp, float(plugged)))
+        now = time.monotonic()
+        if self._oldest is None:
+            self._oldest = now
+        if len(self._pending) >= self.batch_size or now - self._oldest >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered samples in one transaction, then roll up / expire if due."""
+        with self._lock:
+            rows, self._pending, self._oldest = self._pending, [], None
+            if not rows and self._conn is None:
+                return   # nothing written yet: don't create the database just to read it
+            try:
+                conn = self._writer()
+                if rows:
+                    with conn:
+                        conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?)", rows)
+                if time.monotonic() - self._last_rollup >= self.rollup_interval:
+                    self._rollup(conn, time.time())
+                    self._last_rollup = time.monotonic()
+            except sqlite3.Error as e:
+                print(f"⚠️ Telemetry store write failed: {e}")
+
+    def _rollup(self, conn, now):
+        """Aggregate complete buckets not rolled up yet, then apply retention."""
+        with conn:
+            self._rollup_into(conn, "rollup_1m", 60, "samples", now)
+            self._rollup_into(conn, "rollup_1h", 3600, "rollup_1m", now)
+            for table, keep in self.retention.items():
+                conn.execute(f"DELETE FROM {table} WHERE ts < ?", (now - keep,))
+
+    def _rollup_into(self, conn, table, seconds, source, now):
+        (done,) = conn.execute(f"SELECT MAX(ts) FROM {table}").fetchone()
+        start = done + seconds if done is not None else 0
+        end = now - now % seconds   # only complete buckets
+        bucket = f"CAST(ts / {seconds} AS INTEGER) * {seconds}"
+        if source == "samples":
+            n = "COUNT(*)"
+            columns = [f"{agg.upper()}({field})" for field in FIELDS for agg in AGGREGATES]
+            columns += [f"COUNT({field})" for field in FIELDS]
+        else:
+            # Averages weighted by each field's sample count, so a rollup of rollups stays exact
+            n = "SUM(n)"
+            columns = [f"SUM({field}_avg * {_weight(field)}) / SUM({_weight(field)})"
+                       if agg == "avg" else f"{agg.upper()}({field}_{agg})"
+                       for field in FIELDS for agg in AGGREGATES]
+            columns += [f"SUM({_weight(field)})" for field in FIELDS]
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} (ts, n, {', '.join(_rollup_columns())}) "
+            f"SELECT {bucket} AS b, {n}, {', '.join(columns)} FROM {source} "
+            f"WHERE ts >= ? AND ts < ? GROUP BY b",
+            (start, end),
+        )
+
+    # ---------------------
+    # Reads
+    # ---------------------
+    def query(self, since, until=None, step=None, agg="avg", fields=None):
+        """
+        Buckets of `step` seconds between since and until (epoch seconds), each
+        {"t": bucket start, field: aggregate, ...}, oldest first. Data comes
+        from the coarsest table that still holds `since` and whose bucket
+        divides the step, plus raw samples newer than its last rollup. The
+        step is widened if the range would exceed MAX_POINTS, and rounded up
+        to a bucket multiple when only rollups hold `since`; the response
+        carries the step used. Samples still buffered by the writer are not
+        included. Fields default to all.
+        """
+        fields = tuple(fields or FIELDS)
+        if agg not in AGGREGATES:
+            raise ValueError(f"agg must be one of {AGGREGATES}")
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        now = time.time()
+        until = now if until is None else until
+        if until <= since:
+            raise ValueError("until must be after since")
+        step = max(1, int(step or 1), math.ceil((until - since) / MAX_POINTS))
+        source, step = self._source(since, step, now)
+        since -= since % step
+        if not os.path.exists(self.path):
+            return {"source": source, "step": step, "points": []}
+
+        buckets = {}
+        conn = self._connect()
+        try:
+            watermark = since
+            if source != "samples":
+                (done,) = conn.execute(f"SELECT MAX(ts) FROM {source}").fetchone()
+                watermark = max(since, min(until, done + TABLES[source] if done is not None else since))
+                self._merge(buckets, conn, source, since, watermark, step, agg, fields)
+            self._merge(buckets, conn, "samples", watermark, until, step, agg, fields)
+        except sqlite3.OperationalError:
+            pass   # tables not created yet
+        finally:
+            conn.close()
+
+        points = []
+        for t in sorted(buckets):
+            point = {"t": t}
+            for field, (value, count) in zip(fields, buckets[t]):
+                if agg == "avg":
+                    value = value / count if count else None
+                point[field] = round(value, 3) if value is not None else None
+            points.append(point)
+        return {"source": source, "step": step, "points": points}
+
+    def _source(self, since, step, now):
+        """
+        (table, step) for a query: the coarsest table holding `since` whose
+        bucket divides the step (so no rollup bucket straddles two steps);
+        if none does, the finest one holding it, with the step rounded up to
+        its bucket.
+        """
+        holding = [(table, seconds or 1) for table, seconds in TABLES.items()
+                   if since >= now - self.retention[table]]
+        exact = [table for table, seconds in holding if step % seconds == 0]
+        if exact:
+            return exact[-1], step
+        if holding:
+            table, seconds = holding[0]
+            return table, math.ceil(step / seconds) * seconds
+        return "samples", step   # older than every retention: nothing to read
+
+    @staticmethod
+    def _merge(buckets, conn, table, start, end, step, agg, fields):
+        """
+        Add one table's [start, end) into step buckets as (value, count) per
+        field: value is a sum for "avg" (divided at the end) or the min / max.
+        """
+        if end <= start:
+            return
+        columns = []
+        for f in fields:
+            if table == "samples":
+                value = f"SUM({f})" if agg == "avg" else f"{agg.upper()}({f})"
+                count = f"COUNT({f})"
+            elif agg == "avg":
+                value, count = f"SUM({f}_avg * {_weight(f)})", f"SUM({_weight(f)})"
+            else:
+                value, count = f"{agg.upper()}({f}_{agg})", f"COUNT({f}_{agg})"
+            columns += [value, count]
+        rows = conn.execute(
+            f"SELECT CAST(ts / {step} AS INTEGER) * {step} AS b, {', '.join(columns)} "
+            f"FROM {table} WHERE ts >= ? AND ts < ? GROUP BY b",
+            (start, end),
+        )
+        pick = {"avg": lambda a, b: a + b, "min": min, "max": max}[agg]
+        for row in rows:
+            merged = buckets.setdefault(row[0], [(None, 0)] * len(fields))
+            for i in range(len(fields)):
+                value, count = row[1 + 2 * i], row[2 + 2 * i] or 0
+                old, old_count = merged[i]
+                if value is not None:
+                    value = value if old is None else pick(old, value)
+                else:
+                    value = old
+                merged[i] = (value, old_count + count)
+
+    def recent(self, seconds):
+        """Raw committed samples of the last `seconds` as (ts, battery, cpu, temp, plugged) tuples."""
+        if not os.path.exists(self.path):
+            return []
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT ts, battery, cpu, temp, plugged FROM samples "
+                                "WHERE ts >= ? ORDER BY ts", (time.time() - seconds,)).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        finally:
+            conn.close()
@@ -0,0 +1,32 @@
+"""Shared test setup: import the flat top-level modules, keep databases out of the repo."""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Must be set before config.py is imported (Config reads it at class creation)
+os.environ.setdefault("TELEMETRY_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="scheduler-tests-"), "telemetry.db"))
+
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    # app.py binds its engine and starts pollers at import: give it a throwaway,
+    # already created database first (once, every test module shares the import)
+    from flask import Flask
+
+    from config import Config
+    from models import db
+
+    Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + str(tmp_path_factory.mktemp("db") / "app.db")
+    setup = Flask(__name__)
+    setup.config.from_object(Config)
+    db.init_app(setup)
+    with setup.app_context():
+        db.create_all()
+    import app as app_module
+    return app_module
@@ -0,0 +1,75 @@
+import pytest
+
+from scheduling import scheduler_analytics
+
+
+@pytest.fixture
+def analytics(app_module, monkeypatch):
+    snapshot = {"value": (80, False, 20, 40)}   # battery, plugged, cpu, temp → SRTF
+    monkeypatch.setattr(scheduler_analytics, "_system_snapshot", lambda: snapshot["value"])
+    scheduler_analytics.invalidate_analytics()
+    yield app_module.app.test_client(), snapshot
+    with app_module.app.app_context():
+        app_module.Task.query.filter_by(name="cache test").delete()
+        app_module.db.session.commit()
+
+
+def _simulated_task(app_module, **fields):
+    with app_module.app.app_context():
+        task = app_module.Task(name="cache test", type="simulated", **fields)
+        app_module.db.session.add(task)
+        app_module.db.session.commit()
+        return task.id
+
+
+def _update_task(app_module, task_id, **fields):
+    with app_module.app.app_context():
+        task = app_module.db.session.get(app_module.Task, task_id)
+        for name, value in fields.items():
+            setattr(task, name, value)
+        app_module.db.session.commit()
+
+
+def test_etag_revalidates_and_live_telemetry_is_not_cached(analytics):
+    client, snapshot = analytics
+    first = client.get("/scheduler-analytics-data")
+    assert first.status_code == 200
+    etag, weak = first.get_etag()
+    assert etag and weak
+    assert first.get_json()["summary"]["systemInfo"]["cpuLoad"] == 20
+
+    assert client.get("/scheduler-analytics-data", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    # Same algorithm choice, new readings: same ETag, but the body reports the new readings
+    snapshot["value"] = (75, False, 45, 40)
+    second = client.get("/scheduler-analytics-data")
+    assert second.headers["ETag"] == first.headers["ETag"]
+    summary = second.get_json()["summary"]
+    assert summary["systemInfo"]["batteryLevel"] == 75 and summary["systemInfo"]["cpuLoad"] == 45
+    assert summary["systemInfo"]["systemLoad"] == "medium" and summary["optimized"]["cpuLoad"] == 45
+    assert summary["detailedMetrics"] == first.get_json()["summary"]["detailedMetrics"]
+
+
+def test_only_workload_changes_invalidate(app_module, analytics):
+    client, _ = analytics
+    task_id = _simulated_task(app_module, priority="Low", energy=4)
+    etag = client.get("/scheduler-analytics-data").headers["ETag"]
+    assert len(scheduler_analytics.analytics_cache) == 1
+
+    # Driver-style status / progress updates keep the cached report
+    _update_task(app_module, task_id, status="Running", progress=50, remaining_time=2)
+    assert len(scheduler_analytics.analytics_cache) == 1
+    assert client.get("/scheduler-analytics-data", headers={"If-None-Match": etag}).status_code == 304
+
+    _update_task(app_module, task_id, priority="High")
+    assert len(scheduler_analytics.analytics_cache) == 0
+    assert client.get("/scheduler-analytics-data").headers["ETag"] != etag
+
+    # Bulk UPDATE statements: only workload columns count
+    with app_module.app.app_context():
+        app_module.db.session.execute(app_module.db.update(app_module.Task).values(status="Paused"))
+        assert len(scheduler_analytics.analytics_cache) == 1
+        app_module.db.session.execute(app_module.db.update(app_module.Task)
+                                      .where(app_module.Task.id == task_id).values(energy=7))
+        assert len(scheduler_analytics.analytics_cache) == 0
+        app_module.db.session.rollback()
@@ -0,0 +1,61 @@
+import pytest
+
+import scheduler_root
+
+
+def test_start_simulation_runs_scheduler_root_driver(app_module, monkeypatch):
+    started = []
+    monkeypatch.setattr(app_module.socketio, "start_background_task",
+                        lambda target, *args: started.append((target, args)))
+    client = app_module.socketio.test_client(app_module.app)
+    client.get_received()
+
+    client.emit("start_simulation")
+    jobs = [args for target, args in started if target is scheduler_root.run_scheduler_with_intelligence]
+    assert len(jobs) == 1
+    # The battery impact emitter is started once at server start, not per simulation
+    assert len(started) == 1
+    algorithm, app, socketio = jobs[0]
+    assert (app, socketio) == (app_module.app, app_module.socketio)
+
+    # No tasks: the driver reports idle instead of failing on its arguments
+    scheduler_root.run_scheduler_with_intelligence(*jobs[0])
+    updates = [msg["args"][0] for msg in client.get_received() if msg["name"] == "update_algorithm"]
+    assert {"algorithm": "Idle (No runnable tasks)"} in updates
+
+
+def test_task_import_rejects_real_tasks(app_module):
+    client = app_module.app.test_client()
+    with app_module.app.app_context():
+        before = app_module.Task.query.count()
+
+    response = client.post("/tasks/import", json=[{"name": "a", "priority": "High"},
+                                                  {"name": "b", "priority": "Low", "type": "real"}])
+    assert response.status_code == 400
+    assert "Row 2" in response.get_json()["error"]
+    with app_module.app.app_context():
+        assert app_module.Task.query.count() == before
+
+    response = client.post("/tasks/import", json=[{"name": "a", "priority": "High", "type": "Simulated"}])
+    assert response.status_code == 200 and response.get_json()["imported"] == 1
+
+
+def test_battery_impact_emitter_follows_current_scheduler(app_module, monkeypatch):
+    class Stop(Exception):
+        pass
+
+    emitted, ticks = [], []
+
+    def sleep(seconds):
+        ticks.append(seconds)
+        if len(ticks) > 1:
+            app_module.CURRENT_SCHEDULER = "priority_scheduling"
+        if len(ticks) > 2:
+            raise Stop
+
+    monkeypatch.setattr(app_module, "CURRENT_SCHEDULER", "sjf")
+    monkeypatch.setattr(app_module.socketio, "sleep", sleep)
+    monkeypatch.setattr(app_module.socketio, "emit", lambda event, data, **kw: emitted.append(data))
+    with pytest.raises(Stop):
+        app_module.emit_battery_impact_incremental(app_module.socketio, app_module.app)
+    assert [data["currentAlgo"] for data in emitted] == ["SJF", "Priority Scheduling"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from battery_forecast import DischargeForecaster, forecast_text
+
+
+def _drain(forecaster, seconds, rate, start=90.0, t0=0, noise=0.05, seed=0, plugged=False):
+    """Feed a linear drain (%/s) with Gaussian sensor noise at one sample per second."""
+    rnd = np.random.default_rng(seed)
+    level = start
+    for t in range(t0, t0 + seconds):
+        level = start - rate * (t - t0)
+        forecaster.append(t, level + rnd.normal(0, noise), 10.0, 40.0, plugged)
+    return level
+
+
+def test_converges_on_a_synthetic_drain():
+    forecaster = DischargeForecaster(half_life=600)
+    forecaster.set_algorithm("SJF")
+    level = _drain(forecaster, 1200, rate=0.01)
+
+    rate, variance = forecaster.rate("SJF")
+    assert rate == pytest.approx(-0.01, rel=0.01) and variance < 1e-8
+
+    result = forecaster.forecast()
+    truth = level / 0.01 / 60
+    assert result["status"] == "discharging" and result["conditioned"]
+    assert result["minutes"] == pytest.approx(truth, rel=0.01)
+    assert result["low"] <= truth <= result["high"]
+    assert forecast_text(result).startswith(f"{result['minutes']} mins left")
+
+
+def test_estimating_until_enough_samples():
+    forecaster = DischargeForecaster(min_samples=30)
+    _drain(forecaster, 10, rate=0.01)
+    assert forecaster.forecast()["status"] == "estimating"
+    assert forecaster.rate() is None
+    assert forecast_text(forecaster.forecast(), 80) == "80%"
+
+
+def test_rates_are_conditioned_on_the_active_algorithm():
+    forecaster = DischargeForecaster(half_life=600)
+    level, t = 90.0, 0
+    for block in range(20):
+        name, rate = ("SJF", 0.01) if block % 2 == 0 else ("Round Robin", 0.03)
+        forecaster.set_algorithm(name)
+        level = _drain(forecaster, 60, rate, start=level, t0=t, seed=block)
+        t += 60
+    assert forecaster.rate("SJF")[0] == pytest.approx(-0.01, rel=0.05)
+    assert forecaster.rate("Round Robin")[0] == pytest.approx(-0.03, rel=0.05)
+    assert forecaster.rate()[0] == pytest.approx(-0.02, rel=0.05)
+    # An algorithm without its own samples falls back to the overall fit
+    assert forecaster.forecast(algorithm="FCFS")["conditioned"] is False
+
+
+def test_charging_and_flat_battery():
+    forecaster = DischargeForecaster(half_life=600)
+    _drain(forecaster, 300, rate=0.01)
+    forecaster.append(300, 87.0, 10.0, 40.0, True)
+    assert forecast_text(forecaster.forecast()) == "∞ (Charging)"
+
+    # Unplugged at a higher level: the level re-anchors, the learned rate is kept
+    forecaster.append(301, 95.0, 10.0, 40.0, False)
+    forecaster.append(302, 94.99, 10.0, 40.0, False)
+    result = forecaster.forecast()
+    assert result["status"] == "discharging" and result["level"] == pytest.approx(95.0, abs=0.1)
+
+    flat = DischargeForecaster()
+    _drain(flat, 120, rate=-0.001, noise=0.0)   # slowly rising
+    assert forecast_text(flat.forecast()) == "∞ (Idle)"
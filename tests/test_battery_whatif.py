@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import battery_whatif
+from battery_whatif import ALGORITHMS, PERCENT_PER_ENERGY, SECONDS_PER_UNIT, WhatIf, Workload, sample_processes
+
+
+def _workload(count=40, energy=10.0, sample=None):
+    processes = sample if sample is not None else [(3 + i % 5, i % 3) for i in range(min(count, 20))]
+    return Workload(count, energy * count, energy * energy * count, processes)
+
+
+def test_sample_processes_uses_the_shared_priority_mapping():
+    rows = [(0, 4, "High"), (2, 5, "Low"), (None, None, "Medium"), (3, 3, "Unknown")]
+    assert sample_processes(rows) == [(4, 0), (2, 2), (1, 1), (3, 1)]
+    assert len(sample_processes([(1, 1, "Low")] * 500)) == battery_whatif.MAX_SIM_TASKS
+
+
+def test_profiles_cache_the_simulation_and_scale_per_call(monkeypatch):
+    calls = []
+    simulate = battery_whatif.simulate_metrics
+    monkeypatch.setattr(battery_whatif, "simulate_metrics",
+                        lambda processes, algorithm: calls.append(algorithm) or simulate(processes, algorithm))
+    whatif = WhatIf(seed=0)
+    small = whatif.profiles(_workload(count=20))
+    large = whatif.profiles(_workload(count=60))   # same sample, more pending tasks
+    assert len(calls) == len(ALGORITHMS)
+    for name in ALGORITHMS:
+        assert small[name][0] == large[name][0] >= 1.0
+        assert large[name][1] == pytest.approx(3 * small[name][1])
+    assert whatif.profiles(_workload(count=20)) == small
+
+
+def test_median_matches_the_expected_drain():
+    workload = _workload(count=40, energy=10.0)
+    result = WhatIf(scenarios=20000, budget_ms=10000, seed=1).run(workload, battery=90, cpu=30,
+                                                                  rate=(-0.01, 1e-10))
+    assert result["scenarios"] == 20000
+    profiles = WhatIf().profiles(workload)
+    mean_energy = np.exp(battery_whatif.ENERGY_SIGMA ** 2 / 2)
+    for name, stats in result["algorithms"].items():
+        overhead, makespan = profiles[name]
+        seconds = makespan * SECONDS_PER_UNIT
+        expected = workload.energy_sum * mean_energy * overhead * PERCENT_PER_ENERGY + 0.01 * seconds
+        assert stats["battery_used"] == pytest.approx(expected, rel=0.05)
+        for series in ("remaining", "time_to_empty"):
+            q = stats[series]
+            assert q["p10"] <= q["p50"] <= q["p90"]
+
+
+def test_empty_workload_and_arrivals():
+    empty = WhatIf(scenarios=2000, budget_ms=10000, seed=2).run(Workload(0, 0.0, 0.0, []), 60, 20,
+                                                                rate=(-0.01, 1e-10))
+    for stats in empty["algorithms"].values():
+        assert stats["battery_used"] == 0.0
+        assert stats["time_to_empty"]["p50"] == pytest.approx(60 / 0.01 / 60, rel=0.2)
+
+    quiet = WhatIf(scenarios=4000, budget_ms=10000, seed=3).run(_workload(), 90, 30)
+    busy = WhatIf(scenarios=4000, budget_ms=10000, seed=3).run(_workload(), 90, 30, arrival_rate=1.0)
+    for name in ALGORITHMS:
+        assert busy["algorithms"][name]["battery_used"] > quiet["algorithms"][name]["battery_used"]
+
+
+def test_latency_budget_stops_after_a_chunk():
+    result = WhatIf(scenarios=10 * battery_whatif.CHUNK, budget_ms=0.0, seed=4).run(_workload(), 90, 30)
+    assert result["scenarios"] == battery_whatif.CHUNK
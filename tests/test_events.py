@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from scheduling import scheduler
+from scheduling.events import ALGORITHMS, IDLE, IO, RUN, SWITCH, expand_steps, simulate
+from scheduling.scheduler import Process
+
+
+def _workload(seed, count=12):
+    """Random processes with spread arrivals, idle gaps and I/O points."""
+    rnd = random.Random(seed)
+    processes = []
+    for pid in range(1, count + 1):
+        burst = rnd.randint(1, 9)
+        io = rnd.sample(range(1, burst), k=min(len(range(1, burst)), rnd.randint(0, 2))) if burst > 1 else []
+        processes.append(Process(pid, burst, priority=rnd.randint(0, 2),
+                                 arrival_time=rnd.choice([0, 0, rnd.randint(0, 40)]), io_times=io))
+    return processes
+
+
+def _generator(algorithm, processes, quantum):
+    kwargs = {"quantum": quantum} if algorithm == "round_robin" else {}
+    return getattr(scheduler, algorithm)(processes, **kwargs)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("record_queue", [True, "delta"])
+@pytest.mark.parametrize("seed", range(8))
+def test_event_core_matches_generators(algorithm, record_queue, seed):
+    quantum = 1 + seed % 3
+    expected = list(_generator(algorithm, _workload(seed), quantum))
+    trace = simulate(_workload(seed), algorithm, quantum=quantum, record_queue=record_queue)
+    assert list(expand_steps(trace)) == expected
+
+
+def test_trace_is_contiguous_and_run_length_encoded():
+    trace = simulate(_workload(3), "round_robin", quantum=2)
+    assert trace[0].start == 0
+    for previous, seg in zip(trace, trace[1:]):
+        assert seg.start == previous.end and seg.end > seg.start
+    assert {seg.kind for seg in trace} <= {IDLE, SWITCH, RUN, IO}
+    # Far fewer segments than time units
+    assert len(trace) < trace[-1].end
+
+
+def test_simulate_leaves_processes_untouched_and_skips_long_gaps():
+    processes = [Process(1, 5, arrival_time=0), Process(2, 1000, arrival_time=10 ** 6)]
+    trace = simulate(processes, "fcfs", record_queue=False)
+    assert trace[-1].end == 10 ** 6 + 1 + 1000
+    assert len(trace) <= 5
+    assert [(p.remaining_time, p.cpu_executed) for p in processes] == [(5, 0), (1000, 0)]
+
+
+def test_rejects_unknown_algorithm_and_bad_quantum():
+    with pytest.raises(ValueError):
+        simulate(_workload(0), "lottery")
+    with pytest.raises(ValueError):
+        simulate(_workload(0), "round_robin", quantum=0)
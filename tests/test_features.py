@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+import features
+from features import PRIORITY_CLASSES, PRIORITY_FEATURES, add_priority_features, check_priority_model
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), features.CHECK_DATA)
+
+
+@pytest.fixture(scope="module")
+def trained():
+    df = add_priority_features(pd.read_csv(DATA, nrows=1500))
+    y = df["priority"].map(PRIORITY_CLASSES)
+    return RandomForestClassifier(n_estimators=20, max_depth=10, random_state=0).fit(df[PRIORITY_FEATURES], y)
+
+
+class Relabelled:
+    """A model whose classes are encoded differently from training (High and Low swapped)."""
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X):
+        return 2 - self.model.predict(X)
+
+
+def test_check_passes_for_the_trained_model(trained):
+    report = check_priority_model(trained, data_path=DATA)
+    assert report["rows"] == features.CHECK_ROWS and report["accuracy"] >= features.MIN_ACCURACY
+
+
+def test_check_rejects_skewed_models(trained):
+    with pytest.raises(ValueError, match="labelled rows"):
+        check_priority_model(Relabelled(trained), data_path=DATA)
+
+    renamed = RandomForestClassifier(n_estimators=2, random_state=0).fit(
+        pd.DataFrame(np.zeros((4, 7)), columns=PRIORITY_FEATURES[::-1]), [0, 1, 2, 0])
+    with pytest.raises(ValueError, match="Model expects"):
+        check_priority_model(renamed, data_path=DATA)
+
+
+def test_check_skips_scoring_without_data(trained):
+    assert check_priority_model(Relabelled(trained), data_path="missing.csv") == {"rows": 0, "accuracy": None}
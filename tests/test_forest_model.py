@@ -0,0 +1,55 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_model import ForestModel, export_forest, export_path, file_digest, load_model
+
+FEATURES = ["battery", "cpu", "temp", "priority"]
+
+
+def _fit(seed, n_classes):
+    rnd = np.random.default_rng(seed)
+    X = pd.DataFrame(rnd.uniform(0, 100, size=(400, len(FEATURES))), columns=FEATURES)
+    y = np.digitize(X["battery"] - X["cpu"] + rnd.normal(0, 20, len(X)),
+                    np.linspace(-60, 60, n_classes - 1))
+    return RandomForestClassifier(n_estimators=15, max_depth=8, random_state=seed).fit(X, y)
+
+
+def _inputs(model, forest, seed):
+    """Random rows plus rows sitting exactly on every split threshold."""
+    rnd = np.random.default_rng(seed)
+    X = rnd.uniform(-10, 110, size=(2000, len(FEATURES)))
+    internal = forest.left != np.arange(len(forest.left))
+    edges = rnd.uniform(-10, 110, size=(int(internal.sum()), len(FEATURES)))
+    edges[np.arange(len(edges)), forest.feature[internal]] = forest.threshold[internal]
+    return pd.DataFrame(np.vstack([X, edges]), columns=model.feature_names_in_)
+
+
+@pytest.mark.parametrize("seed,n_classes", [(0, 2), (1, 3), (2, 5)])
+def test_exported_forest_matches_sklearn(tmp_path, seed, n_classes):
+    model = _fit(seed, n_classes)
+    path = tmp_path / "model.npz"
+    export_forest(model, path)
+    forest = ForestModel.load(path)
+
+    X = _inputs(model, forest, seed)
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+    np.testing.assert_array_equal(forest.predict_proba(X), model.predict_proba(X))
+    # Column order comes from the feature names, like sklearn
+    shuffled = X[FEATURES[::-1]]
+    np.testing.assert_array_equal(forest.predict(shuffled), model.predict(X))
+
+
+def test_load_model_uses_export_only_when_current(tmp_path):
+    model_path = str(tmp_path / "model.pkl")
+    with open(model_path, "wb") as f:
+        pickle.dump(_fit(0, 3), f)
+
+    export_forest(_fit(0, 3), export_path(model_path), source_digest=file_digest(model_path))
+    assert isinstance(load_model(model_path), ForestModel)
+
+    export_forest(_fit(0, 3), export_path(model_path), source_digest="stale")
+    assert isinstance(load_model(model_path), RandomForestClassifier)
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from scheduling.events import RUN, simulate
+from scheduling.multicore import big_little, homogeneous, parse_core_layout, simulate_multicore
+from scheduling.process_table import ProcessTable
+from scheduling.scheduler import Process
+
+
+def _spec(seed, count=12, io=True):
+    rnd = random.Random(seed)
+    spec = []
+    for pid in range(1, count + 1):
+        burst = rnd.randint(1, 9)
+        points = rnd.sample(range(1, burst), k=min(burst - 1, rnd.randint(0, 2))) if io and burst > 1 else []
+        spec.append((pid, burst, rnd.randint(0, 2), rnd.choice([0, 0, rnd.randint(0, 40)]), points))
+    return spec
+
+
+def _processes(spec):
+    return [Process(pid, burst, priority=prio, arrival_time=arrival, io_times=io)
+            for pid, burst, prio, arrival, io in spec]
+
+
+@pytest.mark.parametrize("algorithm", ["fcfs", "sjf", "priority_scheduling"])
+@pytest.mark.parametrize("seed", range(10))
+def test_one_core_without_io_matches_event_core(algorithm, seed):
+    spec = _spec(seed, io=False)
+    result = simulate_multicore(_processes(spec), algorithm)
+    completion = {seg.pid: seg.end for seg in simulate(_processes(spec), algorithm) if seg.kind == RUN}
+    assert {p["pid"]: p["completion"] for p in result["processes"]} == completion
+
+
+@pytest.mark.parametrize("algorithm", ["fcfs", "sjf", "srtf", "priority_scheduling", "round_robin"])
+@pytest.mark.parametrize("queue_mode", ["global", "per_core"])
+@pytest.mark.parametrize("seed", range(5))
+def test_work_is_conserved_and_cores_never_overlap(algorithm, queue_mode, seed):
+    spec = _spec(seed)
+    cores = big_little(2, 2)
+    processes = _processes(spec)
+    result = simulate_multicore(processes, algorithm, cores, queue_mode=queue_mode)
+
+    work = {}
+    for seg in result["segments"]:
+        if seg.kind == "run":
+            work[seg.pid] = work.get(seg.pid, 0.0) + (seg.end - seg.start) * cores[seg.core].speed
+    assert work == pytest.approx({pid: burst for pid, burst, *_ in spec})
+
+    for c in range(len(cores)):
+        segments = sorted((s for s in result["segments"] if s.core == c), key=lambda s: s.start)
+        assert all(a.end <= b.start + 1e-9 for a, b in zip(segments, segments[1:]))
+
+    # Energy: busy time at core power, the rest of the makespan at idle power
+    for core, stats in zip(cores, result["cores"]):
+        idle = result["makespan"] - stats["busy"]
+        assert stats["energy"] == pytest.approx(stats["busy"] * core.power + idle * core.idle_power)
+    assert result["energy"] == pytest.approx(sum(c["energy"] for c in result["cores"]))
+
+    # Inputs are read, not modified
+    assert [(p.remaining_time, p.cpu_executed) for p in processes] == [(b, 0) for _, b, *_ in spec]
+
+
+def test_process_table_input_gives_the_same_result():
+    spec = _spec(7)
+    table = ProcessTable.from_processes(_processes(spec))
+    for queue_mode in ("global", "per_core"):
+        expected = simulate_multicore(_processes(spec), "round_robin", homogeneous(3), queue_mode=queue_mode)
+        assert simulate_multicore(table, "round_robin", homogeneous(3), queue_mode=queue_mode) == expected
+
+
+def test_parallel_cores_and_speed():
+    jobs = [Process(pid, 4) for pid in range(4)]
+    assert simulate_multicore(jobs, "fcfs", homogeneous(4))["makespan"] == 1 + 4
+    assert simulate_multicore(jobs, "fcfs", homogeneous(4, speed=2.0))["makespan"] == 1 + 2
+    assert simulate_multicore(jobs, "fcfs", homogeneous(2))["makespan"] == 2 * (1 + 4)
+
+
+def test_parse_core_layout():
+    assert parse_core_layout("2") == homogeneous(2)
+    layout = parse_core_layout("1:2.0:1.5,2:0.5:0.3")
+    assert [(c.speed, c.power) for c in layout] == [(2.0, 1.5), (0.5, 0.3), (0.5, 0.3)]
+    assert [c.idle_power for c in layout] == pytest.approx([0.15, 0.03, 0.03])
+    with pytest.raises(ValueError):
+        simulate_multicore([Process(1, 1)], "fcfs", queue_mode="random")
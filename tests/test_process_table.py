@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from scheduling import scheduler
+from scheduling.events import ALGORITHMS, expand_steps, simulate
+from scheduling.process_table import ProcessTable, ProcessView
+from scheduling.scheduler import Process
+
+
+def _spec(seed, count=15):
+    rnd = random.Random(seed)
+    spec = []
+    for pid in range(1, count + 1):
+        burst = rnd.randint(1, 8)
+        io = rnd.sample(range(1, burst), k=min(burst - 1, rnd.randint(0, 2))) if burst > 1 else []
+        spec.append((pid, burst, rnd.randint(0, 2), rnd.randint(0, 20), io))
+    return spec
+
+
+def _objects(spec):
+    return [Process(pid, burst, prio, arrival, io) for pid, burst, prio, arrival, io in spec]
+
+
+def _table(spec):
+    table = ProcessTable()
+    for pid, burst, prio, arrival, io in spec:
+        table.append(pid, burst, prio, arrival, io)
+    return table
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", range(4))
+def test_generators_run_the_same_on_a_table(algorithm, seed):
+    kwargs = {"quantum": 2} if algorithm == "round_robin" else {}
+    objects, table = _objects(_spec(seed)), _table(_spec(seed))
+    generator = getattr(scheduler, algorithm)
+    assert list(generator(table, **kwargs)) == list(generator(objects, **kwargs))
+    # Both end in the same state (everything run, every I/O point served)
+    assert [(p.remaining_time, p.cpu_executed, sorted(p.io_times)) for p in table] == \
+        [(p.remaining_time, p.cpu_executed, sorted(p.io_times)) for p in objects]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_event_core_reads_a_table(algorithm):
+    spec = _spec(11)
+    assert list(expand_steps(simulate(_table(spec), algorithm))) == \
+        list(expand_steps(simulate(_objects(spec), algorithm)))
+
+
+def test_views_share_the_row_state():
+    table = ProcessTable()
+    view = table.append(7, 5, priority=2, arrival_time=3, io_times=[4, 1, 4, -2])
+    assert sorted(view.io_times) == [1, 4] and 4 in view.io_times
+    same = table[0]
+    assert same == view and hash(same) == hash(view) and len({view, same}) == 1
+
+    same.remaining_time -= 2
+    same.waiting_for_io = True
+    view.io_times.discard(1)
+    assert (view.remaining_time, view.waiting_for_io, list(view.io_times)) == (3, True, [4])
+    assert 1 not in table[-1].io_times
+    with pytest.raises(IndexError):
+        table[1]
+
+
+def test_from_processes_copies_current_state_and_is_compact():
+    processes = _objects(_spec(2, count=200))
+    processes[0].remaining_time, processes[0].cpu_executed = 1, 4
+    table = ProcessTable.from_processes(processes)
+    assert all(isinstance(p, ProcessView) for p in table)
+    assert (table[0].remaining_time, table[0].cpu_executed) == (1, 4)
+    assert [(p.pid, p.burst_time, p.priority, p.arrival_time, sorted(p.io_times)) for p in table] == \
+        [(p.pid, p.burst_time, p.priority, p.arrival_time, sorted(p.io_times)) for p in processes]
+    assert table.nbytes() < 100 * len(table)
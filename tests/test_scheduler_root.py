@@ -0,0 +1,24 @@
+import scheduler_root
+
+
+def test_live_forecast_follows_the_battery_once_per_interval(monkeypatch):
+    clock = {"now": 100.0}
+    battery = {"level": 80}
+    calls = []
+
+    def forecast(level, algorithm):
+        calls.append((level, algorithm))
+        return {"status": "discharging", "minutes": level, "low": level - 1, "high": level + 1}
+
+    monkeypatch.setattr(scheduler_root.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(scheduler_root, "_system_snapshot", lambda: (battery["level"], False, 10, 40))
+    monkeypatch.setattr(scheduler_root.telemetry, "forecast", forecast)
+
+    live = scheduler_root.LiveForecast("SJF", interval=1.0)
+    assert live.text() == "80 mins left (79–81)"
+    battery["level"] = 79
+    clock["now"] += 0.5
+    assert live.text() == "80 mins left (79–81)"       # within the interval: cached
+    clock["now"] += 0.5
+    assert live.text() == "79 mins left (78–80)"
+    assert calls == [(80, "SJF"), (79, "SJF")]
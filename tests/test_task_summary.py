@@ -0,0 +1,79 @@
+import pytest
+from flask import Flask
+
+from models import Task, TaskSummary, db, upgrade_schema
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + str(tmp_path / "summary.db")
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def _brute_force(**filters):
+    tasks = [t for t in Task.query.all()
+             if all((getattr(t, k) or "") == v for k, v in filters.items())]
+    energies = [t.energy or 0 for t in tasks]
+    return len(tasks), round(float(sum(energies)), 6), round(float(sum(e * e for e in energies)), 6)
+
+
+def _assert_totals():
+    assert TaskSummary.totals() == _brute_force()
+    for type_ in ("simulated", "real", ""):
+        for status in ("Pending", "Running", "Completed"):
+            assert TaskSummary.totals(type=type_, status=status) == _brute_force(type=type_, status=status)
+    pending = _brute_force(status="Pending")
+    everything = _brute_force()
+    assert TaskSummary.totals(exclude_status="Pending") == tuple(
+        round(a - b, 6) if isinstance(a, float) else a - b for a, b in zip(everything, pending))
+
+
+def test_triggers_keep_totals_after_insert_update_delete(app):
+    # Rows from before the triggers existed are counted by the rebuild
+    db.session.add_all([Task(name="old", type="simulated", energy=10),
+                        Task(name="old", type="real", status="Running", energy=3)])
+    db.session.commit()
+    upgrade_schema()
+    _assert_totals()
+
+    # ORM and bulk inserts, including NULL energy and NULL type
+    db.session.add(Task(name="a", type="simulated", energy=7))
+    db.session.execute(db.insert(Task), [{"name": f"b{i}", "type": "simulated", "energy": i} for i in range(5)])
+    db.session.add(Task(name="c", type=None, energy=None))
+    db.session.commit()
+    _assert_totals()
+
+    # Updates moving rows between groups, changing energy, or touching untracked columns
+    task = Task.query.filter_by(name="a").one()
+    task.status, task.energy = "Running", 12
+    Task.query.filter_by(name="b1").one().type = "real"
+    Task.query.filter_by(name="b2").one().progress = 50
+    db.session.commit()
+    db.session.execute(db.text("UPDATE task SET status = 'Completed' WHERE name LIKE 'b%'"))
+    db.session.commit()
+    _assert_totals()
+
+    # Deletes, ORM and bulk
+    db.session.delete(Task.query.filter_by(name="a").one())
+    Task.query.filter(Task.name.like("b%")).delete(synchronize_session=False)
+    db.session.commit()
+    _assert_totals()
+
+
+def test_rolled_back_changes_leave_totals_untouched(app):
+    upgrade_schema()
+    db.session.add(Task(name="kept", type="simulated", energy=5))
+    db.session.commit()
+    before = TaskSummary.totals()
+
+    db.session.add(Task(name="dropped", type="simulated", energy=50))
+    Task.query.filter_by(name="kept").one().status = "Completed"
+    db.session.flush()
+    db.session.rollback()
+    assert TaskSummary.totals() == before
+    _assert_totals()
@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+import pytest
+
+import telemetry
+from telemetry import TelemetrySampler
+
+Battery = namedtuple("Battery", ["percent", "secsleft", "power_plugged"])
+
+
+@pytest.fixture
+def sensors(monkeypatch):
+    state = {"battery": Battery(64.0, 3600, False), "cpu": 12.5, "reads": 0, "now": 1000.0}
+
+    def cpu_percent(interval=None, percpu=False):
+        assert interval is None   # never blocks
+        state["reads"] += 1
+        return [state["cpu"]] * 2 if percpu else state["cpu"]
+
+    monkeypatch.setattr(telemetry.psutil, "sensors_battery", lambda: state["battery"])
+    monkeypatch.setattr(telemetry.psutil, "cpu_percent", cpu_percent)
+    monkeypatch.setattr(telemetry, "_read_temperature", lambda: 41.5)
+    monkeypatch.setattr(telemetry.time, "time", lambda: state["now"])
+    return state
+
+
+class Sink:
+    def __init__(self, fail=False):
+        self.rows, self.fail = [], fail
+
+    def append(self, *row):
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.rows.append(row)
+
+
+def test_sample_publishes_and_feeds_every_sink(sensors):
+    broken, sink = Sink(fail=True), Sink()
+    sampler = TelemetrySampler(interval=1.0, sinks=[broken, sink])
+    snap = sampler.sample()
+    assert (snap.battery, snap.plugged, snap.secsleft, snap.cpu, snap.per_core, snap.temp) == \
+        (64.0, False, 3600, 12.5, (12.5, 12.5), 41.5)
+    assert sampler.latest is snap
+    # A failing sink does not keep the others from getting the sample
+    assert sink.rows == [(1000.0, 64.0, 12.5, 41.5, False)]
+
+
+def test_snapshot_reuses_fresh_readings_and_refreshes_stale_ones(sensors):
+    sampler = TelemetrySampler(interval=1.0)
+    first = sampler.snapshot()
+    reads = sensors["reads"]
+    sensors["now"] += 4.9
+    assert sampler.snapshot() is first and sensors["reads"] == reads
+    sensors["now"] += 0.2
+    sensors["cpu"] = 80.0
+    assert sampler.snapshot().cpu == 80.0
+
+
+def test_no_battery_sensor(sensors):
+    sensors["battery"] = None
+    snap = TelemetrySampler().sample()
+    assert (snap.battery, snap.plugged, snap.secsleft) == (None, False, None)
+
+
+def test_run_samples_once_per_interval_and_survives_errors(sensors, monkeypatch):
+    class Stop(Exception):
+        pass
+
+    sampler = TelemetrySampler(interval=0.5)
+    calls, sleeps = [], []
+
+    def sample():
+        calls.append(1)
+        if len(calls) == 2:
+            raise OSError("sensor read failed")
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise Stop
+
+    monkeypatch.setattr(sampler, "sample", sample)
+    with pytest.raises(Stop):
+        sampler.run(sleep)
+    assert len(calls) == 3 and sleeps == [0.5, 0.5, 0.5]
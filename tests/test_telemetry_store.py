@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+import pytest
+
+from telemetry_store import FIELDS, TelemetryStore
+
+HOURS = 3
+SPACING = 5   # seconds between samples
+
+
+@pytest.fixture
+def samples():
+    """Three hours of samples every 5 s, ending now; temp is missing for every 7th sample."""
+    now = time.time()
+    ts = np.arange(now - HOURS * 3600, now, SPACING)
+    rnd = np.random.default_rng(0)
+    data = {
+        "battery": np.linspace(100, 40, len(ts)),
+        "cpu": rnd.uniform(0, 100, len(ts)),
+        "temp": np.where(np.arange(len(ts)) % 7 == 0, np.nan, rnd.uniform(30, 90, len(ts))),
+        "plugged": (np.arange(len(ts)) // 500 % 2).astype(float),
+    }
+    return now, ts, data
+
+
+def _store(path, now, ts, data, raw_retention=2 * 86400):
+    store = TelemetryStore(str(path), batch_size=10 ** 6, raw_retention=raw_retention)
+    for i, t in enumerate(ts):
+        values = [None if np.isnan(data[f][i]) else float(data[f][i]) for f in FIELDS]
+        store.append(float(t), *values)
+    store.flush()
+    store._rollup(store._writer(), now)
+    return store
+
+
+def _expected(ts, data, since, until, step, agg):
+    """Brute-force buckets over the raw samples."""
+    since -= since % step
+    keep = (ts >= since) & (ts < until)
+    buckets = (ts[keep] // step).astype(int) * step
+    reduce = {"avg": np.nanmean, "min": np.nanmin, "max": np.nanmax}[agg]
+    return {int(b): {f: reduce(data[f][keep][buckets == b]) for f in FIELDS} for b in np.unique(buckets)}
+
+
+def _check(result, expected):
+    assert [p["t"] for p in result["points"]] == sorted(expected)
+    for point in result["points"]:
+        for field in FIELDS:
+            assert point[field] == pytest.approx(expected[point["t"]][field], abs=1e-3)
+
+
+@pytest.mark.parametrize("agg", ["avg", "min", "max"])
+@pytest.mark.parametrize("step,source", [(60, "rollup_1m"), (90, "samples"), (300, "rollup_1m"),
+                                         (3600, "rollup_1h")])
+def test_query_matches_raw_aggregation(tmp_path, samples, step, source, agg):
+    now, ts, data = samples
+    store = _store(tmp_path / "t.db", now, ts, data)
+    since = now - HOURS * 3600 + 17
+    result = store.query(since, now, step, agg)
+    assert (result["source"], result["step"]) == (source, step)
+    _check(result, _expected(ts, data, since, now, step, agg))
+
+
+def test_step_is_rounded_up_when_only_rollups_hold_the_range(tmp_path, samples):
+    now, ts, data = samples
+    # Raw samples older than 30 minutes are gone: an exact 90 s step is no longer possible
+    store = _store(tmp_path / "t.db", now, ts, data, raw_retention=1800)
+    since = now - 2 * 3600
+    result = store.query(since, now, 90, "avg")
+    assert (result["source"], result["step"]) == ("rollup_1m", 120)
+    _check(result, _expected(ts, data, since, now, 120, "avg"))
+
+
+def test_readers_see_committed_samples_only(tmp_path):
+    store = TelemetryStore(str(tmp_path / "t.db"), batch_size=100)
+    now = time.time()
+    store.append(now - 2, 50, 10, 40, False)
+    store.flush()
+    store.append(now - 1, 49, 10, 40, False)   # still buffered
+    assert [row[1] for row in store.recent(60)] == [50]
+    assert len(store._pending) == 1
@@ -3,18 +3,18 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report
 import pickle
+import os
+from forest_model import export_forest, export_path, file_digest
+from features import PRIORITY_CLASSES, PRIORITY_FEATURES, add_priority_features
 
 df = pd.read_csv("priority_data_full.csv")
 
-df["priority"] = df["priority"].map({"Low": 0, "Medium": 1, "High": 2})
+df["priority"] = df["priority"].map(PRIORITY_CLASSES)
 
-# Feature engineering
-df["energy_per_cpu"] = df["energy"] / df["cpu"].replace(0, 1)
-df["cpu_battery_ratio"] = df["cpu"] / df["battery"].replace(0, 1)
-df["deadline_inverse"] = 1 / df["deadline_hours"].replace(0, 1)
+# Feature engineering (shared with serving, see features.py)
+df = add_priority_features(df)
 
-X = df[["energy", "deadline_hours", "cpu", "battery",
-         "energy_per_cpu", "cpu_battery_ratio", "deadline_inverse"]]
+X = df[PRIORITY_FEATURES]
 y = df["priority"]
 
 X_train, X_test, y_train, y_test = train_test_split(
@@ -36,7 +36,12 @@ y_pred = clf_priority.predict(X_test)
 print("\n--- Classification Report ---")
 print(classification_report(y_test, y_pred))
 
-with open("priority_model.pkl", "wb") as f:
+# Write then rename, so a running app never hot-reloads a half-written file.
+# NumPy export first, so the app never pairs the new .pkl with a stale .npz
+with open("priority_model.pkl.tmp", "wb") as f:
     pickle.dump(clf_priority, f)
+export_forest(clf_priority, "priority_model.tmp.npz", file_digest("priority_model.pkl.tmp"))
+os.replace("priority_model.tmp.npz", export_path("priority_model.pkl"))
+os.replace("priority_model.pkl.tmp", "priority_model.pkl")
 
 print("✅ Balanced and improved priority model saved as priority_model.pkl")
@@ -4,6 +4,7 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report
 import pickle
 import os
+from forest_model import export_forest, export_path, file_digest
 
 csv_file = "tasks_large.csv"  
 
@@ -37,7 +38,12 @@ print("\n--- Classification Report on Test Set ---")
 print(classification_report(y_test, y_pred))
 
 
-with open("scheduler_model.pkl", "wb") as f:
+# Write then rename, so a running app never hot-reloads a half-written file.
+# NumPy export first, so the app never pairs the new .pkl with a stale .npz
+with open("scheduler_model.pkl.tmp", "wb") as f:
     pickle.dump(clf, f)
+export_forest(clf, "scheduler_model.tmp.npz", file_digest("scheduler_model.pkl.tmp"))
+os.replace("scheduler_model.tmp.npz", export_path("scheduler_model.pkl"))
+os.replace("scheduler_model.pkl.tmp", "scheduler_model.pkl")
 
 print("\n✅ Model saved as scheduler_model.pkl")
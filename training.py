@@ -0,0 +1,230 @@
+# training.py
+"""
+Chunked, cached, parallel training for the priority and scheduler models.
+
+The training CSV is read in blocks of lines. Each block's engineered feature
+columns are saved as .npy files in a content-addressed feature store (keyed
+by the block's bytes), so a rerun only parses and transforms the blocks that
+changed or were appended. Forests train with n_jobs processes, and the
+hyperparameter search caches the score of every (data, params, fold)
+combination, so a rerun only evaluates new grid points or new data.
+
+Usage:
+  python training.py priority [--n-jobs -1] [--folds 3] [--grid '{"max_depth": [null, 10]}']
+  python training.py scheduler --no-search
+"""
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURE_VERSION, PRIORITY_CLASSES, PRIORITY_FEATURES, add_priority_features
+from forest_model import export_forest, export_path, file_digest
+
+# Per model: source CSV, feature columns, label mapping, fixed forest
+# parameters and the default search grid (same settings as train_*_model.py)
+DATASETS = {
+    "priority": {
+        "csv": "priority_data_full.csv",
+        "output": "priority_model.pkl",
+        "features": PRIORITY_FEATURES,
+        "target": "priority",
+        "labels": PRIORITY_CLASSES,
+        "engineer": add_priority_features,
+        "params": {"n_estimators": 300, "max_depth": 10, "min_samples_split": 5,
+                   "min_samples_leaf": 3, "class_weight": "balanced_subsample"},
+        "grid": {"max_depth": [8, 10, None], "min_samples_leaf": [1, 3]},
+    },
+    "scheduler": {
+        "csv": "tasks_large.csv",
+        "output": "scheduler_model.pkl",
+        "features": ["battery", "cpu", "temp", "priority"],
+        "target": "decision",
+        "labels": {"Pause": 0, "Run": 1},
+        "engineer": None,
+        "params": {"n_estimators": 100},
+        "grid": {"max_depth": [None, 8], "min_samples_leaf": [1, 3]},
+    },
+}
+
+
+# =========================
+# Feature Store
+# =========================
+def _csv_blocks(path, rows):
+    """Yield (header, raw bytes) for consecutive blocks of `rows` data lines."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        while True:
+            block = b"".join(itertools.islice(f, rows))
+            if not block:
+                return
+            yield header, block
+
+
+def build_features(name, store=".feature_store", chunk_rows=100000):
+    """
+    Make sure every block of the dataset's CSV has its feature columns in the
+    store; returns the block directories in file order. Only blocks whose
+    bytes are not cached yet are parsed.
+    """
+    spec = DATASETS[name]
+    blocks, built = [], 0
+    for header, block in _csv_blocks(spec["csv"], chunk_rows):
+        key = hashlib.sha1(b"%s|%d|" % (name.encode(), FEATURE_VERSION) + header + block).hexdigest()
+        block_dir = os.path.join(store, name, key[:2], key)
+        blocks.append(block_dir)
+        if os.path.isdir(block_dir):
+            continue
+
+        df = pd.read_csv(io.BytesIO(header + block))
+        df[spec["target"]] = df[spec["target"]].map(spec["labels"])
+        df = df.dropna(subset=[spec["target"]])
+        if spec["engineer"]:
+            df = spec["engineer"](df)
+
+        # Write into a temporary directory and rename, so a crash never leaves half a block
+        tmp = block_dir + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for column in spec["features"]:
+            np.save(os.path.join(tmp, column + ".npy"), df[column].to_numpy(np.float32))
+        np.save(os.path.join(tmp, "target.npy"), df[spec["target"]].to_numpy(np.int64))
+        os.replace(tmp, block_dir)
+        built += 1
+    print(f"✅ Feature store: {len(blocks)} blocks, {built} rebuilt")
+    return blocks
+
+
+def load_features(name, blocks):
+    """Feature matrix (float32, like sklearn's trees use internally) and labels from stored blocks."""
+    features = DATASETS[name]["features"]
+    X = np.concatenate([
+        np.column_stack([np.load(os.path.join(b, c + ".npy"), mmap_mode="r") for c in features])
+        for b in blocks
+    ]) if blocks else np.empty((0, len(features)), dtype=np.float32)
+    y = np.concatenate([np.load(os.path.join(b, "target.npy")) for b in blocks]) if blocks else np.empty(0, np.int64)
+    return X, y
+
+
+def data_digest(blocks):
+    """Identity of a dataset version: the ordered block keys."""
+    return hashlib.sha1("|".join(os.path.basename(b) for b in blocks).encode()).hexdigest()
+
+
+# =========================
+# Hyperparameter Search
+# =========================
+def _param_grid(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def search(name, X, y, digest, grid=None, folds=3, n_jobs=None, seed=42, store=".feature_store"):
+    """
+    Stratified k-fold macro-F1 for every grid point. Each fold score is cached
+    under (data digest, params, fold), so only missing ones are computed.
+    Returns one row per grid point, best first.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import f1_score
+    from sklearn.model_selection import StratifiedKFold
+
+    spec = DATASETS[name]
+    cache_dir = os.path.join(store, name, "folds")
+    os.makedirs(cache_dir, exist_ok=True)
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(X, y))
+    frame = pd.DataFrame(X, columns=spec["features"])
+
+    results, computed = [], 0
+    for point in _param_grid(grid or spec["grid"]):
+        params = {**spec["params"], **point, "random_state": seed}
+        scores = []
+        for fold, (train_idx, test_idx) in enumerate(splits):
+            key = hashlib.sha1(json.dumps([digest, params, folds, fold], sort_keys=True).encode()).hexdigest()
+            path = os.path.join(cache_dir, key + ".json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    scores.append(json.load(f)["score"])
+                continue
+            start = time.perf_counter()
+            clf = RandomForestClassifier(n_jobs=n_jobs, **params)
+            clf.fit(frame.iloc[train_idx], y[train_idx])
+            score = float(f1_score(y[test_idx], clf.predict(frame.iloc[test_idx]), average="macro"))
+            with open(path, "w") as f:
+                json.dump({"score": score, "params": params, "fold": fold,
+                           "seconds": round(time.perf_counter() - start, 2)}, f)
+            scores.append(score)
+            computed += 1
+        results.append({"params": point, "score": float(np.mean(scores)), "std": float(np.std(scores))})
+
+    print(f"✅ Search: {len(results)} grid points x {folds} folds, {computed} fold fits computed")
+    return sorted(results, key=lambda r: -r["score"])
+
+
+# =========================
+# Training
+# =========================
+def train(name, store=".feature_store", chunk_rows=100000, n_jobs=None, folds=3,
+          grid=None, run_search=True, output=None, seed=42):
+    """Build/reuse features, optionally search, then fit, evaluate and save the model."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import classification_report
+    from sklearn.model_selection import train_test_split
+
+    spec = DATASETS[name]
+    blocks = build_features(name, store, chunk_rows)
+    X, y = load_features(name, blocks)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=y)
+
+    params = dict(spec["params"])
+    if run_search:
+        results = search(name, X_train, y_train, data_digest(blocks), grid, folds, n_jobs, seed, store)
+        for row in results:
+            print(f"  {row['score']:.4f} ± {row['std']:.4f}  {row['params']}")
+        params.update(results[0]["params"])
+
+    clf = RandomForestClassifier(n_jobs=n_jobs, random_state=seed, **params)
+    clf.fit(pd.DataFrame(X_train, columns=spec["features"]), y_train)
+    print("\n--- Classification Report on Test Set ---")
+    print(classification_report(y_test, clf.predict(pd.DataFrame(X_test, columns=spec["features"]))))
+
+    # Serving does not need the worker pool
+    clf.set_params(n_jobs=None)
+    output = output or spec["output"]
+    with open(output + ".tmp", "wb") as f:
+        pickle.dump(clf, f)
+    export_tmp = export_path(output) + ".tmp.npz"
+    export_forest(clf, export_tmp, file_digest(output + ".tmp"))
+    os.replace(export_tmp, export_path(output))
+    os.replace(output + ".tmp", output)
+    print(f"✅ Model saved as {output} ({params})")
+    return clf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, cached model training")
+    parser.add_argument("model", choices=sorted(DATASETS))
+    parser.add_argument("--store", default=".feature_store", help="feature/fold cache directory")
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="forest worker processes (-1 = all cores)")
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--grid", type=json.loads, default=None, help='JSON, e.g. {"max_depth": [null, 10]}')
+    parser.add_argument("--no-search", action="store_true", help="train with the fixed parameters")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    train(args.model, args.store, args.chunk_rows, args.n_jobs, args.folds,
+          args.grid, not args.no_search, args.output)
+
+
+if __name__ == "__main__":
+    main()